@@ -0,0 +1,120 @@
+"""Check that the HTTP and Selenium egazette modes read identical rows from the same search.
+
+Runs the egazette crawl flow twice against the mock site (bench/mock_server.py,
+rendered from the recorded pages in bench/fixtures): once as fetch_mode="http"
+(EgazetteSource.http_session, i.e. replayed postbacks and parse_gazette_page)
+and once as fetch_mode="selenium" (the same search clicked through in
+headless Chrome, read with extract_grid). Both sessions go through
+EgazetteSource.goto page by page, the way the scraper pages the grid.
+The lbl_Result text, the GazetteRecord lists and the pager of every page
+must match.
+
+Exit status: 0 both modes agree, 1 they differ, 3 not checked (no Chrome).
+
+    python bench/check_parity.py
+    python bench/check_parity.py --pages 40 --no-event-validation
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "egazette"))
+from pagination import page_count, parse_total
+from plugin import EgazetteSource
+from run_bench import Skipped, headless_chrome
+
+NOT_CHECKED = 3  # exit status when the Selenium half can't run, so CI can't take it for a pass
+
+
+def crawl(source, session, ref_type: str = "Act"):
+    """(total_text, [(records, pager) per page]) of one search session, paged with source.goto."""
+    read_page, goto_page, total_text = session[:3]
+    records, pager = read_page()
+    pages = [(records, pager)]
+    last_page = page_count(parse_total(total_text) or 0)
+    for page in range(2, last_page + 1):
+        records, pager = source.goto(ref_type, read_page, goto_page, pager, page)
+        pages.append((records, pager))
+    return total_text, pages
+
+
+def compare(number: int, http_result, browser_result):
+    """Differences between the two (records, pager) results of one page, as printable lines."""
+    (http_records, http_pager), (browser_records, browser_pager) = http_result, browser_result
+    problems = []
+    if len(http_records) != len(browser_records):
+        problems.append(f"page {number}: {len(http_records)} rows over HTTP, {len(browser_records)} in Chrome")
+    for row, (http_record, browser_record) in enumerate(zip(http_records, browser_records), start=1):
+        if http_record != browser_record:
+            problems.append(f"page {number} row {row}:\n   http:    {http_record}\n   browser: {browser_record}")
+    if http_pager != browser_pager:
+        problems.append(f"page {number} pager:\n   http:    {http_pager}\n   browser: {browser_pager}")
+    return problems
+
+
+def check(http_crawl, browser_crawl):
+    """Every difference between the two crawls, as printable lines."""
+    (http_total, http_pages), (browser_total, browser_pages) = http_crawl, browser_crawl
+    problems = []
+    if http_total != browser_total:
+        problems.append(f"lbl_Result:\n   http:    {http_total!r}\n   browser: {browser_total!r}")
+    if len(http_pages) != len(browser_pages):
+        problems.append(f"{len(http_pages)} pages over HTTP, {len(browser_pages)} in Chrome")
+    for number, (http_result, browser_result) in enumerate(zip(http_pages, browser_pages), start=1):
+        problems += compare(number, http_result, browser_result)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=23, help="egazette result pages served by the mock")
+    parser.add_argument("--no-event-validation", action="store_true",
+                        help="let the mock accept Page$N jumps it didn't render")
+    args = parser.parse_args()
+
+    from mock_server import start_server
+
+    server, base_url = start_server(pages=args.pages, event_validation=not args.no_event_validation)
+    folder = tempfile.mkdtemp(prefix="parity_")
+    source = EgazetteSource("Act", os.path.join(folder, "rows.csv"), base_url=base_url + "/",
+                            download_folder=os.path.join(folder, "downloads"),
+                            checkpoint_folder=os.path.join(folder, "checkpoints"))
+    try:
+        session = source.http_session("Act")
+        try:
+            http_crawl = crawl(source, session)
+        finally:
+            session[3]()
+        rows = sum(len(records) for records, _ in http_crawl[1])
+        print(f"🧪 Crawled {len(http_crawl[1])} result pages ({rows} rows) over HTTP.")
+
+        try:
+            driver = headless_chrome()
+        except Skipped as e:
+            print(f"⏭️ Parity not checked: {e}")
+            return NOT_CHECKED
+        source.direct_jumps = False  # Chrome follows the rendered pager links, as in fetch_mode="selenium"
+        try:
+            browser_crawl = crawl(source, source._search_in_browser(driver, "Act"))
+        finally:
+            driver.quit()
+    finally:
+        source.close()
+        server.shutdown()
+
+    problems = check(http_crawl, browser_crawl)
+    if problems:
+        print(f"❌ HTTP and Selenium modes differ on {len(problems)} points:")
+        for problem in problems:
+            print("  ", problem)
+        return 1
+    print(f"✅ HTTP and Selenium modes agree on all {len(http_crawl[1])} pages ({rows} rows).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
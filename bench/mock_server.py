@@ -0,0 +1,405 @@
+"""Local stand-in for pib.gov.in and egazette.gov.in built from the snapshots in bench/fixtures.
+
+egazette: GET / is the home page; every form post is routed by its __VIEWSTATE
+(home -> search menu -> Bill/Assent/Act form -> results grid -> Page$N), like the
+real WebForms site. Like ASP.NET event validation, a pager postback is only
+accepted for a Page$N link the current page rendered (its 10-page block and
+the "..." links), unless event_validation=False. PDFs are served from
+/WriteReadData/<year>/<id>.pdf with HEAD, Last-Modified and Range support.
+
+PIB: /pib/ is the home page, /pib/Allrel.aspx?section=&year=&month= the month
+listing, /pib/PressReleasePage.aspx?PRID= a release page wrapping the
+ContentPlaceHolder1_iframepressrealese iframe at /pib/PressReleseDetailm.aspx?PRID=.
+
+Faults can be injected to exercise common.governor: a share of requests
+answered 503 (fail_rate), 429 with Retry-After above a request rate
+(max_rps), occasional responses slowed by slow_ms (slow_rate), and PDF
+bodies cut off halfway through (cut_rate).
+
+    python bench/mock_server.py --port 8800 --pages 40 --latency-ms 50
+    python bench/mock_server.py --fail-rate 0.2 --max-rps 20 --slow-rate 0.05 --slow-ms 2000 --cut-rate 0.1
+"""
+import argparse
+import html
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ROWS_PER_PAGE = 15
+PAGER_BLOCK = 10
+REF_TYPES = ["Select", "Act", "Bill", "Assent"]
+MONTHS = [datetime(1900, m, 1).strftime("%B") for m in range(1, 13)]
+STARTED = time.time()
+SELECTED = ' selected="selected"'
+
+_fixtures = {}
+
+
+def fixture(name: str, mode: str = "r"):
+    if name not in _fixtures:
+        with open(os.path.join(FIXTURES_DIR, name), mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            _fixtures[name] = f.read()
+    return _fixtures[name]
+
+
+def render(name: str, **values):
+    return Template(fixture(name)).substitute(**values)
+
+
+class MockConfig:
+    """What the stand-in serves and how slowly."""
+
+    def __init__(self, pages: int = 20, pib_items: int = 20, latency_ms: float = 0, pdf_kb: int = 256,
+                 fail_rate: float = 0, max_rps: float = 0, slow_rate: float = 0, slow_ms: float = 0,
+                 cut_rate: float = 0, seed: int = None, event_validation: bool = True):
+        self.pages = pages
+        self.total_gazettes = max(1, pages * ROWS_PER_PAGE - 7)  # leave a short last page
+        self.total_pages = -(-self.total_gazettes // ROWS_PER_PAGE)
+        self.event_validation = event_validation  # only accept pager arguments the page rendered
+        self.pib_items = pib_items
+        self.latency = latency_ms / 1000.0
+        self.pdf_kb = pdf_kb
+        self.pdf_bytes = self._build_pdf()
+        self.faults = FaultInjector(fail_rate, max_rps, slow_rate, slow_ms / 1000.0, cut_rate, seed)
+
+    def _build_pdf(self):
+        """sample.pdf padded with PDF comment lines up to pdf_kb.
+
+        The padding goes after the xref table, in front of the startxref trailer, so
+        the xref offsets stay valid and readers still find startxref near the end.
+        """
+        sample = fixture("sample.pdf", "rb")
+        head, eof = sample[: sample.rindex(b"startxref")], sample[sample.rindex(b"startxref"):]
+        padding_lines = max(0, (self.pdf_kb * 1024 - len(sample)) // 64)
+        return head + (b"%" + b"0" * 62 + b"\n") * padding_lines + eof
+
+
+class FaultInjector:
+    """Decides, per request, whether the server misbehaves."""
+
+    def __init__(self, fail_rate: float = 0, max_rps: float = 0, slow_rate: float = 0, slow: float = 0,
+                 cut_rate: float = 0, seed: int = None):
+        self.fail_rate = fail_rate
+        self.max_rps = max_rps
+        self.slow_rate = slow_rate
+        self.slow = slow
+        self.cut_rate = cut_rate
+        self._random = random.Random(seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def fault(self):
+        """(status, headers) to answer with instead of the page, or None; may sleep first."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            throttled = self.max_rps and self._window_count > self.max_rps
+            failed = self._random.random() < self.fail_rate
+            slow = self._random.random() < self.slow_rate
+        if slow:
+            time.sleep(self.slow)
+        if throttled:
+            return 429, {"Retry-After": "1"}
+        if failed:
+            return 503, {}
+        return None
+
+    def cut(self):
+        """True if this body should be cut off halfway (the connection dropped mid-transfer)."""
+        with self._lock:
+            return self._random.random() < self.cut_rate
+
+
+# ---------------------------------------------------------------- egazette
+
+def _hidden_fields(state: str):
+    fields = {
+        "__EVENTTARGET": "",
+        "__EVENTARGUMENT": "",
+        "__VIEWSTATE": state,
+        "__VIEWSTATEGENERATOR": "CA0B0334",
+        "__EVENTVALIDATION": "mock-validation",
+    }
+    return "\n".join(
+        f'<input type="hidden" name="{name}" id="{name}" value="{html.escape(value)}" />' for name, value in fields.items()
+    )
+
+
+def _page(name: str, state: str, **values):
+    return render(name, hidden_fields=_hidden_fields(state), postback_script=fixture("aspnet_postback.js"), **values)
+
+
+def _pager_entries(page: int, total_pages: int):
+    """(text, page number, is a link) of every pager cell: the page's block of 10 with "..." links either side."""
+    start = ((page - 1) // PAGER_BLOCK) * PAGER_BLOCK + 1
+    end = min(start + PAGER_BLOCK - 1, total_pages)
+    entries = [("...", start - 1, True)] if start > 1 else []
+    entries += [(str(p), p, p != page) for p in range(start, end + 1)]
+    if end < total_pages:
+        entries.append(("...", end + 1, True))
+    return entries
+
+
+def _pager_cells(page: int, total_pages: int):
+    return "\n".join(
+        f"<td><a href=\"javascript:__doPostBack('gvGazetteList','Page${target}')\">{text}</a></td>" if is_link
+        else f"<td><span>{text}</span></td>"
+        for text, target, is_link in _pager_entries(page, total_pages)
+    )
+
+
+def egazette_results(config: MockConfig, ref_type: str, page: int):
+    total_pages = config.total_pages
+    page = max(1, min(page, total_pages))
+    first = (page - 1) * ROWS_PER_PAGE + 1
+    last = min(page * ROWS_PER_PAGE, config.total_gazettes)
+    ref_index = REF_TYPES.index(ref_type)
+    rows = "".join(
+        render(
+            "egazette_row.html", serial=serial, ref_type=ref_type,
+            issue_date="15-Apr-2025", publish_date="16-Apr-2025", date_code="16042025",
+            document_id=ref_index * 1000000 + serial, size_kb=config.pdf_kb,
+        )
+        for serial in range(first, last + 1)
+    )
+    return _page(
+        "egazette_results.html", f"results:{ref_type}:{page}",
+        total=config.total_gazettes, rows=rows, pager=_pager_cells(page, total_pages),
+    )
+
+
+def egazette_bill_form(ref_type: str):
+    options = "\n".join(
+        f'<option{SELECTED if name == ref_type else ""} value="{index}">{name}</option>'
+        for index, name in enumerate(REF_TYPES)
+    )
+    return _page("egazette_bill_form.html", f"form:{ref_type}", ref_type_options=options)
+
+
+def egazette_postback(config: MockConfig, form: dict):
+    """Route a WebForms post by its view state, like the real site would. None = invalid postback."""
+    if form.get("__EVENTVALIDATION") != "mock-validation":
+        return None
+    state = form.get("__VIEWSTATE", "")
+    target = form.get("__EVENTTARGET", "")
+    argument = form.get("__EVENTARGUMENT", "")
+    step, _, ref_type = state.partition(":")
+
+    if step == "home" and target == "sgzt":
+        return _page("egazette_search.html", "menu")
+    if step == "menu" and "btnBill" in form:
+        return egazette_bill_form("Select")
+    if step == "form" and target == "ddlreftype":
+        selected = int(form.get("ddlreftype", "0"))
+        return egazette_bill_form(REF_TYPES[selected] if 0 <= selected < len(REF_TYPES) else "Select")
+    if step == "form" and "ImgSubmitDetails.x" in form and ref_type != "Select":
+        return egazette_results(config, ref_type, 1)
+    if step == "results" and target == "gvGazetteList" and argument.startswith("Page$"):
+        ref_type, _, shown = ref_type.partition(":")
+        wanted = argument[len("Page$"):]
+        if not wanted.isdigit():
+            return None
+        rendered = {target for _, target, is_link in _pager_entries(int(shown or 1), config.total_pages) if is_link}
+        if config.event_validation and int(wanted) not in rendered:
+            return None  # "Invalid postback or callback argument"
+        return egazette_results(config, ref_type, int(wanted))
+    return None
+
+
+# ---------------------------------------------------------------- PIB
+
+def pib_listing(base: str, query: dict, config: MockConfig):
+    now = datetime.now()
+    section = query.get("section", "Speeches")
+    year = int(query.get("year", now.year))
+    month = query.get("month", MONTHS[now.month - 1])
+    month_index = MONTHS.index(month) + 1 if month in MONTHS else now.month
+
+    year_options = "\n".join(
+        f'<option{SELECTED if y == year else ""} value="{y}">{y}</option>'
+        for y in range(now.year - 5, now.year + 1)
+    )
+    month_options = "\n".join(
+        f'<option{SELECTED if name == month else ""} value="{name}">{name}</option>' for name in MONTHS
+    )
+    section_code = 1 if section == "Speeches" else 2
+    items = "".join(
+        render(
+            "pib_listing_item.html", base=base,
+            prid=section_code * 10**9 + year * 10**5 + month_index * 10**3 + n,
+            title=html.escape(f"{section} release {n} of {month} {year}"),
+            date=f"{min(n, 28):02d} {month[:3].upper()} {year} {9 + n % 9}:{n % 60:02d}AM by PIB Delhi",
+        )
+        for n in range(1, config.pib_items + 1)
+    )
+    return render(
+        "pib_listing.html", base=base, section=html.escape(section),
+        year_options=year_options, month_options=month_options, items=items,
+    )
+
+
+def pib_release_iframe(prid: str):
+    title = f"Release {prid}: Union Minister addresses national conference on digital public infrastructure"
+    return render(
+        "pib_release_iframe.html", prid=prid,
+        title=html.escape(title, quote=True), body=html.escape(fixture("pib_release_body.html"), quote=True),
+    )
+
+
+# ---------------------------------------------------------------- server
+
+class MockHandler(BaseHTTPRequestHandler):
+    config = MockConfig()
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def base(self):
+        return f"http://{self.headers.get('Host')}"
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", headers=None, head=False,
+              cut=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if head:
+            return
+        if cut:
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def _send_html(self, text: str):
+        self._send(200, text.encode("utf-8"))
+
+    def _send_pdf(self, head=False):
+        data = self.config.pdf_bytes
+        headers = {"Last-Modified": formatdate(STARTED, usegmt=True), "Accept-Ranges": "bytes"}
+        since = self.headers.get("If-Modified-Since")
+        if since and since == headers["Last-Modified"]:
+            return self._send(304, b"", "application/pdf", headers, head)
+
+        byte_range = self.headers.get("Range", "")
+        if byte_range.startswith("bytes="):
+            start = int(byte_range[len("bytes="):].split("-")[0] or 0)
+            if start >= len(data):
+                return self._send(416, b"", "application/pdf", {"Content-Range": f"bytes */{len(data)}"}, head)
+            headers["Content-Range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+            return self._send(206, data[start:], "application/pdf", headers, head, not head and self.config.faults.cut())
+        self._send(200, data, "application/pdf", headers, head, not head and self.config.faults.cut())
+
+    def _inject_fault(self, head=False):
+        """Answer with an injected fault if one is due. Returns True if it did."""
+        fault = self.config.faults.fault()
+        if fault is None:
+            return False
+        status, headers = fault
+        self._send(status, b"injected fault", "text/plain", headers, head)
+        return True
+
+    def _route_get(self, head=False):
+        time.sleep(self.config.latency)
+        if self._inject_fault(head):
+            return
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        path = url.path
+
+        if path.startswith("/WriteReadData/") and path.endswith(".pdf"):
+            return self._send_pdf(head)
+        if path in ("/", "/Default.aspx"):
+            return self._send_html(_page("egazette_home.html", "home"))
+        if path in ("/pib", "/pib/"):
+            return self._send_html(render("pib_home.html", base=self.base))
+        if path == "/pib/Allrel.aspx":
+            return self._send_html(pib_listing(self.base, query, self.config))
+        if path == "/pib/PressReleasePage.aspx":
+            return self._send_html(render("pib_release.html", base=self.base, prid=query.get("PRID", "0")))
+        if path == "/pib/PressReleseDetailm.aspx":
+            return self._send_html(pib_release_iframe(query.get("PRID", "0")))
+        self._send(404, b"not found", "text/plain")
+
+    def do_GET(self):
+        self._route_get()
+
+    def do_HEAD(self):
+        self._route_get(head=True)
+
+    def do_POST(self):
+        time.sleep(self.config.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        form = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode("utf-8"), keep_blank_values=True))
+        if self._inject_fault():
+            return
+        page = egazette_postback(self.config, form)
+        if page is None:
+            return self._send(500, b"Invalid postback or callback argument.", "text/plain")
+        self._send_html(page)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Clients hanging up (e.g. after an injected fault) are expected, not worth a traceback."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_server(port: int = 0, **config):
+    """Serve in a background thread. Returns (server, base_url); call server.shutdown() to stop."""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"config": MockConfig(**config)})
+    server = MockServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--pages", type=int, default=20, help="egazette result pages per reference type")
+    parser.add_argument("--pib-items", type=int, default=20, help="releases per PIB month listing")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--pdf-kb", type=int, default=256, help="size of every served PDF")
+    parser.add_argument("--fail-rate", type=float, default=0, help="share of requests answered 503")
+    parser.add_argument("--max-rps", type=float, default=0, help="answer 429 above this many requests per second")
+    parser.add_argument("--slow-rate", type=float, default=0, help="share of responses delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=0)
+    parser.add_argument("--cut-rate", type=float, default=0, help="share of PDF bodies cut off halfway")
+    parser.add_argument("--seed", type=int, default=None, help="seed for repeatable faults")
+    parser.add_argument("--no-event-validation", action="store_true",
+                        help="accept pager postbacks to any page, not just the ones the current page links to")
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        args.port, pages=args.pages, pib_items=args.pib_items, latency_ms=args.latency_ms, pdf_kb=args.pdf_kb,
+        fail_rate=args.fail_rate, max_rps=args.max_rps, slow_rate=args.slow_rate, slow_ms=args.slow_ms,
+        cut_rate=args.cut_rate, seed=args.seed, event_validation=not args.no_event_validation,
+    )
+    print(f"🧪 Mock egazette at {base_url}/ and PIB at {base_url}/pib/ (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
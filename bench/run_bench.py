@@ -0,0 +1,313 @@
+"""Benchmark the scrapers end-to-end against the local mock sites in bench/mock_server.py.
+
+Each benchmark runs in its own worker process (so peak RSS is its own) and
+reports throughput, per-stage latency percentiles from common.waits.step_latencies
+and peak memory:
+
+    egazette_http      search + pager postbacks over HTTP, grid parsing      pages/s, rows/s
+    egazette_download  PdfDownloader against the mock WriteReadData files   MB/s
+    pib_render         html_to_pdf on the recorded release body             items/s
+    egazette_selenium  the same crawl in headless Chrome                    pages/s  (needs Chrome)
+    pib_extract        process_month on one mock month listing              items/s  (needs Chrome)
+
+    python bench/run_bench.py
+    python bench/run_bench.py --only egazette_http,pib_render --pages 40 --latency-ms 30 --json bench.json
+    python bench/run_bench.py --only egazette_http,egazette_download --fail-rate 0.1 --max-rps 200
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(REPO_DIR)
+from common.waits import record_latency, step_latencies, timed
+
+BENCHMARKS = ["egazette_http", "egazette_download", "pib_render", "egazette_selenium", "pib_extract"]
+
+
+class Skipped(Exception):
+    """The benchmark can't run here (e.g. no Chrome)."""
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return {"n": len(ordered), "p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": ordered[-1]}
+
+
+def use_scraper(folder: str):
+    """Make a scraper's sibling modules importable, the way running its main.py does."""
+    sys.path.insert(0, os.path.join(REPO_DIR, folder))
+
+
+def headless_chrome():
+    from common.drivers import new_chrome
+
+    try:
+        return new_chrome(headless=True)
+    except Exception as e:
+        raise Skipped(f"headless Chrome unavailable: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+
+
+def next_page_link(pager):
+    """The pager link to the page after the current one (the trailing "..." at a block end)."""
+    wanted = f"Page${int(pager['current']) + 1}"
+    return next((link for link in pager["links"] if link[2] == wanted), None)
+
+
+# ---------------------------------------------------------------- benchmarks (worker side)
+# Each returns (counts, seconds), timed after its imports and setup.
+
+def bench_egazette_http(args, base_url):
+    use_scraper("egazette")
+    from grid import parse_gazette_page
+    from postback import GazetteSearch
+
+    start = time.perf_counter()
+    search = GazetteSearch(base_url + "/")
+    with timed("search postbacks"):
+        search.search("Act")
+
+    pages = rows = 0
+    while True:
+        with timed("parse page"):
+            records, pager = parse_gazette_page(search.tree)
+        pages += 1
+        rows += len(records)
+        link = next_page_link(pager)
+        if link is None:
+            break
+        with timed("pager postback"):
+            search.goto_page(link[1], link[2])
+    return {"pages": pages, "rows": rows}, time.perf_counter() - start
+
+
+def bench_egazette_download(args, base_url):
+    use_scraper("egazette")
+    from common.blobstore import BlobStore
+    from downloader import PdfDownloader
+
+    # The mock serves identical bytes for every PDF, so the store keeps one blob for all of them
+    store = BlobStore(tempfile.mkdtemp(prefix="bench_pdfs_"))
+    started, futures = {}, []
+    start = time.perf_counter()
+    with PdfDownloader(store.root, max_workers=args.download_workers, per_host_limit=args.download_workers, store=store) as downloader:
+        for n in range(1, args.downloads + 1):
+            url = f"{base_url}/WriteReadData/2025/{n}.pdf"
+            started[n] = time.perf_counter()
+            future = downloader.submit(url, f"bench:{n}")
+            futures.append(future)
+            future.add_done_callback(
+                lambda f, n=n: record_latency("pdf download", time.perf_counter() - started[n])
+            )
+    elapsed = time.perf_counter() - start
+    sizes = [future.result()["size"] for future in futures if future.result()]
+    store.close()
+    return {"pdfs": len(sizes), "MB": sum(sizes) / 2**20}, elapsed
+
+
+def bench_pib_render(args, base_url):
+    use_scraper("pib")
+    from renderer import html_to_pdf
+
+    with open(os.path.join(BENCH_DIR, "fixtures", "pib_release_body.html"), encoding="utf-8") as f:
+        html_body = f.read()
+    folder = tempfile.mkdtemp(prefix="bench_render_")
+    start = time.perf_counter()
+    for n in range(args.renders):
+        with timed("html_to_pdf"):
+            html_to_pdf(f"Benchmark release {n}", html_body, os.path.join(folder, f"{n}.pdf"), backend=args.render_backend)
+    return {"items": args.renders}, time.perf_counter() - start
+
+
+def bench_egazette_selenium(args, base_url):
+    driver = headless_chrome()
+    use_scraper("egazette")
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from common.waits import postback, select_and_wait, wait_for_change, wait_until
+    from grid import CURRENT_PAGE_JS, extract_grid
+
+    start = time.perf_counter()
+    try:
+        driver.get(base_url + "/")
+        for element_id, step in (("sgzt", "search page load"), ("btnBill", "bill form load")):
+            button = wait_until(driver, EC.element_to_be_clickable((By.ID, element_id)), element_id, 10)
+            with postback(driver, step):
+                driver.execute_script("arguments[0].click();", button)
+        select_and_wait(driver, (By.ID, "ddlreftype"), "Act", "ref type select")
+        with postback(driver, "search submit"):
+            driver.execute_script("arguments[0].click();", driver.find_element(By.ID, "ImgSubmitDetails"))
+
+        pages = rows = 0
+        while True:
+            with timed("extract grid"):
+                records, pager = extract_grid(driver)
+            pages += 1
+            rows += len(records)
+            link = next_page_link(pager)
+            if link is None:
+                break
+            with postback(driver, "pager postback"):
+                driver.execute_script("__doPostBack(arguments[0], arguments[1]);", link[1], link[2])
+            wait_for_change(driver, CURRENT_PAGE_JS, pager["current"], "pager change", 10)
+        return {"pages": pages, "rows": rows}, time.perf_counter() - start
+    finally:
+        driver.quit()
+
+
+def bench_pib_extract(args, base_url):
+    driver = headless_chrome()
+    use_scraper("pib")
+    from datetime import datetime
+
+    from common.pipeline import Pipeline
+    from plugin import PibSource
+    from scheduler import MonthJob
+
+    folder = tempfile.mkdtemp(prefix="bench_pib_")
+    source = PibSource(
+        os.path.join(folder, "results.jsonl"), os.path.join(folder, "seen.sqlite3"), folder,
+        render_workers=os.cpu_count() or 2, incremental=False, pib_url=base_url + "/pib/",
+    )
+    pipeline = source.pipeline = Pipeline(source.stages(), on_error=source.on_error).start()
+    start = time.perf_counter()
+    try:
+        with timed("process month"):
+            items = source.process_month(driver, MonthJob("Speeches", "Speeches", datetime.now().year, 1))
+        with timed("pipeline drain"):
+            pipeline.close()
+        return {"items": items}, time.perf_counter() - start
+    finally:
+        driver.quit()
+        source.close()
+
+
+THROUGHPUT = {
+    "egazette_http": ("pages", "rows"),
+    "egazette_download": ("MB", "pdfs"),
+    "pib_render": ("items",),
+    "egazette_selenium": ("pages", "rows"),
+    "pib_extract": ("items",),
+}
+
+
+def run_worker(args):
+    """Run one benchmark in this process and write its result as JSON to args.result_file."""
+    os.chdir(tempfile.mkdtemp(prefix=f"bench_{args.worker}_"))
+    from common.governor import shared_governor
+
+    shared_governor(rate=args.rate, burst=max(1, int(args.rate)))
+    result = {"benchmark": args.worker}
+    try:
+        counts, elapsed = globals()[f"bench_{args.worker}"](args, args.base_url)
+        result.update(
+            status="ok", seconds=elapsed, counts=counts,
+            throughput={f"{name}/s": counts[name] / elapsed for name in THROUGHPUT[args.worker]},
+            stages={step: percentiles(samples) for step, samples in step_latencies.items()},
+        )
+    except Skipped as e:
+        result.update(status="skipped", reason=str(e))
+    except Exception as e:
+        result.update(status="failed", reason=f"{type(e).__name__}: {e}")
+    # ru_maxrss is KiB on Linux
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# ---------------------------------------------------------------- driver side
+
+def run_benchmark(name, args, base_url):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_file = f.name
+    command = [
+        sys.executable, os.path.abspath(__file__), "--worker", name, "--base-url", base_url,
+        "--result-file", result_file, "--downloads", str(args.downloads),
+        "--download-workers", str(args.download_workers), "--renders", str(args.renders),
+        "--render-backend", args.render_backend, "--rate", str(args.rate),
+    ]
+    completed = subprocess.run(command, stdout=subprocess.DEVNULL if not args.verbose else None, stderr=subprocess.PIPE, text=True)
+    try:
+        with open(result_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"benchmark": name, "status": "failed", "reason": (completed.stderr or "worker crashed").strip().splitlines()[-1]}
+    finally:
+        os.remove(result_file)
+
+
+def print_result(result):
+    name = result["benchmark"]
+    if result["status"] != "ok":
+        icon = "⏭️" if result["status"] == "skipped" else "❌"
+        print(f"{icon} {name}: {result['status']} ({result.get('reason')})")
+        return
+    rates = "  ".join(f"{value:,.1f} {unit}" for unit, value in result["throughput"].items())
+    print(f"✅ {name}: {rates}  in {result['seconds']:.2f}s  peak RSS {result['peak_rss_mb']:.0f} MB")
+    for step, stats in sorted(result["stages"].items()):
+        print(
+            f"   {step:<20} n={stats['n']:<5} p50={stats['p50'] * 1000:8.1f}ms p90={stats['p90'] * 1000:8.1f}ms "
+            f"p99={stats['p99'] * 1000:8.1f}ms max={stats['max'] * 1000:8.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="comma-separated benchmarks to run (default: all)")
+    parser.add_argument("--pages", type=int, default=20, help="egazette result pages served by the mock")
+    parser.add_argument("--pib-items", type=int, default=10, help="releases on the mock PIB month listing")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay the mock adds to every response")
+    parser.add_argument("--pdf-kb", type=int, default=256, help="size of the mock PDFs")
+    parser.add_argument("--downloads", type=int, default=100, help="PDFs fetched by egazette_download")
+    parser.add_argument("--download-workers", type=int, default=8)
+    parser.add_argument("--renders", type=int, default=20, help="PDFs rendered by pib_render")
+    parser.add_argument("--render-backend", default="xhtml2pdf", help="pib_render backend: xhtml2pdf or reportlab")
+    parser.add_argument("--rate", type=float, default=1000, help="governor requests per second per host")
+    parser.add_argument("--fail-rate", type=float, default=0, help="share of mock responses that are 503s")
+    parser.add_argument("--max-rps", type=float, default=0, help="mock answers 429 above this request rate")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the scrapers' own output")
+    parser.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    from mock_server import start_server
+
+    names = args.only.split(",") if args.only else BENCHMARKS
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    server, base_url = start_server(
+        pages=args.pages, pib_items=args.pib_items, latency_ms=args.latency_ms, pdf_kb=args.pdf_kb,
+        fail_rate=args.fail_rate, max_rps=args.max_rps,
+    )
+    print(f"🧪 Mock sites at {base_url} ({args.pages} egazette pages, {args.latency_ms:g} ms latency)")
+    results = []
+    try:
+        for name in names:
+            result = run_benchmark(name, args, base_url)
+            print_result(result)
+            results.append(result)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Helpers shared by the PIB and egazette scrapers."""
@@ -0,0 +1,20 @@
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", **open_kwargs):
+    """Open a temp file next to path and move it into place only once fully written.
+
+    A crash mid-write leaves the previous version of path untouched.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
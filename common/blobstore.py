@@ -0,0 +1,174 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+CHUNK_SIZE = 64 * 1024
+HEAD_SIZE = 8  # leading bytes kept for format checks (b"%PDF-1.7")
+TAIL_SIZE = 1024  # trailing bytes kept for format checks (the %%EOF marker)
+
+
+class _BlobWriter:
+    """File-like handle that hashes everything written to it and keeps its first and last bytes."""
+
+    def __init__(self, file):
+        self._file = file
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.tail = b""
+        self.digest = None
+        self.path = None
+
+    def _track(self, data: bytes):
+        self._hash.update(data)
+        self.size += len(data)
+        if len(self.head) < HEAD_SIZE:
+            self.head += data[: HEAD_SIZE - len(self.head)]
+        self.tail = (self.tail + data[-TAIL_SIZE:])[-TAIL_SIZE:]
+
+    def write(self, data: bytes):
+        self._track(data)
+        return self._file.write(data)
+
+    def _resume(self):
+        """Account for the bytes already in the file (opened for appending)."""
+        self._file.seek(0)
+        for chunk in iter(lambda: self._file.read(CHUNK_SIZE), b""):
+            self._track(chunk)
+
+    def restart(self):
+        """Drop everything written so far (e.g. the server ignored a Range request)."""
+        self._file.seek(0)
+        self._file.truncate()
+        self.__init__(self._file)
+
+
+class BlobStore:
+    """Content-addressed file store with an index from source IDs to blobs.
+
+    Every file is stored once, at blobs/ab/cd/<sha256>.pdf; identical content
+    written under another source ID just points that ID at the existing blob.
+    """
+
+    def __init__(self, root: str, index_name: str = "index.sqlite3"):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, index_name), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sources (
+                    source TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    suffix TEXT NOT NULL,
+                    stored_at TEXT NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sources_digest ON sources (digest)")
+
+    def blob_path(self, digest: str, suffix: str = ".pdf"):
+        return os.path.join(self.blob_dir, digest[:2], digest[2:4], digest + suffix)
+
+    def temp_path(self, suffix: str = ".pdf"):
+        """A fresh path on the store's filesystem, for files produced elsewhere (e.g. rendered)."""
+        return os.path.join(self.tmp_dir, f"{uuid.uuid4().hex}{suffix}.part")
+
+    def partial_path(self, source: str, suffix: str = ".pdf"):
+        """Where an unfinished resumable write for source is kept between attempts (and runs)."""
+        name = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        return os.path.join(self.tmp_dir, f"{name}{suffix}.partial")
+
+    def _commit(self, source: str, tmp_path: str, digest: str, size: int, suffix: str):
+        """Move a finished temp file into place (or drop it if the blob exists) and index it."""
+        path = self.blob_path(digest, suffix)
+        if os.path.exists(path):
+            os.remove(tmp_path)  # same content already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (source, digest, size, suffix, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (source, digest, size, suffix, datetime.now().isoformat(timespec="seconds")),
+            )
+        return path
+
+    @contextmanager
+    def writer(self, source: str, suffix: str = ".pdf", resume: bool = False):
+        """Stream a file into the store:
+
+            with store.writer("egazette:262469") as blob:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    blob.write(chunk)
+            blob.path, blob.digest, blob.size
+
+        Nothing is stored or indexed if the block raises. With resume=True
+        the unfinished file is kept at partial_path(source) instead, and the
+        next resumable writer for source starts with blob.size bytes already
+        written, to be continued (e.g. with an HTTP Range request) or restart()ed.
+        """
+        tmp_path = self.partial_path(source, suffix) if resume else self.temp_path(suffix)
+        committed = False
+        try:
+            with open(tmp_path, "a+b" if resume else "wb") as f:
+                blob = _BlobWriter(f)
+                if resume:
+                    blob._resume()
+                yield blob
+                f.flush()
+                os.fsync(f.fileno())
+            blob.digest = blob._hash.hexdigest()
+            blob.path = self._commit(source, tmp_path, blob.digest, blob.size, suffix)
+            committed = True
+        finally:
+            # A resumable partial is kept for next time, unless nothing was written to it
+            if os.path.exists(tmp_path) and (committed or not resume or os.path.getsize(tmp_path) == 0):
+                os.remove(tmp_path)
+
+    def put_file(self, source: str, path: str, suffix: str = ".pdf"):
+        """Move an existing file (e.g. from temp_path()) into the store. Returns the blob path."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return self._commit(source, path, digest.hexdigest(), os.path.getsize(path), suffix)
+
+    def lookup(self, source: str):
+        """{"digest", "size", "path", "stored_at"} of the source's blob, or None if it isn't stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, size, suffix, stored_at FROM sources WHERE source = ?", (source,)
+            ).fetchone()
+        if row is None:
+            return None
+        path = self.blob_path(row[0], row[2])
+        if not os.path.exists(path):
+            return None
+        return {"digest": row[0], "size": row[1], "path": path, "stored_at": row[3]}
+
+    def link(self, source: str, dest: str):
+        """Give a stored source a readable name outside the store (hard link, copy across filesystems)."""
+        blob = self.lookup(source)
+        if blob is None:
+            raise KeyError(source)
+        if os.path.exists(dest):
+            os.remove(dest)
+        try:
+            os.link(blob["path"], dest)
+        except OSError:
+            shutil.copyfile(blob["path"], dest)
+        return dest
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common.metrics import event, inc, metrics, observe
+
+STALE_INTERVALS = 3  # a job is unhealthy once it hasn't succeeded for this many intervals
+TICK = 1.0  # seconds between scheduler checks
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+class PollJob:
+    """One recurring poll: run() every interval seconds, starting right away.
+
+    run() returns a short summary (e.g. the number of new items queued),
+    shown on the health endpoint. stale_after (default STALE_INTERVALS
+    intervals) is how long the job may go without a successful run before
+    the daemon reports itself unhealthy.
+    """
+
+    def __init__(self, name: str, interval: float, run, stale_after: float = None):
+        self.name = name
+        self.interval = interval
+        self.run = run
+        self.stale_after = stale_after or STALE_INTERVALS * interval
+        self.next_run = time.time()
+        self.running = False
+        self.pending = False  # came due while running, runs once more right after
+        self.runs = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.created = time.time()
+        self.last_started = None
+        self.last_finished = None
+        self.last_success = None
+        self.last_result = None
+        self.last_error = None
+
+    def healthy(self, now: float = None):
+        now = now or time.time()
+        return now - (self.last_success or self.created) <= self.stale_after
+
+    def status(self):
+        return {
+            "name": self.name, "interval": self.interval, "healthy": self.healthy(), "running": self.running,
+            "pending": self.pending, "runs": self.runs, "failures": self.failures, "coalesced": self.coalesced,
+            "last_started": _iso(self.last_started), "last_finished": _iso(self.last_finished),
+            "last_success": _iso(self.last_success), "last_result": self.last_result, "last_error": self.last_error,
+            "next_run": _iso(self.next_run),
+        }
+
+
+class Scheduler:
+    """Run PollJobs on their intervals, each in its own thread, until stopped.
+
+    Overlapping runs are coalesced: a job that comes due while its previous
+    run is still going isn't started twice. It is marked pending instead,
+    and however many times that happens it runs once more when the current
+    run ends. Different jobs run concurrently.
+    """
+
+    def __init__(self, jobs, tick: float = TICK):
+        self.jobs = list(jobs)
+        self.tick = tick
+        self.started = time.time()
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def trigger(self, job: PollJob):
+        """Start job now, or mark it pending if it is already running."""
+        with self._lock:
+            if job.running:
+                if not job.pending:
+                    print(f"⏳ {job.name} is still running, polling again once it is done.")
+                job.pending = True
+                job.coalesced += 1
+                inc("poll_runs_total", job=job.name, outcome="coalesced")
+                return
+            job.running = True
+            job.next_run = time.time() + job.interval
+        thread = threading.Thread(target=self._run, args=(job,), name=f"poll-{job.name}", daemon=True)
+        self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+        thread.start()
+
+    def _run(self, job: PollJob):
+        while True:
+            job.last_started = start = time.time()
+            print(f"🔁 Polling {job.name}...")
+            try:
+                result = job.run()
+                job.last_success = time.time()
+                job.last_result = result
+                job.last_error = None
+                inc("poll_runs_total", job=job.name, outcome="ok")
+                print(f"✅ {job.name} poll done in {time.time() - start:.1f}s: {result}")
+            except Exception as e:
+                job.failures += 1
+                job.last_error = repr(e)
+                inc("poll_runs_total", job=job.name, outcome="failed")
+                event("poll_failed", job=job.name, error=repr(e))
+                print(f"❌ {job.name} poll failed: {e}")
+            job.last_finished = time.time()
+            job.runs += 1
+            observe("poll_seconds", job.last_finished - start, job=job.name)
+
+            with self._lock:
+                if not job.pending or self.stopped.is_set():
+                    job.running = False
+                    return
+                job.pending = False
+                job.next_run = time.time() + job.interval
+
+    def run_forever(self):
+        """Trigger jobs as they come due until stop() is called, then wait for running polls to end."""
+        while not self.stopped.is_set():
+            now = time.time()
+            for job in self.jobs:
+                if now >= job.next_run:
+                    self.trigger(job)
+            self.stopped.wait(self.tick)
+        for thread in self._threads:
+            thread.join()
+
+    def stop(self):
+        self.stopped.set()
+
+    def healthy(self):
+        return all(job.healthy() for job in self.jobs)
+
+    def status(self):
+        return {"healthy": self.healthy(), "started": _iso(self.started), "uptime_seconds": round(time.time() - self.started),
+                "jobs": [job.status() for job in self.jobs]}
+
+
+def serve_health(scheduler: Scheduler, port: int, host: str = "0.0.0.0"):
+    """Serve /health (JSON job status; 200 when every job is healthy, 503 otherwise) and /metrics (Prometheus).
+
+    Runs on a daemon thread. Returns the server; call shutdown() on it to stop.
+    """
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0].rstrip("/")
+            if path in ("", "/health", "/healthz"):
+                status = scheduler.status()
+                self._send(200 if status["healthy"] else 503, json.dumps(status, indent=2), "application/json; charset=utf-8")
+            elif path == "/metrics":
+                self._send(200, metrics.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                self._send(404, "not found\n", "text/plain; charset=utf-8")
+
+        def _send(self, code, body, content_type):
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # health checks would flood the output
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    print(f"🩺 Health endpoint on http://{host}:{server.server_address[1]}/health")
+    return server
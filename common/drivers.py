@@ -0,0 +1,231 @@
+import os
+import threading
+
+# Selenium is imported inside the functions below: importing it costs a few hundred
+# milliseconds, which the HTTP-only paths and the parsing code shouldn't pay.
+
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,  # the scrapers never look at pixels
+    "profile.default_content_setting_values.notifications": 2,
+}
+# Requests dropped by the browser before they leave it (CDP Network.setBlockedURLs, "*" is a wildcard):
+# images and banners, web fonts, media and third-party analytics, none of which the scrapers read
+BLOCKED_IMAGE_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"]
+BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.avi",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*analytics.js*", "*gtag/js*",
+    "*facebook.net*", "*connect.facebook.*", "*platform.twitter.com*", "*addthis.com*", "*sharethis.com*",
+    "*youtube.com/embed*", "*hotjar.com*",
+]
+DISK_CACHE_MB = 256  # bound of a shared disk cache
+RECYCLE_SHARE = 0.8  # a driver whose JS heap passes this share of its memory cap is restarted on release
+
+
+def chrome_options(headless: bool = True, profile_dir: str = None, block_images: bool = True,
+                   block_stylesheets: bool = False, cache_dir: str = None, cache_mb: int = DISK_CACHE_MB,
+                   memory_mb: int = None):
+    """Chrome options tuned for scraping.
+
+    The page-load strategy is "eager": navigation returns at DOMContentLoaded
+    and every step waits for the elements it needs anyway. Stylesheets are
+    only blocked on request since element_to_be_clickable depends on layout.
+    cache_dir puts the HTTP disk cache (bounded by cache_mb) outside the
+    profile, so drivers pointed at the same folder share cached scripts and
+    pages. memory_mb caps each renderer's JavaScript heap.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.page_load_strategy = "eager"
+    for argument in ("--disable-gpu", "--disable-dev-shm-usage", "--disable-extensions",
+                     "--no-first-run", "--no-default-browser-check", "--mute-audio",
+                     "--disable-background-networking", "--disable-component-update", "--disable-sync",
+                     "--disable-default-apps", "--metrics-recording-only"):
+        options.add_argument(argument)
+    if cache_dir:
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(cache_dir)}")
+        options.add_argument(f"--disk-cache-size={cache_mb * 2**20}")
+    if memory_mb:
+        options.add_argument(f"--js-flags=--max-old-space-size={memory_mb}")
+        options.add_argument("--renderer-process-limit=2")  # tabs share renderers instead of one process each
+
+    prefs = dict(BLOCKED_CONTENT_PREFS) if block_images else {}
+    if block_stylesheets:
+        prefs["profile.managed_default_content_settings.stylesheets"] = 2
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    return options
+
+
+def block_urls(driver, patterns=BLOCKED_URLS):
+    """Have the driver's current tab drop requests matching patterns (CDP Network.setBlockedURLs).
+
+    Tabs opened later don't inherit this; they still skip images through the content settings.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:
+        print(f"⚠️ Could not block unused resources: {e}")
+
+
+def heap_mb(driver):
+    """MB of JavaScript heap the driver's current page uses (0 if the browser doesn't say)."""
+    try:
+        used = driver.execute_script("return window.performance.memory ? performance.memory.usedJSHeapSize : 0;")
+        return (used or 0) / 2**20
+    except Exception:
+        return 0
+
+
+def new_chrome(blocked_urls=BLOCKED_URLS, **options):
+    """Start a Chrome driver with chrome_options(**options).
+
+    It drops requests for blocked_urls, plus BLOCKED_IMAGE_URLS unless block_images=False.
+    """
+    from selenium import webdriver
+
+    driver = webdriver.Chrome(options=chrome_options(**options))
+    patterns = list(blocked_urls or []) + (BLOCKED_IMAGE_URLS if options.get("block_images", True) else [])
+    if patterns:
+        block_urls(driver, patterns)
+    return driver
+
+
+def driver_alive(driver):
+    """True if the browser session still answers commands."""
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """Chrome drivers started on first use and handed back for reuse.
+
+    acquire() returns an idle driver or starts a new one; release() puts it
+    back for the next job (or crawl, when the pool outlives one). Up to size
+    drivers get their own persistent profile under profile_root (Chrome locks
+    a profile to one process), so their disk cache and cookies stay warm
+    across runs. warm() starts drivers in parallel before a crawl needs them.
+
+    Options go to new_chrome: e.g. cache_dir for one disk cache shared by
+    every driver, memory_mb to cap each one (a driver grown past
+    RECYCLE_SHARE of it is restarted instead of reused), blocked_urls.
+    """
+
+    def __init__(self, size: int = 4, profile_root: str = None, **options):
+        self.size = size
+        self.profile_root = profile_root
+        self.options = options
+        self.memory_mb = options.get("memory_mb")
+        self._lock = threading.Lock()
+        self._idle = []
+        self._busy = set()
+        self._free_slots = list(range(size))
+        self._slots = {}  # driver -> profile slot
+
+    def _start(self):
+        with self._lock:
+            slot = self._free_slots.pop(0) if self._free_slots else None
+        profile_dir = None
+        if self.profile_root and slot is not None:
+            profile_dir = os.path.join(self.profile_root, f"driver-{slot}")
+            os.makedirs(profile_dir, exist_ok=True)
+        try:
+            driver = new_chrome(profile_dir=profile_dir, **self.options)
+        except Exception:
+            with self._lock:
+                if slot is not None:
+                    self._free_slots.append(slot)
+            raise
+        with self._lock:
+            self._slots[driver] = slot
+        return driver
+
+    def acquire(self):
+        """An idle warm driver if there is one, otherwise a freshly started one."""
+        with self._lock:
+            if self._idle:
+                driver = self._idle.pop()
+                self._busy.add(driver)
+                return driver
+        driver = self._start()
+        with self._lock:
+            self._busy.add(driver)
+        return driver
+
+    def release(self, driver):
+        """Hand a driver back; dead ones are discarded instead of reused."""
+        if not driver_alive(driver):
+            return self.discard(driver)
+        if self.memory_mb:
+            used = heap_mb(driver)
+            if used > self.memory_mb * RECYCLE_SHARE:
+                print(f"♻️ Restarting a browser using {used:.0f} MB of its {self.memory_mb} MB.")
+                return self.discard(driver)
+        with self._lock:
+            self._busy.discard(driver)
+            self._idle.append(driver)
+
+    def discard(self, driver):
+        """Quit a broken driver and free its profile for a replacement."""
+        quit_driver(driver)
+        with self._lock:
+            self._busy.discard(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+            slot = self._slots.pop(driver, None)
+            if slot is not None:
+                self._free_slots.append(slot)
+
+    def warm(self, count: int = None):
+        """Start drivers in parallel until count (default: size) are idle. Returns how many are idle."""
+        with self._lock:
+            missing = min(count or self.size, self.size) - len(self._idle) - len(self._busy)
+
+        def start():
+            try:
+                driver = self._start()
+            except Exception as e:
+                print(f"⚠️ Could not pre-start a browser: {e}")
+                return
+            with self._lock:
+                self._idle.append(driver)
+
+        threads = [threading.Thread(target=start, name=f"warm-driver-{n}", daemon=True) for n in range(max(0, missing))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(self._idle)
+
+    def close(self):
+        with self._lock:
+            drivers = self._idle + list(self._busy)
+            self._idle, self._busy = [], set()
+            self._slots.clear()
+            self._free_slots = list(range(self.size))
+        for driver in drivers:
+            quit_driver(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,327 @@
+import random
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from common.metrics import event, inc, observe
+
+# Per-host defaults. Both portals are small government servers: a handful of
+# requests per second, a few in flight, and a quick back-off when they struggle.
+RATE = 5.0  # requests per second per host (token bucket refill rate)
+BURST = 10  # tokens a quiet host can spend at once
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+INITIAL_CONCURRENCY = 4
+LATENCY_TOLERANCE = 3.0  # a response this many times slower than the host's baseline counts as congestion
+BASELINE_DRIFT = 0.02  # share of each slower sample the baseline moves up by, so an old best is forgotten
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5  # seconds, doubled per retry, full jitter
+BACKOFF_MAX = 30.0
+TIMEOUT = (10, 60)  # (connect, read) seconds, used when the caller passes none
+BREAKER_FAILURES = 5  # consecutive failures that open a host's circuit
+BREAKER_COOLDOWN = 30.0  # seconds an open circuit rejects requests before letting one probe through
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host failed too often recently; requests are rejected until its cooldown ends."""
+
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, at most burst saved up."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next seconds (e.g. a Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit: +1 per window of good responses, halved on errors or congestion.
+
+    A response counts as congested when it takes LATENCY_TOLERANCE times the
+    baseline latency of its kind of request (HEAD, GET, POST postback...): the
+    fastest seen, drifting up towards recent samples. Decreases are spaced at
+    least one smoothed latency apart, so one burst of failures halves the limit once.
+    """
+
+    def __init__(self, initial: int = INITIAL_CONCURRENCY, minimum: int = MIN_CONCURRENCY,
+                 maximum: int = MAX_CONCURRENCY, tolerance: float = LATENCY_TOLERANCE):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self.baselines = {}  # kind -> baseline latency
+        self.smoothed_latency = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float = None, ok: bool = True, kind: str = None):
+        """Give the slot back and adjust the limit from the outcome (latency None: no sample)."""
+        with self._cond:
+            self.in_flight -= 1
+            congested = not ok
+            if latency is not None:
+                baseline = self.baselines.get(kind, latency)
+                congested = congested or latency > baseline * self.tolerance
+                self.baselines[kind] = min(latency, baseline + BASELINE_DRIFT * (latency - baseline))
+                self.smoothed_latency = latency if self.smoothed_latency is None else 0.8 * self.smoothed_latency + 0.2 * latency
+            now = time.monotonic()
+            if congested:
+                if now - self._last_decrease > (self.smoothed_latency or 0):
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            elif ok:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """Closed -> open after `failures` consecutive failures -> half-open after `cooldown` -> one probe."""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a request may go out now."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half-open"
+                return True  # the probe
+            return self.state == "closed"
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.state = "closed"
+                self._consecutive = 0
+                return
+            self._consecutive += 1
+            if self.state == "half-open" or self._consecutive >= self.failures:
+                if self.state != "open":
+                    print(f"🔌 Circuit opened after {self._consecutive} failures, pausing {self.cooldown:g}s.")
+                    inc("circuit_opened_total")
+                    event("circuit_opened", failures=self._consecutive, cooldown=self.cooldown)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class _Host:
+    def __init__(self, governor):
+        self.bucket = TokenBucket(governor.rate, governor.burst)
+        self.limit = AdaptiveLimit(governor.initial_concurrency, governor.min_concurrency, governor.max_concurrency)
+        self.breaker = CircuitBreaker(governor.breaker_failures, governor.breaker_cooldown)
+        self.counts = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+
+def retry_after(response):
+    """Seconds asked for by a Retry-After header (delay or HTTP date), or None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestGovernor:
+    """Rate limits, retries, adaptive concurrency and circuit breaking per host.
+
+    Every request to a host waits for a token from the host's bucket and a
+    slot under its AIMD concurrency limit. Connection errors, timeouts and
+    RETRY_STATUSES are retried with jittered exponential backoff (honouring
+    Retry-After); throttling statuses also pause the host's bucket. Once a
+    host fails BREAKER_FAILURES times in a row its circuit opens and requests
+    fail fast with CircuitOpenError until a probe succeeds.
+
+    ASP.NET postbacks only re-render a page, so POSTs are retried too.
+    With stream=True the slot is held until the headers arrive, not for the body.
+    """
+
+    def __init__(self, rate: float = RATE, burst: int = BURST, max_attempts: int = MAX_ATTEMPTS,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX, timeout=TIMEOUT,
+                 initial_concurrency: int = INITIAL_CONCURRENCY, min_concurrency: int = MIN_CONCURRENCY,
+                 max_concurrency: int = MAX_CONCURRENCY, breaker_failures: int = BREAKER_FAILURES,
+                 breaker_cooldown: float = BREAKER_COOLDOWN):
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str):
+        name = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if name not in self._hosts:
+                self._hosts[name] = _Host(self)
+            return self._hosts[name]
+
+    def backoff(self, attempt: int):
+        """Full-jitter delay before retry number attempt (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def send(self, send, method: str, url: str, probe: bool = False, **kwargs):
+        """Call send(method, url, **kwargs) (e.g. Session.request) under the host's limits, retrying transient failures.
+
+        probe=True is for a request that may well be refused (e.g. a postback the site
+        might reject): it is sent once, and its outcome counts towards neither the
+        breaker nor the concurrency limit.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = self.host(url)
+        host_name = urllib.parse.urlsplit(url).netloc
+        if probe:
+            return self._probe(send, host, host_name, method, url, **kwargs)
+        for attempt in range(1, self.max_attempts + 1):
+            if not host.breaker.allow():
+                host.counts["rejected"] += 1
+                inc("http_requests_total", host=host_name, outcome="rejected")
+                raise CircuitOpenError(f"circuit open for {host_name}, not requesting {url}")
+
+            host.bucket.acquire()
+            host.limit.acquire()
+            host.counts["requests"] += 1
+            start = time.perf_counter()
+            response = error = None
+            try:
+                response = send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            finally:
+                # Also runs when send() raises anything else, so a failed half-open probe reopens the circuit
+                latency = time.perf_counter() - start if response is not None else None
+                ok = response is not None and response.status_code not in RETRY_STATUSES
+                host.limit.release(latency, ok, kind=method.upper())
+                host.breaker.record(ok)
+                outcome = type(error).__name__ if error is not None else (response.status_code if response is not None else "exception")
+                inc("http_requests_total", host=host_name, outcome=outcome)
+                if latency is not None:
+                    observe("http_request_seconds", latency, host=host_name)
+            if ok:
+                return response
+
+            host.counts["failures"] += 1
+            if attempt == self.max_attempts:
+                if error is not None:
+                    raise error
+                return response  # the caller sees the last error status
+
+            delay = self.backoff(attempt)
+            wait = retry_after(response)
+            if wait is not None:
+                delay = max(delay, min(wait, self.backoff_max))
+            if response is not None:
+                if response.status_code in THROTTLE_STATUSES:
+                    host.bucket.pause(delay)
+                response.close()  # frees the pooled connection of a stream=True response
+            reason = error or f"status {response.status_code}"
+            print(f"🔁 Retrying {method} {url} in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts}): {reason}")
+            host.counts["retries"] += 1
+            inc("http_retries_total", host=host_name)
+            event("http_retry", method=method, url=url, attempt=attempt, delay=round(delay, 3), reason=str(reason))
+            time.sleep(delay)
+
+    def _probe(self, send, host, host_name, method, url, **kwargs):
+        if host.breaker.state != "closed":  # leave a half-open circuit's probe to a real request
+            host.counts["rejected"] += 1
+            inc("http_requests_total", host=host_name, outcome="rejected")
+            raise CircuitOpenError(f"circuit {host.breaker.state} for {host_name}, not requesting {url}")
+        host.bucket.acquire()
+        host.counts["requests"] += 1
+        start = time.perf_counter()
+        try:
+            response = send(method, url, **kwargs)
+        except Exception as e:
+            inc("http_requests_total", host=host_name, outcome=type(e).__name__)
+            raise
+        inc("http_requests_total", host=host_name, outcome=response.status_code)
+        observe("http_request_seconds", time.perf_counter() - start, host=host_name)
+        return response
+
+    def print_report(self):
+        """One line per host: traffic counts, current concurrency limit and circuit state."""
+        if not self._hosts:
+            return
+        print("🚦 Request governor per host:")
+        for name, host in sorted(self._hosts.items()):
+            counts = " ".join(f"{key}={value}" for key, value in host.counts.items())
+            print(f"   {name:<28} {counts} limit={host.limit.limit:.1f} circuit={host.breaker.state}")
+
+
+class GovernedSession(requests.Session):
+    """requests.Session whose every request goes through a RequestGovernor."""
+
+    def __init__(self, governor: RequestGovernor = None):
+        super().__init__()
+        self.governor = governor or shared_governor()
+
+    def request(self, method, url, probe: bool = False, **kwargs):
+        return self.governor.send(super().request, method, url, probe=probe, **kwargs)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_governor(**options):
+    """The process-wide RequestGovernor, so all sessions to a host share its limits.
+
+    Options (RequestGovernor arguments) replace it with a freshly configured one.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None or options:
+            _shared = RequestGovernor(**options)
+        return _shared
@@ -0,0 +1,163 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from common.atomic import atomic_write
+
+PREFIX = "scraper_"  # prepended to every exported metric name
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))  # seconds
+
+events_log = logging.getLogger("scraper.events")
+events_log.propagate = False
+
+
+class Metrics:
+    """Counters and latency histograms over fixed BUCKETS, keyed by name and labels.
+
+        metrics.inc("downloads_total", outcome="saved")
+        with metrics.timer("step_seconds", step="pdf fetch"):
+            ...
+        metrics.write("metrics.prom")  # or metrics.json
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [per-bucket counts, sum, count]
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[0][index] += 1
+                    break
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        """Everything recorded so far as plain data (what the JSON export contains)."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {"name": name, "labels": dict(labels), "count": count, "sum": total,
+                 "buckets": {("+Inf" if bound == float("inf") else bound): n for bound, n in zip(self.buckets, counts)}}
+                for (name, labels), (counts, total, count) in sorted(self.histograms.items())
+            ]
+        return {"started": self.started, "uptime_seconds": time.time() - self.started,
+                "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (counters and cumulative histograms)."""
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escape = lambda value: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self.histograms.items())
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                typed.add(name)
+            lines.append(f"{PREFIX}{name}{label_text(labels)} {value:.15g}")
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{PREFIX}{name}_bucket{label_text(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{label_text(labels)} {total:.6f}")
+            lines.append(f"{PREFIX}{name}_count{label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write all metrics to path, as JSON if it ends in .json and Prometheus text otherwise."""
+        with atomic_write(path, encoding="utf-8") as f:
+            if path.endswith(".json"):
+                json.dump(self.snapshot(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+metrics = Metrics()  # the process-wide registry every module records into
+
+inc = metrics.inc
+observe = metrics.observe
+timer = metrics.timer
+
+
+def event(name: str, **fields):
+    """Log one structured event (a JSON line) if log_events() was called; a no-op otherwise."""
+    if events_log.handlers:
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "event": name,
+                  "thread": threading.current_thread().name}
+        record.update(fields)
+        events_log.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def log_events(path: str):
+    """Append structured events to path, one JSON object per line."""
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    events_log.addHandler(handler)
+    events_log.setLevel(logging.INFO)
+    return handler
+
+
+def export_periodically(path: str, interval: float = 15.0):
+    """Rewrite path every interval seconds (e.g. for node_exporter's textfile collector).
+
+    Returns stop(), which writes the file a last time.
+    """
+    stopped = threading.Event()
+
+    def loop():
+        while not stopped.wait(interval):
+            metrics.write(path)
+
+    thread = threading.Thread(target=loop, name="metrics-export", daemon=True)
+    thread.start()
+
+    def stop():
+        stopped.set()
+        thread.join()
+        metrics.write(path)
+
+    return stop
@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+
+from common.metrics import event, inc
+from common.waits import record_latency
+
+QUEUE_SIZE = 64  # items buffered in front of each stage before producers block
+_DONE = object()
+
+
+class Stage:
+    """One step of a Pipeline, run by `workers` threads.
+
+    fn(item) returns the item handed to the next stage, or None to drop it;
+    with fan_out=True it returns an iterable of items instead. Exceptions
+    are reported to the pipeline's on_error and the item is dropped.
+    """
+
+    def __init__(self, name: str, fn, workers: int = 1, queue_size: int = QUEUE_SIZE, fan_out: bool = False):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue_size = queue_size
+        self.fan_out = fan_out
+
+
+class Pipeline:
+    """Stages connected by bounded queues, so a slow stage backs up the ones before it.
+
+        pipeline = Pipeline([Stage("download", fetch, workers=8), Stage("sink", write)]).start()
+        for record in crawl():
+            pipeline.put(record)  # blocks while the download queue is full
+        stats = pipeline.close()  # waits until every item has left the last stage
+
+    put() is thread-safe, so several producers (e.g. browser workers) can feed
+    one pipeline. Time spent per item is recorded in common.waits.step_latencies
+    under "<stage> stage" and counted as scraper_stage_items_total.
+    """
+
+    def __init__(self, stages, on_error=None):
+        self.stages = list(stages)
+        self.on_error = on_error or self._print_error
+        self.stats = {stage.name: {"in": 0, "out": 0, "errors": 0} for stage in self.stages}
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        self._running = [stage.workers for stage in self.stages]
+        self._lock = threading.Lock()
+        self._threads = []
+
+    @staticmethod
+    def _print_error(stage, item, error):
+        print(f"❌ [{stage.name}] {error}")
+
+    def start(self):
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def put(self, item):
+        """Feed one item to the first stage, blocking while its queue is full."""
+        self._queues[0].put(item)
+
+    def _emit(self, index: int, item):
+        if index + 1 < len(self.stages):
+            self._queues[index + 1].put(item)
+
+    def _work(self, index: int):
+        stage = self.stages[index]
+        stats = self.stats[stage.name]
+        while True:
+            item = self._queues[index].get()
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            try:
+                result = stage.fn(item)
+                outputs = [] if result is None else (result if stage.fan_out else [result])
+                with self._lock:
+                    stats["in"] += 1
+                inc("stage_items_total", stage=stage.name, outcome="ok")
+                for output in outputs:
+                    self._emit(index, output)
+                    with self._lock:
+                        stats["out"] += 1
+            except Exception as e:
+                with self._lock:
+                    stats["in"] += 1
+                    stats["errors"] += 1
+                inc("stage_items_total", stage=stage.name, outcome="error")
+                event("stage_error", stage=stage.name, error=repr(e))
+                try:
+                    self.on_error(stage, item, e)
+                except Exception as handler_error:
+                    print(f"❌ [{stage.name}] error handler failed: {handler_error}")
+            finally:
+                record_latency(f"{stage.name} stage", time.perf_counter() - start)
+
+        # The last worker out tells the next stage no more items are coming
+        with self._lock:
+            self._running[index] -= 1
+            last = self._running[index] == 0
+        if last and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                self._queues[index + 1].put(_DONE)
+
+    def close(self):
+        """Signal the end of input and wait for every stage to drain. Returns per-stage counts."""
+        for _ in range(self.stages[0].workers):
+            self._queues[0].put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        return self.stats
+
+    def run(self, items):
+        """Start, feed every item and close."""
+        self.start()
+        try:
+            for item in items:
+                self.put(item)
+        finally:
+            stats = self.close()
+        return stats
+
+    def print_stats(self):
+        for name, counts in self.stats.items():
+            errors = f", {counts['errors']} failed" if counts["errors"] else ""
+            print(f"   {name:<12} {counts['in']} in, {counts['out']} out{errors}")
+
+
+class SourcePlugin:
+    """A portal scraped through a Pipeline.
+
+    Subclasses build their stages() (fetch, extract, download/render, sink)
+    and push discovered work items into the pipeline from discover(pipeline),
+    which returns True if discovery ran to completion.
+    """
+
+    name = None
+
+    def stages(self):
+        raise NotImplementedError
+
+    def discover(self, pipeline):
+        raise NotImplementedError
+
+    def on_error(self, stage, item, error):
+        Pipeline._print_error(stage, item, error)
+
+    def close(self):
+        """Release the plugin's resources once the pipeline has drained."""
+
+    def run(self):
+        """Discover, drain the pipeline, close. Returns discover()'s result."""
+        pipeline = Pipeline(self.stages(), on_error=self.on_error).start()
+        try:
+            finished = self.discover(pipeline)
+        finally:
+            pipeline.close()
+            print(f"📦 {self.name} pipeline:")
+            pipeline.print_stats()
+            self.close()
+        return finished
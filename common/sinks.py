@@ -0,0 +1,200 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from common.waits import timed
+
+FSYNC_INTERVAL = 5.0  # seconds between fsyncs; every record is still flushed to the OS right away
+
+
+class _FileSink:
+    """Append-only file sink: one record per write, flushed immediately, fsynced periodically.
+
+    With key set, records whose key was already written (in this run or,
+    when appending, in the existing file) are skipped, so a resumed crawl
+    can replay records without duplicating them. A torn last record left
+    by a crash is cut off before appending.
+    """
+
+    def __init__(self, path: str, fieldnames=None, key: str = None, append: bool = True,
+                 fsync_interval: float = FSYNC_INTERVAL):
+        self.path = path
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.key = key
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._written_keys = set()
+        self._last_fsync = time.monotonic()
+
+        existed = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if existed:
+            existed = self._repair_tail()
+        if existed and key:
+            self._written_keys = self._load_keys()
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._start(existed)
+
+    def _repair_tail(self) -> bool:
+        """Cut a torn last record (a crash mid-write) back to the last newline. Returns False if nothing is left."""
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 64 * 1024)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                print(f"🩹 Dropping a torn last record ({end - position} bytes) from {self.path}")
+                f.truncate(position)
+        return position > 0
+
+    def _load_keys(self):
+        raise NotImplementedError
+
+    def _start(self, existed: bool):
+        pass
+
+    def _write(self, record: dict):
+        raise NotImplementedError
+
+    def write(self, record: dict) -> bool:
+        """Append one record. Returns False if its key was already written."""
+        with self._lock, timed("sink write"):
+            if self.key:
+                record_key = str(record.get(self.key))
+                if record_key in self._written_keys:
+                    return False
+                self._written_keys.add(record_key)
+            self._write(record)
+            self._file.flush()
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+        return True
+
+    def seen(self, key_value) -> bool:
+        """True if a record with this key was written (in this run or, when appending, before)."""
+        with self._lock:
+            return str(key_value) in self._written_keys
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonLinesSink(_FileSink):
+    """One JSON object per line."""
+
+    def _load_keys(self):
+        keys = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    keys.add(str(json.loads(line).get(self.key)))
+                except ValueError:
+                    continue  # corrupt line
+        return keys
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CsvSink(_FileSink):
+    """CSV with a header row; columns follow fieldnames."""
+
+    def _load_keys(self):
+        with open(self.path, newline="", encoding="utf-8") as f:
+            return {str(row.get(self.key)) for row in csv.DictReader(f)}
+
+    def _start(self, existed: bool):
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        if not existed:
+            self._writer.writeheader()
+
+    def _write(self, record: dict):
+        self._writer.writerow(record)
+
+
+class SqliteSink:
+    """SQLite table with one TEXT column per field, committed after every record.
+
+    With key set, the key column is the primary key and a re-written record
+    replaces the earlier one.
+    """
+
+    def __init__(self, path: str, fieldnames, key: str = None, append: bool = True, table: str = "records"):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.key = key
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns = ", ".join(
+            f'"{name}" TEXT PRIMARY KEY' if name == key else f'"{name}" TEXT' for name in self.fieldnames
+        )
+        with self._conn:
+            if not append:
+                self._conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+        quoted = ", ".join(f'"{name}"' for name in self.fieldnames)
+        placeholders = ", ".join("?" for _ in self.fieldnames)
+        self._insert = f'INSERT OR REPLACE INTO "{table}" ({quoted}) VALUES ({placeholders})'
+
+    def write(self, record: dict) -> bool:
+        values = [record.get(name) for name in self.fieldnames]
+        with self._lock, timed("sink write"), self._conn:
+            self._conn.execute(self._insert, values)
+        return True
+
+    def seen(self, key_value) -> bool:
+        """True if a record with this key is in the table."""
+        with self._lock:
+            row = self._conn.execute(f'SELECT 1 FROM "{self.table}" WHERE "{self.key}" = ?', (str(key_value),)).fetchone()
+        return row is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def has_records(path: str):
+    """True if path is an existing, non-empty output (which opening with append=False would wipe)."""
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def open_sink(path: str, fieldnames, key: str = None, append: bool = True):
+    """Open the sink matching path's extension: .jsonl, .csv or .sqlite3/.db."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return JsonLinesSink(path, fieldnames, key=key, append=append)
+    if extension == ".csv":
+        return CsvSink(path, fieldnames, key=key, append=append)
+    if extension in (".sqlite3", ".sqlite", ".db"):
+        return SqliteSink(path, fieldnames, key=key, append=append)
+    raise ValueError(f"Unsupported sink type for {path} (use .jsonl, .csv or .sqlite3)")
@@ -0,0 +1,121 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    form_state TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (kind, url, form_state, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS snapshots_lru ON snapshots (last_used);
+CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots (kind, url, fetched_at);
+"""
+MAX_MB = 2048  # default size bound of the compressed snapshots
+COMPRESS_LEVEL = 6
+
+
+def form_state(**fields):
+    """Stable text for the form values a page was fetched with, e.g. ref_type=Act&page=3."""
+    return "&".join(f"{key}={fields[key]}" for key in sorted(fields))
+
+
+class SnapshotCache:
+    """Compressed raw HTML of the pages the scrapers parsed, so extraction can be re-run offline.
+
+    Every snapshot is keyed by (kind, url, form_state, fetched_at); kinds are
+    e.g. "egazette_grid", "pib_listing" and "pib_release". Bodies are zlib
+    compressed in one SQLite file. Once they add up to more than max_mb, the
+    least recently written or replayed snapshots are evicted. latest(kind)
+    yields the newest snapshot of every (url, form_state) for replaying.
+    """
+
+    def __init__(self, db_path: str, max_mb: float = MAX_MB):
+        self.db_path = db_path
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM snapshots").fetchone()[0]
+
+    def put(self, kind: str, url: str, state: str, page, **meta):
+        """Store one page (str or bytes) as fetched now, with meta needed to replay it."""
+        if isinstance(page, str):
+            page = page.encode("utf-8")
+        body = zlib.compress(page, COMPRESS_LEVEL)
+        fetched_at = datetime.now().isoformat(timespec="microseconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (kind, url, form_state, fetched_at, meta, size, last_used, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, state, fetched_at, json.dumps(meta, ensure_ascii=False), len(body), time.time(), body),
+            )
+            self._total += len(body)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used snapshots until the cache is back under 90% of its bound."""
+        target = self.max_bytes * 0.9
+        dropped = 0
+        for rowid, size in self._conn.execute("SELECT rowid, size FROM snapshots ORDER BY last_used").fetchall():
+            if self._total <= target:
+                break
+            self._conn.execute("DELETE FROM snapshots WHERE rowid = ?", (rowid,))
+            self._total -= size
+            dropped += 1
+        print(f"🧹 Evicted {dropped} old snapshots, {self._total / 2**20:.0f} MB kept.")
+
+    def latest(self, kind: str):
+        """Yield {"url", "form_state", "fetched_at", "meta", "page"} for the newest snapshot of every page of kind.
+
+        Pages come out oldest fetch first and are marked as used (for the LRU).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, url, form_state, MAX(fetched_at), meta FROM snapshots WHERE kind = ? "
+                "GROUP BY url, form_state ORDER BY MAX(fetched_at)",
+                (kind,),
+            ).fetchall()
+        for rowid, url, state, fetched_at, meta in rows:
+            page = self._use(rowid)
+            if page is None:
+                continue  # evicted meanwhile
+            yield {"url": url, "form_state": state, "fetched_at": fetched_at, "meta": json.loads(meta), "page": page}
+
+    def get(self, kind: str, url: str):
+        """The newest snapshot of url (any form state) in the same shape as latest(), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rowid, form_state, fetched_at, meta FROM snapshots WHERE kind = ? AND url = ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (kind, url),
+            ).fetchone()
+        if row is None:
+            return None
+        rowid, state, fetched_at, meta = row
+        page = self._use(rowid)
+        if page is None:
+            return None
+        return {"url": url, "form_state": state, "fetched_at": fetched_at, "meta": json.loads(meta), "page": page}
+
+    def _use(self, rowid):
+        """Decompressed page of one snapshot, marked as just used; None if it is gone."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT body FROM snapshots WHERE rowid = ?", (rowid,)).fetchone()
+            self._conn.execute("UPDATE snapshots SET last_used = ? WHERE rowid = ?", (time.time(), rowid))
+        return zlib.decompress(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
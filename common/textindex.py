@@ -0,0 +1,166 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT,
+    ministry TEXT,
+    category TEXT,
+    date TEXT,
+    url TEXT,
+    pdf_path TEXT,
+    digest TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (date);
+CREATE INDEX IF NOT EXISTS documents_ministry ON documents (ministry);
+CREATE INDEX IF NOT EXISTS documents_category ON documents (category);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, ministry, category, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+QUERY_TERM_RE = re.compile(r'"[^"]*"\*?|[^\s"]+')
+DATE_RE = re.compile(r"\d{1,2}[ -][A-Za-z]{3,9}[ -]\d{4}|\d{4}-\d{2}-\d{2}")
+DATE_FORMATS = ["%d-%b-%Y", "%d %b %Y", "%d-%B-%Y", "%d %B %Y", "%Y-%m-%d"]
+
+
+def quote_terms(query: str):
+    """query as plain FTS5 terms: every word (or "quoted phrase") in double quotes, a trailing * kept as a prefix.
+
+    Gazette IDs like CG-DL-E-16042025-2000001 or words like OR / title: are then searched for, not parsed as syntax.
+    """
+    terms = []
+    for term in QUERY_TERM_RE.findall(query):
+        prefix = term.endswith("*")
+        text = term.rstrip("*").strip('"')
+        if text:
+            terms.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def iso_date(text: str):
+    """YYYY-MM-DD of the first date in text ("16-Apr-2025", "Posted on: 01 MAR 2025 10:01AM"), or None."""
+    match = DATE_RE.search(text or "")
+    if not match:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(match.group().title(), date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def html_text(html_body: str):
+    """Visible text of an HTML fragment (e.g. a PIB ltrDescriptionn body)."""
+    from lxml import html
+
+    if not html_body or not html_body.strip():
+        return ""
+    return " ".join(html.fromstring(html_body).text_content().split())
+
+
+def pdf_text(path: str, max_pages: int = None):
+    """Text layer of a PDF (empty for scanned pages). Runs in a process pool, so it takes a path.
+
+    pypdf is imported here so that only the extraction workers pay for it.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = reader.pages if max_pages is None else reader.pages[:max_pages]
+    return "\n".join(" ".join((page.extract_text() or "").split()) for page in pages)
+
+
+class TextIndex:
+    """Incremental full-text index (SQLite FTS5) over gazettes and releases.
+
+    documents holds one row of metadata per doc_id (e.g. "egazette:262469"),
+    documents_fts the searchable text under the same rowid. A document whose
+    digest hasn't changed since it was indexed is skipped, so re-running a
+    crawl only extracts and indexes what is new.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def indexed(self, doc_id: str, digest: str = None) -> bool:
+        """True if doc_id is indexed (with this digest, when one is given)."""
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return row is not None and (digest is None or row[0] == digest)
+
+    def add(self, doc_id: str, source: str, title: str, body: str, ministry: str = None, category: str = None,
+            date: str = None, url: str = None, pdf_path: str = None, digest: str = None):
+        """Index or re-index one document. date should be YYYY-MM-DD (see iso_date)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO documents (doc_id, source, title, ministry, category, date, url, pdf_path, digest, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (doc_id) DO UPDATE SET "
+                "source = excluded.source, title = excluded.title, ministry = excluded.ministry, "
+                "category = excluded.category, date = excluded.date, url = excluded.url, "
+                "pdf_path = excluded.pdf_path, digest = excluded.digest, indexed_at = excluded.indexed_at",
+                (doc_id, source, title, ministry, category, date, url, pdf_path, digest, now),
+            )
+            rowid = self._conn.execute("SELECT rowid FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()[0]
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (rowid,))
+            self._conn.execute(
+                "INSERT INTO documents_fts (rowid, title, body, ministry, category) VALUES (?, ?, ?, ?, ?)",
+                (rowid, title or "", body or "", ministry or "", category or ""),
+            )
+
+    def search(self, query: str = None, ministry: str = None, category: str = None, source: str = None,
+               date_from: str = None, date_to: str = None, limit: int = 20, syntax: bool = False):
+        """Best matches first. query is words, "phrases" and prefix* (see quote_terms), or with syntax=True
+        raw FTS5 (ministry:finance, a OR b, NEAR(...)); ministry matches a substring, category and source
+        exactly, dates are inclusive YYYY-MM-DD. Invalid FTS5 raises sqlite3.OperationalError.
+        """
+        where, params = [], []
+        if query and not syntax:
+            query = quote_terms(query)
+        if query:
+            where.append("documents_fts MATCH ?")
+            params.append(query)
+        if ministry:
+            where.append("d.ministry LIKE ?")
+            params.append(f"%{ministry}%")
+        for column, value in (("d.category", category), ("d.source", source)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if date_from:
+            where.append("d.date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("d.date <= ?")
+            params.append(date_to)
+
+        snippet = "snippet(documents_fts, 1, '[', ']', '…', 16)" if query else "substr(documents_fts.body, 1, 160)"
+        order = "bm25(documents_fts)" if query else "d.date DESC"
+        sql = (
+            f"SELECT d.doc_id, d.source, d.title, d.ministry, d.category, d.date, d.url, d.pdf_path, {snippet} "
+            "FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        fields = ["doc_id", "source", "title", "ministry", "category", "date", "url", "pdf_path", "snippet"]
+        return [dict(zip(fields, row)) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,137 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from common.metrics import observe
+
+# Selenium is imported inside the wait helpers so that timed() and the latency
+# report stay cheap to import for the HTTP-only code paths.
+
+DEFAULT_TIMEOUT = 15
+MAX_SAMPLES = 10000  # latest samples kept per step, so a long-running daemon doesn't grow without bound
+
+# Marks the page before a postback. A full postback replaces window (the mark disappears),
+# an UpdatePanel partial postback flips it to 'done' from PageRequestManager's endRequest.
+MARK_POSTBACK_JS = """
+window.__civicsensePostback = 'pending';
+if (window.Sys && Sys.WebForms && Sys.WebForms.PageRequestManager) {
+    var prm = Sys.WebForms.PageRequestManager.getInstance();
+    if (!window.__civicsenseHooked) {
+        prm.add_endRequest(function () { window.__civicsensePostback = 'done'; });
+        window.__civicsenseHooked = true;
+    }
+}
+"""
+POSTBACK_STATE_JS = "return [document.readyState, window.__civicsensePostback || null];"
+
+step_latencies = {}  # step name -> deque of the latest MAX_SAMPLES seconds spent waiting
+
+
+def record_latency(step: str, seconds: float):
+    """Keep the sample for the latency report and export it as scraper_step_seconds{step=...}."""
+    samples = step_latencies.get(step)
+    if samples is None:
+        samples = step_latencies.setdefault(step, deque(maxlen=MAX_SAMPLES))
+    samples.append(seconds)
+    observe("step_seconds", seconds, step=step)
+
+
+@contextmanager
+def timed(step: str):
+    """Record how long the wrapped block takes under step."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(step, time.perf_counter() - start)
+
+
+def wait_until(driver, condition, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """WebDriverWait(...).until(condition), timed under step."""
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with timed(step):
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+
+
+def _postback_finished(driver):
+    ready_state, mark = driver.execute_script(POSTBACK_STATE_JS)
+    return ready_state == "complete" and mark != "pending"
+
+
+@contextmanager
+def postback(driver, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """Wait for the ASP.NET postback triggered inside the block to complete.
+
+    Works for both full-page postbacks and UpdatePanel partial postbacks:
+
+        with postback(driver, "pager click"):
+            driver.execute_script("__doPostBack('gvGazetteList','Page$2');")
+    """
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.execute_script(MARK_POSTBACK_JS)
+    start = time.perf_counter()
+    yield
+    # The old document may be unloading mid-poll, so script errors just mean "not yet"
+    WebDriverWait(driver, timeout, poll_frequency=0.1, ignored_exceptions=(WebDriverException,)).until(
+        _postback_finished
+    )
+    record_latency(step, time.perf_counter() - start)
+
+
+def select_and_wait(driver, locator, visible_text: str, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """Pick a dropdown option and wait for its auto-postback.
+
+    Returns False without waiting when the option is already selected,
+    since no change event (and so no postback) fires in that case.
+    """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import Select
+
+    select = Select(wait_until(driver, EC.presence_of_element_located(locator), step, timeout))
+    if select.first_selected_option.text.strip() == visible_text:
+        return False
+    with postback(driver, step, timeout):
+        select.select_by_visible_text(visible_text)
+    return True
+
+
+def wait_for_stale(driver, element, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """Wait until element (e.g. the old results grid) has been replaced."""
+    from selenium.webdriver.support import expected_conditions as EC
+
+    return wait_until(driver, EC.staleness_of(element), step, timeout)
+
+
+def wait_for_new_window(driver, known_handles, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """Wait for a tab that isn't in known_handles to open and return its handle."""
+    from selenium.webdriver.support import expected_conditions as EC
+
+    wait_until(driver, EC.new_window_is_opened(list(known_handles)), step, timeout)
+    return [w for w in driver.window_handles if w not in known_handles][0]
+
+
+def wait_for_change(driver, script: str, old_value, step: str, timeout: float = DEFAULT_TIMEOUT):
+    """Wait until execute_script(script) returns something other than old_value."""
+    def changed(d):
+        value = d.execute_script(script)
+        return value if value != old_value else False
+
+    return wait_until(driver, changed, step, timeout)
+
+
+def print_latency_report():
+    """Print count / mean / p50 / p95 / max wait time per step, over its latest MAX_SAMPLES samples."""
+    if not step_latencies:
+        return
+    print("⏱️ Wait latency per step (seconds):")
+    for step, samples in sorted(step_latencies.items(), key=lambda item: -sum(item[1])):
+        ordered = sorted(samples)
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(
+            f"   {step:<28} n={len(ordered):<5} total={sum(ordered):8.2f} mean={sum(ordered) / len(ordered):6.3f} "
+            f"p50={p50:6.3f} p95={p95:6.3f} max={ordered[-1]:6.3f}"
+        )
@@ -0,0 +1,155 @@
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+from common.daemon import PollJob, Scheduler, serve_health
+from common.drivers import DriverPool
+from common.governor import GovernedSession, RequestGovernor
+from common.metrics import log_events
+
+SOURCES = ["egazette", "pib"]  # 👉 Portals to poll
+EGAZETTE_INTERVAL = 30 * 60  # 👉 Seconds between egazette polls
+PIB_INTERVAL = 15 * 60  # 👉 Seconds between PIB polls
+ref_types = ["Act"]  # 👉 egazette reference types polled, e.g. ["Act", "Bill", "Assent"]
+EGAZETTE_PAGES = 2  # 👉 Newest result pages of each reference type read per poll
+PIB_MONTHS = 1  # 👉 Months polled back from the current one; 2 also catches late releases of last month
+POOL_SIZE = 2  # 👉 Headless Chrome instances kept warm for the PIB listings between polls
+RENDER_WORKERS = 2  # 👉 PDF render processes kept warm between polls
+HEALTH_PORT = 8080  # 👉 /health and /metrics are served here, 0 for no endpoint
+REQUESTS_PER_SECOND = 2  # 👉 Per-host request rate, shared by every poll
+
+# Outputs, the same files the one-shot scripts write (run the daemon from the folder holding them)
+egazette_output = "gazette_records.csv"
+download_folder = "downloads"
+checkpoint_folder = "checkpoints"
+pib_output = "extracted_results.jsonl"
+pib_pdf_dir = os.path.join("speeches_pdf", "html_to_pdf")
+seen_index_path = "pib_seen.sqlite3"
+index_path = "fulltext.sqlite3"  # 👉 Full-text search index fed by both portals, None to skip
+events_path = None  # 👉 e.g. "events.jsonl" for structured failure / retry events
+
+
+def load_plugin(folder: str):
+    """Import <folder>/plugin.py with its sibling modules importable, as its main.py would.
+
+    Both scrapers call their module plugin, so each is loaded as <folder>_plugin.
+    """
+    path = os.path.join(REPO_DIR, folder)
+    sys.path.insert(0, path)
+    spec = importlib.util.spec_from_file_location(f"{folder}_plugin", os.path.join(path, "plugin.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def first_month(months: int):
+    """First day of the month months - 1 months before this one."""
+    today = date.today()
+    year, month = today.year, today.month - (months - 1)
+    while month < 1:
+        year, month = year - 1, month + 12
+    return date(year, month, 1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Poll egazette.gov.in and pib.gov.in for new items until stopped.")
+    parser.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    parser.add_argument("--egazette-interval", type=float, default=EGAZETTE_INTERVAL, help="seconds between egazette polls")
+    parser.add_argument("--pib-interval", type=float, default=PIB_INTERVAL, help="seconds between PIB polls")
+    parser.add_argument("--ref-type", nargs="+", default=ref_types)
+    parser.add_argument("--pages", type=int, default=EGAZETTE_PAGES, help="newest egazette result pages per poll")
+    parser.add_argument("--months", type=int, default=PIB_MONTHS, help="PIB months per poll, counting back from this one")
+    parser.add_argument("--browsers", type=int, default=POOL_SIZE)
+    parser.add_argument("--render-workers", type=int, default=RENDER_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="requests per second per host")
+    parser.add_argument("--port", type=int, default=HEALTH_PORT, help="health / metrics port, 0 for none")
+    parser.add_argument("--index", default=index_path, help="full-text index to add new items to, '' to skip")
+    parser.add_argument("--events", default=events_path, help="append structured events (JSON lines) here")
+    parser.add_argument("--egazette-base-url", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--pib-url", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.events:
+        log_events(args.events)
+
+    # Kept alive between polls: rate limits and circuit breakers, browsers, connection pools, render processes
+    governor = RequestGovernor(rate=args.rate)
+    drivers = DriverPool(size=args.browsers)
+    jobs, cleanup = [], [drivers.close]
+
+    if "egazette" in args.sources:
+        egazette = load_plugin("egazette")
+        downloader = egazette.PdfDownloader(download_folder, governor=governor)
+        cleanup.append(downloader.close)
+        base_url = {"base_url": args.egazette_base_url} if args.egazette_base_url else {}
+
+        def poll_egazette():
+            source = egazette.EgazetteSource(
+                args.ref_type, egazette_output, pagination_limit=args.pages, download_folder=download_folder,
+                checkpoint_folder=checkpoint_folder, drivers=drivers, governor=governor, downloader=downloader,
+                index_path=args.index or None, only_new=True, **base_url,
+            )
+            if not source.run():
+                raise RuntimeError(f"crawl did not finish ({source.rows_extracted} new gazettes queued)")
+            if source.downloads_failed:
+                raise RuntimeError(f"{source.downloads_failed} of {source.rows_extracted} new PDFs failed to download, "
+                                   "retried next poll")
+            return f"{source.rows_extracted} new gazettes"
+
+        jobs.append(PollJob("egazette", args.egazette_interval, poll_egazette))
+
+    if "pib" in args.sources:
+        pib = load_plugin("pib")
+        render_pool = ProcessPoolExecutor(max_workers=args.render_workers)
+        release_fetcher = pib.ReleaseFetcher(session=GovernedSession(governor))
+        cleanup += [release_fetcher.close, render_pool.shutdown]
+        pib_url = {"pib_url": args.pib_url} if args.pib_url else {}
+
+        def poll_pib():
+            source = pib.PibSource(
+                pib_output, seen_index_path, pib_pdf_dir, pool_size=args.browsers, drivers=drivers, governor=governor,
+                render_pool=render_pool, release_fetcher=release_fetcher, index_path=args.index or None,
+                start=first_month(args.months), incremental=True, **pib_url,
+            )
+            if not source.run():
+                raise RuntimeError("some section-months could not be crawled, see the log")
+            return f"{sum(source.job_results.values())} new releases"
+
+        jobs.append(PollJob("pib", args.pib_interval, poll_pib))
+
+    scheduler = Scheduler(jobs)
+    server = None
+    try:
+        if args.port:
+            try:
+                server = serve_health(scheduler, args.port)
+            except OSError as e:
+                print(f"❌ Could not serve /health on port {args.port}: {e}")
+                return 2
+        signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+        print(f"🛰️ Polling {', '.join(job.name for job in jobs)}; Ctrl+C to stop.")
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("🛑 Stopping after the running polls...")
+        scheduler.stop()
+        scheduler.run_forever()  # returns once they are done
+    finally:
+        if server:
+            server.shutdown()
+        for close in reversed(cleanup):
+            close()
+    print("🏁 Daemon stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
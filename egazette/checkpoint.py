@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+from dataclasses import asdict
+from datetime import datetime
+
+from grid import GazetteRecord
+
+
+class Checkpoint:
+    """Crawl progress for one reference type, saved after every grid page.
+
+    The file is an append-only log with one JSON line per finished page
+    (its number and the records scraped from it), so a restarted crawl can
+    restore those rows and jump straight to the first unfinished page
+    instead of starting over. Saving a page only writes and fsyncs its own line.
+    """
+
+    def __init__(self, folder: str, ref_type: str):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"egazette_{ref_type}.jsonl")
+        self.ref_type = ref_type
+        self.pages = set()  # finished page numbers; their rows stay on disk
+        self._lock = threading.Lock()  # sharded crawls save pages from several threads
+        if os.path.exists(self.path):
+            self._repair()
+            self.pages = {entry["page"] for entry in self._entries()}
+
+    def _repair(self):
+        """Cut a torn last line (a crash mid-save) so the next page starts on a line of its own."""
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _entries(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def completed_pages(self):
+        return sorted(self.pages)
+
+    def next_page(self):
+        """Page after the last finished one, or None on a fresh crawl."""
+        return max(self.pages) + 1 if self.pages else None
+
+    def restored_records(self):
+        """Records of all finished pages, page by page in the order they were saved."""
+        if not self.pages:
+            return
+        restored = set()
+        for entry in self._entries():
+            if entry["page"] in restored:
+                continue
+            restored.add(entry["page"])
+            for row in entry["rows"]:
+                yield GazetteRecord(**row)
+
+    def save_page(self, page: int, records):
+        entry = {
+            "page": page,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": [asdict(record) for record in records],
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pages.add(page)
+
+    def clear(self):
+        """Forget progress once the crawl has finished."""
+        self.pages = set()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,205 @@
+import os
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.utils import formatdate
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.blobstore import BlobStore
+from common.governor import GovernedSession, RequestGovernor
+from common.metrics import event, inc
+from common.waits import timed
+
+CHUNK_SIZE = 64 * 1024  # bytes written per iteration while streaming a PDF
+RESUME_ATTEMPTS = 3  # times a download cut off mid-body is continued with a Range request (or restarted)
+
+
+class InvalidPdf(ValueError):
+    """The body isn't a PDF (no %PDF- header or %%EOF marker) or is longer than announced."""
+
+
+class IncompleteDownload(IOError):
+    """The body stopped short, or the partial file had to be dropped; another GET can finish it."""
+
+
+def content_range_start(response):
+    """First byte offset of a 206 response's Content-Range ("bytes 100-199/200"), or None."""
+    value = response.headers.get("Content-Range", "")
+    if not value.startswith("bytes ") or "-" not in value:
+        return None
+    start = value[len("bytes "):].split("-")[0]
+    return int(start) if start.isdigit() else None
+
+
+def content_total(response):
+    """Size of the whole file: the Content-Range total for a 206, else the Content-Length."""
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def check_pdf(blob, expected_size):
+    """Raise unless the written blob is a complete PDF of the announced size."""
+    if expected_size is not None and blob.size < expected_size:
+        raise IncompleteDownload(f"got {blob.size} of {expected_size} bytes")
+    if expected_size is not None and blob.size > expected_size:
+        raise InvalidPdf(f"got {blob.size} bytes, {expected_size} announced")
+    if not blob.head.startswith(b"%PDF-"):
+        raise InvalidPdf(f"no %PDF- header (starts with {blob.head!r})")
+    if b"%%EOF" not in blob.tail:
+        raise InvalidPdf("no %%EOF marker at the end")
+
+
+class PdfDownloader:
+    """Download PDFs on a bounded thread pool over one shared keep-alive session.
+
+    Each PDF is streamed into the BlobStore at download_folder under a source
+    ID such as "egazette:262469", once its size, %PDF- header and %%EOF marker
+    check out. A body cut off mid-transfer is continued with a Range request.
+    Given a name, the PDF is also hard-linked into download_folder under it.
+    """
+
+    def __init__(self, download_folder: str, max_workers: int = 8, per_host_limit: int = 4, timeout: int = 60,
+                 store: BlobStore = None, governor: RequestGovernor = None):
+        self.download_folder = download_folder
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.store = store or BlobStore(download_folder)
+        self._owns_store = store is None
+
+        self.session = GovernedSession(governor)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-download")
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str):
+        """Return the semaphore limiting concurrent downloads for the url's host."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _already_downloaded(self, pdf_url: str, stored):
+        """True if the stored blob is still the server's copy of pdf_url.
+
+        Compares the stored size with a HEAD request's Content-Length, and
+        falls back to a conditional GET (If-Modified-Since the time it was
+        stored) when the server doesn't report a length.
+        """
+        if stored is None or stored["size"] == 0:
+            return False
+
+        response = self.session.head(pdf_url, allow_redirects=True, timeout=self.timeout)
+        if response.status_code == 200 and response.headers.get("Content-Length"):
+            return int(response.headers["Content-Length"]) == stored["size"]
+
+        modified = formatdate(datetime.fromisoformat(stored["stored_at"]).timestamp(), usegmt=True)
+        with self.session.get(pdf_url, headers={"If-Modified-Since": modified}, stream=True, timeout=self.timeout) as response:
+            return response.status_code == 304
+
+    def _fetch(self, pdf_url: str, source: str):
+        """One GET into the source's partial file, continuing it with a Range request if it has bytes.
+
+        Raises IncompleteDownload when the body is cut off (the partial is kept
+        to resume) or the server's range doesn't match it (the partial is dropped).
+        """
+        with self.store.writer(source, resume=True) as blob:
+            offset = blob.size
+            headers = {"Accept-Encoding": "identity"}  # byte offsets and Content-Length refer to the raw file
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            with timed("pdf fetch"), self.session.get(pdf_url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 416:
+                    blob.restart()
+                    raise IncompleteDownload("partial file doesn't match the server's, starting over")
+                if response.status_code == 206:
+                    if content_range_start(response) != offset:
+                        blob.restart()
+                        raise IncompleteDownload(
+                            f"asked for byte {offset}, got {response.headers.get('Content-Range')!r}, starting over"
+                        )
+                    print(f"⏯️ Resuming {pdf_url} at byte {offset}")
+                    inc("pdf_resumes_total")
+                elif response.status_code == 200:
+                    if offset:
+                        blob.restart()  # Range ignored, the whole file is coming
+                else:
+                    raise requests.HTTPError(f"status {response.status_code}", response=response)
+                expected_size = content_total(response)
+
+                try:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        blob.write(chunk)
+                except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                    raise IncompleteDownload(f"body cut off, {blob.size} bytes kept: {e}") from e
+                try:
+                    check_pdf(blob, expected_size)
+                except InvalidPdf:
+                    blob.restart()  # don't resume garbage
+                    raise
+        return blob
+
+    def _named(self, source: str, name: str = None):
+        """The source's stored blob, with "path" moved to its hard link download_folder/name if a name is given."""
+        stored = self.store.lookup(source)
+        if stored is not None and name:
+            stored["path"] = self.store.link(source, os.path.join(self.download_folder, name))
+        return stored
+
+    def download(self, pdf_url: str, source: str, name: str = None):
+        """Stream one PDF into the store in the calling thread, linked as download_folder/name if given.
+
+        Returns the stored blob ({"path", "size", "digest", "stored_at"}), or None on failure.
+        """
+        try:
+            with self._host_slot(pdf_url):
+                stored = self.store.lookup(source)
+                if self._already_downloaded(pdf_url, stored):
+                    print(f"⏭️ Already downloaded: {stored['path']}")
+                    inc("pdf_downloads_total", outcome="unchanged")
+                    return self._named(source, name)
+
+                for attempt in range(1, RESUME_ATTEMPTS + 1):
+                    try:
+                        blob = self._fetch(pdf_url, source)
+                        break
+                    except IncompleteDownload as e:
+                        if attempt == RESUME_ATTEMPTS:
+                            raise
+                        print(f"⚠️ Download of {pdf_url} incomplete ({e}), continuing...")
+            print(f"✅ Saved to: {blob.path}")
+            inc("pdf_downloads_total", outcome="saved")
+            inc("pdf_bytes_total", blob.size)
+            return self._named(source, name)
+        except Exception as e:
+            print(f"❌ Error downloading {pdf_url}: {e}")
+            inc("pdf_downloads_total", outcome="failed")
+            event("pdf_download_failed", url=pdf_url, source=source, error=repr(e))
+            return None
+
+    def submit(self, pdf_url: str, source: str, name: str = None):
+        """Queue a download and return a Future resolving to the stored blob (or None)."""
+        return self._executor.submit(self.download, pdf_url, source, name)
+
+    def close(self):
+        """Wait for all queued downloads to finish and release the session."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        if self._owns_store:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
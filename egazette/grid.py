@@ -0,0 +1,164 @@
+import re
+import urllib.parse
+from dataclasses import dataclass
+
+from lxml import html
+
+POSTBACK_RE = re.compile(r"__doPostBack\('([^']*)','([^']*)'\)")
+PAGER_XPATH = ".//tr[contains(concat(' ', normalize-space(@class), ' '), ' pager ')]"
+SITE_URL = "https://egazette.gov.in/"
+
+# Pulls the whole data table and the pager state in a single WebDriver round-trip,
+# walking the same tbl_Gazette -> tr[1] -> td -> div -> table nesting as parse_gazette_page.
+EXTRACT_GRID_JS = r"""
+var outer = document.getElementById('tbl_Gazette');
+if (!outer) { return null; }
+var nestedTr = outer.getElementsByTagName('tr')[1];
+var dataTable = nestedTr.getElementsByTagName('td')[0]
+    .getElementsByTagName('div')[0]
+    .getElementsByTagName('table')[0];
+var trs = Array.prototype.slice.call(dataTable.getElementsByTagName('tr'), 1, 16);
+var rows = [];
+trs.forEach(function (tr) {
+    if (tr.closest('tr.pager')) { return; }  // the pager row and the rows of its inner table
+    rows.push(Array.prototype.map.call(tr.getElementsByTagName('td'), function (td) {
+        return td.innerText;
+    }));
+});
+var pager = {current: null, links: []};
+var pagerRow = document.querySelector('tr.pager');
+if (pagerRow) {
+    pagerRow.querySelectorAll('table td').forEach(function (td) {
+        var a = td.querySelector('a');
+        if (!a) {
+            if (pager.current === null) { pager.current = td.innerText; }
+            return;
+        }
+        var m = /__doPostBack\('([^']*)','([^']*)'\)/.exec(a.getAttribute('href') || '');
+        if (m) { pager.links.push([a.innerText, m[1], m[2]]); }
+    });
+}
+return {rows: rows, pager: pager};
+"""
+
+# Text of the pager cell without a link, i.e. the page currently shown
+CURRENT_PAGE_JS = r"""
+var pagerRow = document.querySelector('tr.pager');
+if (!pagerRow) { return null; }
+var cells = pagerRow.querySelectorAll('table td');
+for (var i = 0; i < cells.length; i++) {
+    if (!cells[i].querySelector('a')) { return cells[i].innerText.trim(); }
+}
+return null;
+"""
+
+
+@dataclass
+class GazetteRecord:
+    """One row of the tbl_Gazette results grid."""
+    serial_no: str
+    ministry: str
+    department: str
+    office: str
+    subject: str
+    category: str
+    part_section: str
+    issue_date: str
+    publish_date: str
+    gazette_id: str  # e.g., "CG-DL-E-16042025-262469"
+    size: str = ""  # last <td>, the pdf size
+
+    @classmethod
+    def from_cells(cls, cells):
+        return cls(*cells[:11])
+
+    @property
+    def year(self):
+        return self.publish_date.split("-")[-1]  # e.g., "16-Apr-2025"
+
+    @property
+    def document_id(self):
+        return self.gazette_id.split("-")[-1]
+
+    @property
+    def pdf_url(self):
+        return self.pdf_url_on(SITE_URL)
+
+    def pdf_url_on(self, base_url: str):
+        """The PDF's URL on the site at base_url (e.g. a mirror or the bench mock)."""
+        return urllib.parse.urljoin(base_url, f"WriteReadData/{self.year}/{self.document_id}.pdf")
+
+    def csv_row(self):
+        """The grid columns as written to gazette_records.csv (size excluded)."""
+        return [
+            self.serial_no, self.ministry, self.department, self.office, self.subject,
+            self.category, self.part_section, self.issue_date, self.publish_date, self.gazette_id,
+        ]
+
+
+def _clean(text):
+    """Whitespace-collapse text the way WebElement.text renders it."""
+    return " ".join((text or "").split())
+
+
+def _build(raw_rows, current, raw_links):
+    """Turn raw cell texts and pager entries into (records, pager)."""
+    records = []
+    for cells in raw_rows:
+        cells = [_clean(c) for c in cells]
+        if len(cells) < 10:
+            print(f"⚠️ Skipping grid row with {len(cells)} cells: {cells}")
+            continue
+        records.append(GazetteRecord.from_cells(cells))
+
+    pager = {
+        "current": _clean(current) if current is not None else None,
+        "links": [(_clean(text), target, argument) for text, target, argument in raw_links],
+    }
+    return records, pager
+
+
+def parse_gazette_page(page):
+    """Parse the tbl_Gazette results grid from page HTML (or an lxml tree).
+
+    Returns (records, pager) where records is a list of GazetteRecord and pager is
+    {"current": "<page text>", "links": [(text, event_target, event_argument), ...]}.
+    """
+    tree = html.fromstring(page) if isinstance(page, (str, bytes)) else page
+    outer_table = tree.get_element_by_id("tbl_Gazette")
+
+    # Same nesting the Selenium loop walks: tbl_Gazette -> tr[1] -> td -> div -> table
+    nested_tr = list(outer_table.iter("tr"))[1]
+    nested_div = next(next(nested_tr.iter("td")).iter("div"))
+    data_table = next(nested_div.iter("table"))
+
+    raw_rows = []
+    for row in list(data_table.iter("tr"))[1:16]:
+        if row.xpath("ancestor-or-self::tr[contains(concat(' ', normalize-space(@class), ' '), ' pager ')]"):
+            continue  # the pager row and the rows of its inner table
+        raw_rows.append([td.text_content() for td in row.iter("td")])
+
+    current, raw_links = None, []
+    pager_rows = tree.xpath(PAGER_XPATH)
+    if pager_rows:
+        for td in pager_rows[0].xpath(".//table//td"):
+            links = td.xpath(".//a")
+            if not links:
+                if current is None:
+                    current = td.text_content()
+                continue
+            match = POSTBACK_RE.search(links[0].get("href") or "")
+            if match:
+                raw_links.append((links[0].text_content(), *match.groups()))
+    return _build(raw_rows, current, raw_links)
+
+
+def extract_grid(driver):
+    """Read the live tbl_Gazette grid and pager with one execute_script call.
+
+    Returns the same (records, pager) shape as parse_gazette_page.
+    """
+    result = driver.execute_script(EXTRACT_GRID_JS)
+    if result is None:
+        raise RuntimeError("tbl_Gazette not found on page")
+    return _build(result["rows"], result["pager"]["current"], result["pager"]["links"])
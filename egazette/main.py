@@ -1,246 +1,93 @@
-import urllib.parse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-import time
-import re
-import csv
-import os 
-import urllib.request
-import requests
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-
-# Setup Chrome browser
-options = Options()
-options.headless = False  # So you can see the browser window
-driver = webdriver.Chrome(options=options)
-
-
-# Step 1: Open the homepage
-driver.get("https://egazette.gov.in/")
-
-# Step 2: Dismiss the first popup (OK button)
-try:
-    ok_button = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "ImgMessage_OK"))
-    )
-    driver.execute_script("arguments[0].scrollIntoView(true);", ok_button)
-    time.sleep(1)
-    driver.execute_script("arguments[0].click();", ok_button)
-    print("✅ First popup dismissed.")
-except Exception as e:
-    print("❌ Could not dismiss the first popup:", e)
-
-# Step 3: Dismiss the second popup (Cross image)
-try:
-    cross_img = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.XPATH, "//img[contains(@src, 'images/Cross.png')]"))
-    )
-    driver.execute_script("arguments[0].scrollIntoView(true);", cross_img)
-    time.sleep(1)
-    driver.execute_script("arguments[0].click();", cross_img)
-    print("✅ Second popup (cross) dismissed.")
-except Exception as e:
-    print("❌ Could not dismiss the second popup:", e)
-
-
-# Step 4: Click on "Search" button (id='sgzt')
-try:
-    search_btn = WebDriverWait(driver, 10).until(
-        EC.element_to_be_clickable((By.ID, "sgzt"))
-    )
-    driver.execute_script("arguments[0].scrollIntoView(true);", search_btn)
-    time.sleep(1)
-    driver.execute_script("arguments[0].click();", search_btn)
-    print("✅ Navigated to Search page.")
-except Exception as e:
-    print("❌ Failed to click Search button:", e)
-
-
-# Step 5: Click “Search by Bill / Assent / Act” button
-try:
-    bill_btn = WebDriverWait(driver, 10).until(
-        EC.element_to_be_clickable((By.ID, "btnBill"))
-    )
-    driver.execute_script("arguments[0].click();", bill_btn)
-    print("✅ Navigated to Bill / Assent / Act search form.")
-except Exception as e:
-    print("❌ Failed to click Bill/Assent/Act button:", e)
-
-
-
-# Step 6: Select “Act” from dropdown
-try:
-    dropdown = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "ddlreftype"))
-    )
-    select = Select(dropdown)
-    select.select_by_visible_text("Act")
-    print("✅ Selected 'Act' from dropdown.")
-    time.sleep(1)  # Wait for postback content load (important)
-except Exception as e:
-    print("❌ Failed to select dropdown option:", e)
-
-
-# Step 7: Immediately click the Submit button (no wait)
-submit_btn = driver.find_element(By.ID, "ImgSubmitDetails")
-driver.execute_script("arguments[0].click();", submit_btn)
-print("✅ Submit button clicked.")
-
-
-# Step 8: Get total number of gazettes
-try:
-    result_span = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "lbl_Result"))
-    )
-    total_text = result_span.text
-    print("🧾", total_text)
-
-    # Extract the number using regex
-    match = re.search(r'\d+', total_text)
-    if match:
-        total_gazettes = int(match.group())
-        print("📊 Total Gazettes:", total_gazettes)
-    else:
-        print("⚠️ Could not extract number from text.")
-except Exception as e:
-    print("❌ Failed to extract gazette count:", e)
-
-
-# Step 9: Extract rows from the correctly nested data table inside tbl_Gazette
-all_extracted_rows = []
-visited_pages = set()
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.governor import RequestGovernor
+from common.metrics import export_periodically, log_events
+from common.sinks import has_records
+from common.waits import print_latency_report
+from plugin import EgazetteSource
+
+FETCH_MODE = "http"  # 👉 "http" replays the ASP.NET postbacks without a browser, "selenium" drives Chrome
+ref_types = ["Act"]  # 👉 e.g. ["Act", "Bill", "Assent"], each searched in its own parallel session
 pagination_limit = 2  # 👉 Set to None to scrape all pages, or set to a specific number like 3
 download_folder = "downloads"
-os.makedirs(download_folder, exist_ok=True)
-current_page_count = 1
-
-
-while True:
+checkpoint_folder = "checkpoints"
+filename = "gazette_records.csv"  # 👉 .csv, .jsonl or .sqlite3
+download_workers = 8  # 👉 PDFs downloaded in parallel while the grid is being paged
+shards = 4  # 👉 Parallel HTTP sessions per reference type, each paging its own slice of the results
+index_path = "fulltext.sqlite3"  # 👉 Full-text search index of the gazettes (see search/main.py), None to skip
+snapshot_path = None  # 👉 e.g. "snapshots.sqlite3" to keep the raw HTML of every grid page, for --replay
+snapshot_mb = 2048  # 👉 Size bound of the snapshot cache; least recently used pages are evicted beyond it
+metrics_path = None  # 👉 e.g. "metrics.prom" (Prometheus text) or "metrics.json", rewritten every 15s while running
+events_path = None  # 👉 e.g. "events.jsonl" for structured failure / retry events
+browser_cache = None  # 👉 e.g. "chrome_cache", a disk cache shared by the browsers in selenium mode
+browser_memory_mb = 512  # 👉 JavaScript heap cap per browser in selenium mode
+requests_per_second = 5  # 👉 Per-host request rate; concurrency adapts below it and backs off on errors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the egazette.gov.in Bill / Assent / Act search.")
+    parser.add_argument("--ref-type", nargs="+", default=ref_types, help="reference types to search for (default: %(default)s)")
+    parser.add_argument("--mode", choices=["http", "selenium"], default=FETCH_MODE, help="how to drive the search")
+    parser.add_argument("--pages", type=int, default=pagination_limit, help="pages to scrape, 0 for all (default: %(default)s)")
+    parser.add_argument("--output", default=filename, help="output file: .csv, .jsonl or .sqlite3")
+    parser.add_argument("--downloads", default=download_folder, help="folder for the PDFs")
+    parser.add_argument("--checkpoints", default=checkpoint_folder, help="folder for crawl checkpoints")
+    parser.add_argument("--download-workers", type=int, default=download_workers)
+    parser.add_argument("--shards", type=int, default=None,
+                        help=f"parallel sessions per reference type (default: {shards} over HTTP, 1 in selenium)")
+    parser.add_argument("--rate", type=float, default=requests_per_second, help="requests per second per host")
+    parser.add_argument("--index", default=index_path, help="full-text index to add the gazettes to, '' to skip")
+    parser.add_argument("--snapshots", default=snapshot_path, help="keep compressed raw HTML of the grid pages here")
+    parser.add_argument("--snapshot-mb", type=float, default=snapshot_mb, help="size bound of the snapshot cache in MB")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-run the extraction from the snapshots and stored PDFs, without a browser or network")
+    parser.add_argument("--force", action="store_true", help="let --replay overwrite an existing --output")
+    parser.add_argument("--metrics", default=metrics_path, help="write metrics here: .prom (Prometheus text) or .json")
+    parser.add_argument("--events", default=events_path, help="append structured events (JSON lines) here")
+    parser.add_argument("--headed", action="store_true", help="show the browser window in selenium mode")
+    parser.add_argument("--browser-cache", default=browser_cache, help="disk cache folder shared by the browsers")
+    parser.add_argument("--browser-memory", type=int, default=browser_memory_mb, help="JS heap cap per browser in MB, 0 for none")
+    parser.add_argument("--hold", action="store_true", help="keep the browser open until Enter is pressed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay and not args.snapshots:
+        print("❌ --replay needs --snapshots to replay from.")
+        return 2
+    if args.replay and has_records(args.output) and not args.force:
+        print(f"❌ --replay rebuilds {args.output} from the replayed snapshots only; pass another --output, or --force to overwrite it.")
+        return 2
+
+    governor = RequestGovernor(rate=args.rate)
+    if args.events:
+        log_events(args.events)
+    stop_metrics = export_periodically(args.metrics) if args.metrics else None
+
+    # discover (grid pages, one session per type) -> download (PDFs) -> sink (rows), connected by bounded queues
+    source = EgazetteSource(
+        args.ref_type, args.output, fetch_mode=args.mode, pagination_limit=args.pages or None,
+        download_folder=args.downloads, checkpoint_folder=args.checkpoints, download_workers=args.download_workers,
+        headless=not args.headed, hold_browser=args.hold, browser_cache=args.browser_cache or None,
+        browser_memory_mb=args.browser_memory or None,
+        shards=args.shards or (shards if args.mode == "http" else 1), governor=governor,
+        index_path=args.index or None, snapshot_path=args.snapshots or None, snapshot_mb=args.snapshot_mb,
+        replay=args.replay, overwrite=args.force,
+    )
     try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "tbl_Gazette")))
-
-        outer_table = driver.find_element(By.ID, "tbl_Gazette")
-        outer_rows = outer_table.find_elements(By.TAG_NAME, "tr")
-        nested_tr = outer_rows[1]
-        nested_td = nested_tr.find_element(By.TAG_NAME, "td")
-        nested_div = nested_td.find_element(By.TAG_NAME, "div")
-        data_table = nested_div.find_element(By.TAG_NAME, "table")
-
-        data_rows = data_table.find_elements(By.TAG_NAME, "tr")[1:16]
-
-        for index, row in enumerate(data_rows):
-            cols = row.find_elements(By.TAG_NAME, "td")
-
-            row_data = [col.text.strip() for col in cols[:-1]]  # Exclude the last <td> it contains the pdf size
-
-
-            try:
-                # Extract year from 3rd last <td>
-                date_text = cols[-3].text.strip()  # e.g., "16-Apr-2025"
-                year = date_text.split("-")[-1]
-
-                # Extract document ID from 2nd last <td>
-                doc_id_text = cols[-2].text.strip()  # e.g., "CG-DL-E-16042025-262469"
-                document_id = doc_id_text.split("-")[-1]
-
-                # Construct PDF URL
-                pdf_url = f"https://egazette.gov.in/WriteReadData/{year}/{document_id}.pdf"
-                print(f"📄 Downloading PDF: {pdf_url}")
-
-                # Download and save the PDF
-                response = requests.get(pdf_url, stream=True)
-                if response.status_code == 200:
-                    pdf_filename = f"{document_id}.pdf"
-                    pdf_path = os.path.join(download_folder, pdf_filename)
-                    with open(pdf_path, "wb") as f:
-                        f.write(response.content)
-                    print(f"✅ Saved to: {pdf_path}")
-                else:
-                    print(f"❌ Failed to download (status {response.status_code}) for {pdf_url}")
-                
-                row_data.extend([document_id,pdf_path])  # Optional: append these to row_data if you need later
-
-            except Exception as e:
-                print(f"⚠️ Failed to extract year and document ID for row {index + 1}: {e}")
-
-            all_extracted_rows.append(row_data)
-
-    # --------------------PAGINATION LOGIC----------------------------
-        # # Identify pager row and current page
-        pager_row = driver.find_element(By.CSS_SELECTOR, "tr.pager")
-        current_page = None
-        pager_tds = pager_row.find_elements(By.CSS_SELECTOR, "td > table > tbody > tr > td")
-        for td in pager_tds:
-            if not td.find_elements(By.TAG_NAME, "a"):
-                current_page = td.text.strip()
-                break
-
-        # Avoid revisiting same page
-        if current_page in visited_pages:
-            print(f"⚠️ Already visited page {current_page}. Stopping loop.")
-            break
-
-        visited_pages.add(current_page)
-
-        # Check if pagination limit is reached
-        if pagination_limit and current_page_count >= pagination_limit:
-            print(f"✅ Reached pagination limit: {pagination_limit} pages.")
-            break
-
-        # Click next page link
-        clicked = False
-        for td in pager_tds:
-            try:
-                a = td.find_element(By.TAG_NAME, "a")
-                page_text = a.text.strip()
-                if page_text in visited_pages:
-                    continue
-
-                driver.execute_script("arguments[0].click();", a)
-                time.sleep(2)
-                current_page_count += 1
-                clicked = True
-                break
-            except:
-                continue
-
-        if not clicked:
-            print("✅ No more pages to navigate.")
-            break
-
-    except Exception as e:
-        print("❌ Exception occurred:", e)
-        break
-
-print(f"✅ Total records extracted: {len(all_extracted_rows)}")
-
-# Step 10: saving the data to a CSV file
-
-# Choose a filename
-filename = "gazette_records.csv"
-
-# Export to CSV
-try:
-    with open(filename, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-
-        # Optional: Add a header row (modify as per actual columns)
-        writer.writerow(["S. No.", "Ministry / Organization", "Department", "Office", "Subject"," Category","Part & Section", "Issue Date","Publish Date","Gazette ID","Document_id","pdf_path"])
-
-        # Write all extracted rows
-        writer.writerows(all_extracted_rows)
-
-    print(f"✅ Data successfully exported to {filename}")
-except Exception as e:
-    print("❌ Failed to write CSV:", e)
-
-
-# Hold for inspection
-print("🔍 Holding browser open so you can inspect the main page...")
-input("👀 Press Enter here to close the browser when done...")
-
-driver.quit()
+        crawl_finished = source.run()
+    finally:
+        if stop_metrics:
+            stop_metrics()
+    print(f"✅ Data successfully exported to {args.output}")
+    print_latency_report()
+    governor.print_report()
+    return 0 if crawl_finished else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
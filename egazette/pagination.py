@@ -0,0 +1,74 @@
+import math
+import re
+
+ROWS_PER_PAGE = 15  # gvGazetteList page size
+GRID_ID = "gvGazetteList"  # __EVENTTARGET of the pager postbacks
+
+
+def parse_total(total_text):
+    """Gazette count from the lbl_Result text ("Total Number of Gazettes : 1234"), or None."""
+    match = re.search(r'\d+', total_text or "")
+    return int(match.group()) if match else None
+
+
+def page_count(total_gazettes: int, rows_per_page: int = ROWS_PER_PAGE):
+    return max(1, math.ceil(total_gazettes / rows_per_page))
+
+
+def page_argument(page: int):
+    """__EVENTARGUMENT that makes the GridView show page (1-based) directly."""
+    return f"Page${page}"
+
+
+def shard_pages(pages, shards: int):
+    """Split page numbers into at most shards contiguous runs of near-equal size.
+
+    Contiguous runs keep each worker stepping page N -> N+1 after its first jump.
+    """
+    pages = sorted(pages)
+    shards = max(1, min(shards, len(pages)))
+    size, extra = divmod(len(pages), shards)
+    runs, start = [], 0
+    for n in range(shards):
+        end = start + size + (1 if n < extra else 0)
+        runs.append(pages[start:end])
+        start = end
+    return [run for run in runs if run]
+
+
+def pager_target(pager):
+    """The event target of the pager links, defaulting to the grid id."""
+    return pager["links"][0][1] if pager and pager["links"] else GRID_ID
+
+
+def linked_pages(pager):
+    """{page number: event argument} of the Page$N links the pager rendered."""
+    pages = {}
+    for _, _, argument in pager["links"]:
+        number = argument[len("Page$"):] if argument.startswith("Page$") else ""
+        if number.isdigit():
+            pages[int(number)] = argument
+    return pages
+
+
+def step_towards(pager, page: int):
+    """Event argument of the rendered link that brings the grid closest to page, or None.
+
+    page itself if it is in the current block, else the "..." link to the next
+    (or previous) block, which is all ASP.NET event validation will accept.
+    """
+    pages = linked_pages(pager)
+    if page in pages:
+        return pages[page]
+    current = int(pager["current"] or 1)
+    if page > current:
+        ahead = [number for number in pages if number > current]
+        return pages[max(ahead)] if ahead else None
+    behind = [number for number in pages if number < current]
+    return pages[min(behind)] if behind else None
+
+
+def has_next_page(pager, page: int):
+    """True if the pager links to page + 1 (a number or the trailing "...")."""
+    wanted = page_argument(page + 1)
+    return any(argument == wanted for _, _, argument in pager["links"])
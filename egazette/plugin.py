@@ -0,0 +1,543 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from common.drivers import DriverPool
+from common.governor import GovernedSession, RequestGovernor, shared_governor
+from common.metrics import event, inc
+from common.pipeline import SourcePlugin, Stage
+from common.sinks import has_records, open_sink
+from common.snapshots import MAX_MB, SnapshotCache, form_state
+from common.textindex import TextIndex, iso_date, pdf_text
+from common.waits import postback, select_and_wait, timed, wait_for_change, wait_until
+from checkpoint import Checkpoint
+from downloader import PdfDownloader
+from grid import CURRENT_PAGE_JS, extract_grid, parse_gazette_page
+from pagination import (has_next_page, linked_pages, page_argument, page_count, pager_target, parse_total,
+                        shard_pages, step_towards)
+from postback import BASE_URL, GazetteSearch
+
+CSV_HEADER = ["S. No.", "Ministry / Organization", "Department", "Office", "Subject"," Category","Part & Section", "Issue Date","Publish Date","Gazette ID","Document_id","pdf_path","ref_type","pdf_size","pdf_sha256"]
+
+
+class EgazetteSource(SourcePlugin):
+    """egazette.gov.in Bill / Assent / Act search for one or more reference types.
+
+    discover walks the results grid of every reference type in its own
+    session (HTTP postback replay, or Chrome with fetch_mode="selenium"),
+    all concurrently, and feeds every GazetteRecord to the pipeline once per
+    Gazette ID: download fetches its PDF on download_workers threads, sink
+    writes its row.
+
+    With a snapshot_path every grid page read is also kept as raw HTML, and
+    replay=True re-runs the extraction from those snapshots (and the PDFs
+    already in the store) without a browser or any request to the site.
+    """
+
+    name = "egazette"
+
+    def __init__(self, ref_types, output_path: str, fetch_mode: str = "http", pagination_limit: int = None,
+                 download_folder: str = "downloads", checkpoint_folder: str = "checkpoints",
+                 download_workers: int = 8, per_host_limit: int = 4, base_url: str = BASE_URL,
+                 drivers: DriverPool = None, headless: bool = True, hold_browser: bool = False, shards: int = 1,
+                 browser_cache: str = None, browser_memory_mb: int = None,
+                 governor: RequestGovernor = None, index_path: str = None, extract_workers: int = 2,
+                 snapshot_path: str = None, snapshot_mb: float = MAX_MB, replay: bool = False,
+                 downloader: PdfDownloader = None, only_new: bool = False, overwrite: bool = False):
+        if replay and not snapshot_path:
+            raise ValueError("replay needs a snapshot_path to replay from")
+        if replay and has_records(output_path) and not overwrite:
+            raise ValueError(f"replay would replace {output_path} with the replayed reference types only, pass overwrite=True")
+        self.ref_types = [ref_types] if isinstance(ref_types, str) else list(ref_types)
+        self.fetch_mode = fetch_mode
+        self.pagination_limit = pagination_limit
+        self.download_workers = download_workers
+        self.base_url = base_url
+        self.hold_browser = hold_browser
+        self.shards = shards  # parallel sessions per reference type, each on its own slice of the pages
+        # Rate limits, retries and the circuit breaker are shared by every search session and download
+        self.governor = governor or shared_governor()
+        # Chrome only starts if fetch_mode="selenium" actually needs it
+        self.drivers = drivers or DriverPool(size=len(self.ref_types), headless=headless, cache_dir=browser_cache,
+                                             memory_mb=browser_memory_mb)
+        self._owns_drivers = drivers is None
+        # A downloader passed in (e.g. by the daemon) keeps its connections warm across runs
+        self.downloader = downloader or PdfDownloader(download_folder, max_workers=download_workers,
+                                                      per_host_limit=per_host_limit, governor=self.governor)
+        self._owns_downloader = downloader is None
+        # Every reference type is its own search, paged and checkpointed on its own
+        self.checkpoints = {ref_type: Checkpoint(checkpoint_folder, ref_type) for ref_type in self.ref_types}
+        self.finished = {}  # ref_type -> crawl ran to the end
+        # Optional raw HTML of every grid page, for re-running the extraction offline
+        self.snapshots = SnapshotCache(snapshot_path, snapshot_mb) if snapshot_path else None
+        self.replay = replay
+
+        # Step 10: rows are streamed to the output as soon as their PDF is fetched.
+        # A resumed crawl appends (restored rows already written are skipped by Document_id),
+        # a fresh crawl (or a replay) starts the file over. With only_new (polling) the output is
+        # always added to, and gazettes already in it aren't queued again; a row is only written
+        # once its PDF is stored, so a failed download is retried by the next poll.
+        self.only_new = only_new
+        resuming = only_new or (not replay and any(checkpoint.next_page() is not None for checkpoint in self.checkpoints.values()))
+        self.rows_sink = open_sink(output_path, CSV_HEADER, key="Document_id", append=resuming)
+        self.rows_extracted = 0
+        self.downloads_failed = 0
+        # Optional full-text index, PDF text is extracted on its own process pool
+        self.text_index = TextIndex(index_path) if index_path else None
+        self.extract_workers = extract_workers
+        self.extract_pool = ProcessPoolExecutor(max_workers=extract_workers) if index_path else None
+        self._queued_ids = set()  # Gazette IDs already handed to the pipeline, by any session
+        self._lock = threading.Lock()
+        self._held_drivers = []
+        # Whether the site takes Page$N postbacks to pages the pager didn't render: None until
+        # the first such jump finds out. Chrome always follows the rendered links.
+        self.direct_jumps = None if fetch_mode == "http" else False
+        self._jump_lock = threading.Lock()
+        self.pipeline = None
+
+    def stages(self):
+        return [
+            Stage("download", self.download, workers=self.download_workers),
+            *([Stage("index", self.index_text, workers=self.extract_workers)] if self.text_index else []),
+            Stage("sink", self.write_row),
+        ]
+
+    def download(self, item):
+        record, ref_type = item
+        source = f"egazette:{record.document_id}"
+        if self.replay:
+            return record, ref_type, self.downloader.store.lookup(source)  # offline: only what is stored
+        return record, ref_type, self.downloader.download(self.pdf_url(record), source, f"{record.document_id}.pdf")
+
+    def pdf_url(self, record):
+        """The record's PDF on the site being crawled (base_url)."""
+        return record.pdf_url_on(self.base_url)
+
+    def index_text(self, item):
+        """Add the gazette (its PDF text, if it downloaded) to the full-text index unless it is there already.
+
+        A gazette whose PDF failed is indexed by its metadata and picked up again once a download succeeds.
+        """
+        record, ref_type, blob = item
+        doc_id = f"egazette:{record.document_id}"
+        digest = blob["digest"] if blob else None
+        if self.text_index.indexed(doc_id, digest):
+            return item
+        try:
+            text = ""
+            if blob:
+                with timed("pdf text"):
+                    text = self.extract_pool.submit(pdf_text, blob["path"]).result()
+            body = "\n".join([record.department, record.office, record.part_section, record.gazette_id, text])
+            self.text_index.add(
+                doc_id, self.name, record.subject, body, ministry=record.ministry, category=record.category,
+                date=iso_date(record.publish_date), url=self.pdf_url(record), pdf_path=blob["path"] if blob else None,
+                digest=digest,
+            )
+            inc("documents_indexed_total", source=self.name)
+        except Exception as e:
+            print(f"⚠️ Could not index {record.gazette_id}: {e}")
+            event("index_failed", doc_id=doc_id, error=repr(e))
+        return item  # the row is written either way
+
+    def write_row(self, item):
+        record, ref_type, blob = item
+        if blob is None and not self.replay:
+            with self._lock:
+                self.downloads_failed += 1
+            if self.only_new:
+                return  # not written, so not seen: the next poll queues it again
+        # This row's own blob (or blanks if its download failed), never another row's
+        blob = blob or {"path": "", "size": "", "digest": ""}
+        row_data = record.csv_row() + [record.document_id, blob["path"], ref_type, blob["size"], blob["digest"]]
+        self.rows_sink.write(dict(zip(CSV_HEADER, row_data)))
+
+    def on_error(self, stage, item, error):
+        print(f"❌ Failed to {stage.name} {item[0].gazette_id}:", error)
+        if stage.name == "download":
+            with self._lock:
+                self.downloads_failed += 1
+        event("gazette_failed", stage=stage.name, gazette_id=item[0].gazette_id, error=repr(error))
+
+    def queue_row(self, record, ref_type):
+        """Hand one GazetteRecord to the pipeline, blocking while the downloads are backed up.
+
+        A gazette listed under several reference types is only queued by the first session to see it.
+        With only_new, gazettes already in the output are skipped once their PDF is in the store.
+        """
+        if (self.only_new and self.rows_sink.seen(record.document_id)
+                and self.downloader.store.lookup(f"egazette:{record.document_id}")):
+            return
+        with self._lock:
+            if record.gazette_id in self._queued_ids:
+                return
+            self._queued_ids.add(record.gazette_id)
+            self.rows_extracted += 1
+        inc("gazettes_queued_total", ref_type=ref_type)
+        print(f"📄 Queued PDF download: {self.pdf_url(record)}")
+        self.pipeline.put((record, ref_type))
+
+    def crawl(self, ref_type):
+        """One reference type's search, in its own session(s). Returns True if it ran to the end."""
+        checkpoint = self.checkpoints[ref_type]
+        if checkpoint.completed_pages():
+            print(f"♻️ Restoring {len(checkpoint.completed_pages())} checkpointed pages for '{ref_type}'.")
+            for record in checkpoint.restored_records():
+                self.queue_row(record, ref_type)
+
+        open_session = self.http_session if self.fetch_mode == "http" else self.browser_session
+        finished = self.crawl_pages(ref_type, open_session)
+        self.finished[ref_type] = finished
+        return finished
+
+    def capture_grid(self, ref_type, url, page, pager):
+        """Keep the raw HTML of one grid page, keyed by its URL, reference type and page number."""
+        state = form_state(ref_type=ref_type, page=pager["current"] or "1")
+        self.snapshots.put("egazette_grid", url, state, page, ref_type=ref_type)
+
+    def replay_grids(self):
+        """Queue the rows of the newest snapshot of every grid page, parsed again from the raw HTML."""
+        pages = 0
+        for snapshot in self.snapshots.latest("egazette_grid"):
+            ref_type = snapshot["meta"]["ref_type"]
+            if ref_type not in self.ref_types:
+                continue
+            try:
+                with timed("grid extract"):
+                    records, _ = parse_gazette_page(snapshot["page"])
+            except Exception as e:
+                print(f"❌ Could not parse snapshot {snapshot['form_state']} from {snapshot['fetched_at']}: {e}")
+                event("replay_failed", form_state=snapshot["form_state"], error=repr(e))
+                continue
+            for record in records:
+                self.queue_row(record, ref_type)
+            pages += 1
+        print(f"♻️ Replayed {pages} grid pages from {self.snapshots.db_path}.")
+
+    def discover(self, pipeline):
+        self.pipeline = pipeline
+        if self.replay:
+            self.replay_grids()
+            print(f"✅ Total records extracted: {self.rows_extracted}")
+            return True
+        if len(self.ref_types) == 1:
+            finished = self.crawl(self.ref_types[0])
+        else:
+            print(f"🚀 Searching {', '.join(self.ref_types)} in {len(self.ref_types)} parallel sessions...")
+            with ThreadPoolExecutor(max_workers=len(self.ref_types), thread_name_prefix="egazette-session") as sessions:
+                finished = all(list(sessions.map(self.crawl, self.ref_types)))
+        print(f"✅ Total records extracted: {self.rows_extracted}")
+        # Wait for the background downloads, each one writes its row as it finishes
+        print("⏳ Waiting for PDF downloads to finish...")
+        return finished
+
+    def close(self):
+        if self._owns_downloader:
+            self.downloader.close()
+        self.rows_sink.close()
+        if self.text_index:
+            self.extract_pool.shutdown(wait=True)
+            self.text_index.close()
+        if self.snapshots:
+            self.snapshots.close()
+
+        # Only a finished crawl drops its checkpoint, an interrupted one resumes next run
+        for ref_type, finished in self.finished.items():
+            if finished:
+                self.checkpoints[ref_type].clear()
+
+        if self._held_drivers:
+            # Hold for inspection
+            print("🔍 Holding browser open so you can inspect the main page...")
+            input("👀 Press Enter here to close the browser when done...")
+            for driver in self._held_drivers:
+                self.drivers.release(driver)
+            self._held_drivers = []
+        if self._owns_drivers:
+            self.drivers.close()
+
+    def crawl_pages(self, ref_type, open_session):
+        """Step 9: read every unfinished grid page, in parallel shards.
+
+        open_session(ref_type) returns (read_page, goto_page, total_text, close).
+        The first session's lbl_Result count gives the page count; the pages
+        not yet checkpointed are split into contiguous shards that run in
+        parallel, each in its own session starting with a goto() its first page.
+        Without a count the pages are walked one by one from page 1.
+        """
+        checkpoint = self.checkpoints[ref_type]
+        try:
+            session = open_session(ref_type)
+        except Exception as e:
+            print(f"❌ Failed to submit the '{ref_type}' search:", e)
+            return False
+
+        # Step 8: Get total number of gazettes
+        total_gazettes = self.print_total(session[2])
+        if total_gazettes is None:
+            return self.crawl_shard(ref_type, None, session)
+
+        last_page = page_count(total_gazettes)
+        if self.pagination_limit:
+            last_page = min(last_page, self.pagination_limit)
+        done = set(checkpoint.completed_pages())
+        pages = [page for page in range(1, last_page + 1) if page not in done]
+        if not pages:
+            print(f"✅ All {last_page} pages of '{ref_type}' already checkpointed.")
+            session[3]()
+            return True
+
+        shards = shard_pages(pages, self.shards)
+        if len(shards) == 1:
+            return self.crawl_shard(ref_type, shards[0], session)
+
+        print(f"🧩 Splitting {len(pages)} pages of '{ref_type}' over {len(shards)} sessions...")
+        with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix=f"egazette-{ref_type}") as workers:
+            futures = [workers.submit(self.crawl_shard, ref_type, shards[0], session)]
+            futures += [workers.submit(self.crawl_shard, ref_type, shard, None, open_session) for shard in shards[1:]]
+            return all([future.result() for future in futures])
+
+    def crawl_shard(self, ref_type, pages, session=None, open_session=None):
+        """Read the given pages (None: walk from page 1 to the end) in one session.
+
+        Each page is reached with goto() unless the grid is already showing it,
+        and is checkpointed once its rows are queued.
+        Returns True if every page was read.
+        """
+        if session is None:
+            try:
+                session = open_session(ref_type)
+            except Exception as e:
+                print(f"❌ Failed to open a '{ref_type}' session:", e)
+                return False
+        read_page, goto_page, _, close = session
+        checkpoint = self.checkpoints[ref_type]
+        done = set(checkpoint.completed_pages())
+
+        try:
+            records, pager = read_page()
+            index, page = 0, pages[0] if pages else 1
+            while True:
+                if (pager["current"] or "1") != str(page):
+                    records, pager = self.goto(ref_type, read_page, goto_page, pager, page)
+
+                if pages is not None or page not in done:
+                    for record in records:
+                        self.queue_row(record, ref_type)
+                    checkpoint.save_page(page, records)
+                    inc("grid_pages_total", ref_type=ref_type)
+
+                if pages is not None:
+                    index += 1
+                    if index == len(pages):
+                        return True
+                    page = pages[index]
+                else:
+                    if self.pagination_limit and page >= self.pagination_limit:
+                        print(f"✅ Reached pagination limit: {self.pagination_limit} pages.")
+                        return True
+                    if not has_next_page(pager, page):
+                        print("✅ No more pages to navigate.")
+                        return True
+                    page += 1
+
+        except Exception as e:
+            print(f"❌ Exception occurred on '{ref_type}':", e)
+            event("crawl_failed", ref_type=ref_type, error=repr(e))
+            return False
+        finally:
+            close()
+
+    def goto(self, ref_type, read_page, goto_page, pager, page):
+        """Bring the grid to page and read it. Returns (records, pager).
+
+        A page outside the pager's current block is jumped to with a direct
+        Page$N postback if the site takes those. With ASP.NET event validation
+        it only accepts the arguments it rendered: the first rejected jump
+        (made by one session while the others wait) switches every session to
+        walking the "..." block links instead. That first jump is sent as a
+        single probe, so a rejection is neither retried nor counted against the
+        host. Only HTTP sessions probe; browser sessions start on the links.
+        """
+        target = pager_target(pager)
+        if page not in linked_pages(pager) and self.direct_jumps is not False:
+            with self._jump_lock:
+                probing = self.direct_jumps is None
+                if probing:
+                    try:
+                        goto_page(target, page_argument(page), probe=True)
+                        self.direct_jumps = True
+                    except Exception as e:
+                        print(f"↪️ Direct jump to page {page} of '{ref_type}' rejected ({e}), following the pager links instead.")
+                        self.direct_jumps = False
+            if self.direct_jumps:
+                if not probing:
+                    goto_page(target, page_argument(page))
+                records, pager = read_page()
+                if (pager["current"] or "1") != str(page):
+                    raise RuntimeError(f"asked for page {page}, the grid shows page {pager['current']}")
+                return records, pager
+
+        while (pager["current"] or "1") != str(page):
+            argument = step_towards(pager, page)
+            if argument is None:
+                raise RuntimeError(f"no pager link towards page {page} from page {pager['current']}")
+            shown = pager["current"]
+            goto_page(target, argument)
+            records, pager = read_page()
+            if pager["current"] == shown:
+                raise RuntimeError(f"pager link {argument} left the grid on page {shown}")
+        return records, pager
+
+    @staticmethod
+    def print_total(total_text):
+        """Print the lbl_Result text and return the gazette count parsed from it (or None)."""
+        print("🧾", total_text)
+
+        total_gazettes = parse_total(total_text)
+        if total_gazettes is not None:
+            print("📊 Total Gazettes:", total_gazettes)
+        else:
+            print("⚠️ Could not extract number from text.")
+        return total_gazettes
+
+    def http_session(self, ref_type):
+        """Steps 1-8 without a browser: replay the search postbacks over HTTP.
+
+        Every call gets its own GazetteSearch, i.e. its own cookies and view state.
+        Returns (read_page, goto_page, total_text, close).
+        """
+        search = GazetteSearch(self.base_url, session=GovernedSession(self.governor))
+
+        # Steps 1-7: the popups are client-side only, so go straight to the search postbacks
+        search.search(ref_type)
+        print(f"✅ Submitted '{ref_type}' search over HTTP.")
+
+        # Step 8: Get total number of gazettes
+        try:
+            total_text = search.tree.get_element_by_id("lbl_Result").text_content().strip()
+        except Exception as e:
+            print("❌ Failed to extract gazette count:", e)
+            total_text = ""
+
+        def read_page():
+            records, pager = parse_gazette_page(search.tree)
+            if self.snapshots:
+                self.capture_grid(ref_type, search.url, search.content, pager)
+            return records, pager
+
+        return read_page, search.goto_page, total_text, search.session.close
+
+    def browser_session(self, ref_type):
+        """Steps 1-8 in Chrome, kept as a fallback for when the HTTP replay breaks.
+
+        Returns (read_page, goto_page, total_text, close); close hands the
+        browser back to the pool (or holds it for inspection).
+        """
+        # Setup Chrome browser, a warm one from the pool if there is one
+        driver = self.drivers.acquire()
+
+        def close():
+            if self.hold_browser:
+                with self._lock:
+                    self._held_drivers.append(driver)
+            else:
+                self.drivers.release(driver)
+
+        try:
+            return self._search_in_browser(driver, ref_type) + (close,)
+        except Exception:
+            close()
+            raise
+
+    def _search_in_browser(self, driver, ref_type):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
+        # Step 1: Open the homepage
+        with timed("home page load"):
+            driver.get(self.base_url)
+
+        # Step 2: Dismiss the first popup (OK button)
+        try:
+            ok_button = wait_until(driver, EC.presence_of_element_located((By.ID, "ImgMessage_OK")), "popup OK", 10)
+            driver.execute_script("arguments[0].scrollIntoView(true);", ok_button)
+            driver.execute_script("arguments[0].click();", ok_button)
+            print("✅ First popup dismissed.")
+        except Exception as e:
+            print("❌ Could not dismiss the first popup:", e)
+
+        # Step 3: Dismiss the second popup (Cross image)
+        try:
+            cross_img = wait_until(
+                driver, EC.presence_of_element_located((By.XPATH, "//img[contains(@src, 'images/Cross.png')]")), "popup cross", 10
+            )
+            driver.execute_script("arguments[0].scrollIntoView(true);", cross_img)
+            driver.execute_script("arguments[0].click();", cross_img)
+            print("✅ Second popup (cross) dismissed.")
+        except Exception as e:
+            print("❌ Could not dismiss the second popup:", e)
+
+
+        # Step 4: Click on "Search" button (id='sgzt')
+        try:
+            search_btn = wait_until(driver, EC.element_to_be_clickable((By.ID, "sgzt")), "search button", 10)
+            driver.execute_script("arguments[0].scrollIntoView(true);", search_btn)
+            with postback(driver, "search page load"):
+                driver.execute_script("arguments[0].click();", search_btn)
+            print("✅ Navigated to Search page.")
+        except Exception as e:
+            print("❌ Failed to click Search button:", e)
+
+
+        # Step 5: Click “Search by Bill / Assent / Act” button
+        try:
+            bill_btn = wait_until(driver, EC.element_to_be_clickable((By.ID, "btnBill")), "bill button", 10)
+            with postback(driver, "bill form load"):
+                driver.execute_script("arguments[0].click();", bill_btn)
+            print("✅ Navigated to Bill / Assent / Act search form.")
+        except Exception as e:
+            print("❌ Failed to click Bill/Assent/Act button:", e)
+
+
+
+        # Step 6: Select “Act” from dropdown
+        try:
+            # Waits for the dropdown's postback content load (important)
+            select_and_wait(driver, (By.ID, "ddlreftype"), ref_type, "ref type select")
+            print(f"✅ Selected '{ref_type}' from dropdown.")
+        except Exception as e:
+            print("❌ Failed to select dropdown option:", e)
+
+
+        # Step 7: Immediately click the Submit button (no wait)
+        submit_btn = driver.find_element(By.ID, "ImgSubmitDetails")
+        with postback(driver, "search submit"):
+            driver.execute_script("arguments[0].click();", submit_btn)
+        print("✅ Submit button clicked.")
+
+
+        # Step 8: Get total number of gazettes
+        try:
+            result_span = wait_until(driver, EC.presence_of_element_located((By.ID, "lbl_Result")), "result count", 10)
+            total_text = result_span.text
+        except Exception as e:
+            print("❌ Failed to extract gazette count:", e)
+            total_text = ""
+
+
+        # Step 9: Extract rows from the correctly nested data table inside tbl_Gazette
+        def read_page():
+            wait_until(driver, EC.presence_of_element_located((By.ID, "tbl_Gazette")), "grid load", 10)
+            with timed("grid extract"):
+                records, pager = extract_grid(driver)  # whole grid + pager in one round-trip
+            if self.snapshots:
+                self.capture_grid(ref_type, driver.current_url, driver.page_source, pager)
+            return records, pager
+
+        def goto_page(event_target, event_argument):
+            previous_page = driver.execute_script(CURRENT_PAGE_JS)
+            with postback(driver, "pager postback"):
+                driver.execute_script("__doPostBack(arguments[0], arguments[1]);", event_target, event_argument)
+            wait_for_change(driver, CURRENT_PAGE_JS, previous_page, "pager change", 10)
+
+        return read_page, goto_page, total_text
@@ -0,0 +1,96 @@
+import urllib.parse
+
+import requests
+from lxml import html
+
+from common.governor import GovernedSession
+from grid import POSTBACK_RE
+
+BASE_URL = "https://egazette.gov.in/"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+class GazetteSearch:
+    """Drive the egazette search pages over plain HTTP instead of a browser.
+
+    Every step of the Selenium flow (Search, btnBill, ddlreftype,
+    ImgSubmitDetails, pager links) is an ASP.NET WebForms postback, so it can
+    be replayed by posting the page's form back with __VIEWSTATE,
+    __EVENTVALIDATION and the event fields the browser would have sent.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, session: requests.Session = None, timeout: int = 60):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = session or GovernedSession()
+        self.session.headers.setdefault("User-Agent", USER_AGENT)
+        self.url = None
+        self.tree = None
+        self.content = None  # raw HTML of the current page
+
+    def _load(self, response):
+        response.raise_for_status()
+        self.url = response.url
+        self.content = response.content
+        self.tree = html.fromstring(response.content, base_url=response.url)
+        return self.tree
+
+    def get(self, url: str):
+        """Load a page with a plain GET."""
+        return self._load(self.session.get(url, timeout=self.timeout))
+
+    def postback(self, extra: dict = None, event_target: str = "", event_argument: str = "", **request_options):
+        """Post the current form back, like __doPostBack(event_target, event_argument)."""
+        form = self.tree.forms[0]
+        data = dict(form.form_values())  # hidden state (__VIEWSTATE, ...) plus current control values
+        data["__EVENTTARGET"] = event_target
+        data["__EVENTARGUMENT"] = event_argument
+        data.update(extra or {})
+        return self._load(self.session.post(form.action or self.url, data=data, timeout=self.timeout, **request_options))
+
+    def click(self, element_id: str):
+        """Replay a click on a link, button or image button."""
+        element = self.tree.get_element_by_id(element_id)
+        href = element.get("href") or ""
+        match = POSTBACK_RE.search(href) or POSTBACK_RE.search(element.get("onclick") or "")
+        if match:
+            return self.postback({}, *match.groups())
+        if element.tag == "a" and href and not href.startswith("javascript:"):
+            return self.get(urllib.parse.urljoin(self.url, href))
+
+        name = element.get("name") or element_id
+        if element.get("type") == "image":
+            return self.postback({f"{name}.x": "1", f"{name}.y": "1"})
+        return self.postback({name: element.get("value", "")})
+
+    def select(self, select_id: str, visible_text: str):
+        """Select a dropdown option by its text, posting back if the dropdown auto-posts."""
+        element = self.tree.get_element_by_id(select_id)
+        for option in element.iter("option"):
+            option.attrib.pop("selected", None)
+        matches = [o for o in element.iter("option") if o.text_content().strip() == visible_text]
+        if not matches:
+            raise ValueError(f"No option '{visible_text}' in #{select_id}")
+        matches[0].set("selected", "selected")
+
+        if "__doPostBack" in (element.get("onchange") or ""):
+            return self.postback({}, element.get("name") or select_id)
+        return self.tree
+
+    def search(self, ref_type: str):
+        """Open the Bill / Assent / Act search form and submit it for ref_type."""
+        self.get(self.base_url)
+        self.click("sgzt")
+        self.click("btnBill")
+        self.select("ddlreftype", ref_type)
+        self.click("ImgSubmitDetails")
+        return self.tree
+
+    def goto_page(self, event_target: str, event_argument: str, probe: bool = False):
+        """Follow a grid pager link, e.g. ("gvGazetteList", "Page$3").
+
+        probe=True sends it once, without retries or breaker accounting (see RequestGovernor.send).
+        """
+        if probe:
+            return self.postback({}, event_target, event_argument, probe=True)
+        return self.postback({}, event_target, event_argument)
@@ -0,0 +1,48 @@
+import os
+import re
+import threading
+import zipfile
+
+
+def month_key(iso_date: str):
+    """"YYYY-MM" of a YYYY-MM-DD date, "undated" without one."""
+    return iso_date[:7] if iso_date else "undated"
+
+
+class MonthArchives:
+    """One zip of sanitized release pages per section-month, instead of a file per release.
+
+    Pages are added as <content hash>.html (once, however often a release is
+    seen again), so incremental runs keep extending the same archive. Every
+    archive touched in a run can then be rendered into one bundle PDF next
+    to it.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.touched = set()  # (section, month) archives added to in this run
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, section: str, month: str, suffix: str):
+        folder = os.path.join(self.root, re.sub(r"[^\w-]+", "_", section).strip("_"))
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{month}{suffix}")
+
+    def archive_path(self, section: str, month: str):
+        return self._path(section, month, ".zip")
+
+    def bundle_path(self, section: str, month: str):
+        return self._path(section, month, ".pdf")
+
+    def add(self, section: str, month: str, digest: str, page: str):
+        """Store one release page in its section-month archive. Returns the archive's path."""
+        path = self.archive_path(section, month)
+        with self._lock:
+            lock = self._locks.setdefault(path, threading.Lock())
+            self.touched.add((section, month))
+        with lock, zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            name = f"{digest}.html"
+            if name not in archive.namelist():
+                archive.writestr(name, page)
+        return path
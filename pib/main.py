@@ -1,186 +1,120 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.common.keys import Keys
-from datetime import datetime
-from xhtml2pdf import pisa
+import argparse
 import os
-import json
-import time
-
-# Setup Chrome browser
-options = Options()
-options.headless = False  # Set True for headless mode
-driver = webdriver.Chrome(options=options)
+import sys
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.governor import RequestGovernor
+from common.metrics import export_periodically, log_events
+from common.sinks import has_records
+from common.waits import print_latency_report
+from planner import parse_month
+from plugin import RENDER_MODES, SECTIONS, PibSource
+from renderer import BACKENDS
+
+POOL_SIZE = 4  # 👉 Number of headless Chrome instances scraping months in parallel
+INCREMENTAL = True  # 👉 Skip releases and finished months already recorded in the seen-items index
+RENDER_WORKERS = os.cpu_count() or 2  # 👉 Processes rendering PDFs while the browsers keep scraping
+FETCH_MODE = "http"  # 👉 "http" fetches release pages directly, "tab" opens each release in a browser tab
+RENDER_BACKEND = "xhtml2pdf"  # 👉 "xhtml2pdf" keeps the release formatting, "reportlab" is ~5x faster with plain layout
+RENDER_MODE = "pdf"  # 👉 "pdf" per release, "bundle" one PDF per section-month, "archive" / "html" store HTML only
+FETCH_WORKERS = 8  # 👉 Concurrent release page fetches in "http" mode
+START_MONTH = f"{date.today().year}-01"  # 👉 Oldest month to crawl, e.g. "2019-01" for a multi-year backfill
+END_MONTH = None  # 👉 Newest month to crawl, None for the current month
+BATCH_SIZE = 48  # 👉 Section-months run in parallel per batch (newest first); batches run one after another
+BATCH_PAUSE = 0  # 👉 Seconds to wait between batches, to go easy on the site during long backfills
+REQUESTS_PER_SECOND = 5  # 👉 Per-host request rate for the release fetches; backs off on errors and slow replies
 
 # Directories
 BASE_DIR = os.getcwd()
 PDF_DIR = os.path.join(BASE_DIR, "speeches_pdf")
 HTML_PDF_DIR = os.path.join(PDF_DIR, "html_to_pdf")
-os.makedirs(HTML_PDF_DIR, exist_ok=True)
-output_json_path = os.path.join(BASE_DIR, "extracted_results.json")
-
-results_metadata = []
-
-def html_to_pdf(title: str, html_snippet: str, output_path: str):
-    """Convert HTML content to a PDF file using xhtml2pdf."""
-    full_html = f"""
-    <html>
-      <head><meta charset="utf-8"></head>
-      <body>
-        <h1 class='center'>{title}</h1>
-        {html_snippet}
-      </body>
-    </html>
-    """
-    with open(output_path, "wb") as f:
-        pisa_status = pisa.CreatePDF(full_html, dest=f)
-    if pisa_status.err:
-        raise RuntimeError("❌ xhtml2pdf conversion error")
-    return output_path
-
-
-def extract_item_content_and_save():
-    """Extract content from iframe, convert to PDF, and return metadata."""
-    wait = WebDriverWait(driver, 15)
-    
-    # Switch to iframe
-    iframe = wait.until(EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_iframepressrealese")))
-    driver.switch_to.frame(iframe)
-    
-    # Get form data
-    form = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "form#form1")))
-    title = form.find_element(By.ID, "ltrTitlee").get_attribute("value") or "untitled"
-    html_body = form.find_element(By.ID, "ltrDescriptionn").get_attribute("value") or "<p>(no content)</p>"
-    
-    # Create safe filename
-    safe_title = "".join(c if c.isalnum() else "_" for c in title)[:50]
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    pdf_name = f"{timestamp}_{safe_title}.pdf"
-    pdf_path = os.path.join(HTML_PDF_DIR, pdf_name)
-    
-    # Save PDF
-    html_to_pdf(title, html_body, pdf_path)
-    print(f"✅ Saved PDF: {pdf_path}")
-    
-    # Return to main page
-    driver.switch_to.default_content()
-    return title, pdf_path
-
-
-def extract_items_data(section_name):
-    """Extract items (speeches or press releases) and save them to PDF."""
-    wait = WebDriverWait(driver, 10)
+PROFILE_DIR = os.path.join(BASE_DIR, "chrome_profiles")  # 👉 Persistent browser profiles, keeps their caches warm
+CACHE_DIR = None  # 👉 e.g. os.path.join(BASE_DIR, "chrome_cache") for one disk cache shared by all the browsers
+DRIVER_MEMORY_MB = 512  # 👉 JavaScript heap cap per browser; one that grows past 80% of it is restarted
+output_path = os.path.join(BASE_DIR, "extracted_results.jsonl")  # 👉 .jsonl, .csv or .sqlite3
+seen_index_path = os.path.join(BASE_DIR, "pib_seen.sqlite3")
+index_path = os.path.join(BASE_DIR, "fulltext.sqlite3")  # 👉 Full-text search index (see search/main.py), None to skip
+snapshot_path = None  # 👉 e.g. os.path.join(BASE_DIR, "pib_snapshots.sqlite3") to keep raw listing / release HTML, for --replay
+SNAPSHOT_MB = 2048  # 👉 Size bound of the snapshot cache; least recently used pages are evicted beyond it
+metrics_path = None  # 👉 e.g. "metrics.prom" (Prometheus text) or "metrics.json", rewritten every 15s while running
+events_path = None  # 👉 e.g. "events.jsonl" for structured failure / retry events
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape pib.gov.in speeches and press releases to PDF.")
+    parser.add_argument("--browsers", type=int, default=POOL_SIZE, help="headless Chrome instances (default: %(default)s)")
+    parser.add_argument("--render-workers", type=int, default=RENDER_WORKERS)
+    parser.add_argument("--render-backend", choices=list(BACKENDS), default=RENDER_BACKEND)
+    parser.add_argument("--render-mode", choices=RENDER_MODES, default=RENDER_MODE,
+                        help="pdf per release, bundle per section-month, or archive / html to skip rendering")
+    parser.add_argument("--fetch-mode", choices=["http", "tab"], default=FETCH_MODE)
+    parser.add_argument("--fetch-workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="requests per second per host")
+    parser.add_argument("--from", dest="start", default=START_MONTH, help="oldest month, YYYY-MM or YYYY (default: %(default)s)")
+    parser.add_argument("--to", dest="end", default=END_MONTH, help="newest month, YYYY-MM or YYYY (default: this month)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--batch-pause", type=float, default=BATCH_PAUSE)
+    parser.add_argument("--full", action="store_true", help="re-crawl everything instead of only new releases")
+    parser.add_argument("--output", default=output_path, help="output file: .jsonl, .csv or .sqlite3")
+    parser.add_argument("--pdf-dir", default=HTML_PDF_DIR)
+    parser.add_argument("--seen-index", default=seen_index_path)
+    parser.add_argument("--index", default=index_path, help="full-text index to add the releases to, '' to skip")
+    parser.add_argument("--snapshots", default=snapshot_path, help="keep compressed raw HTML of listings and releases here")
+    parser.add_argument("--snapshot-mb", type=float, default=SNAPSHOT_MB, help="size bound of the snapshot cache in MB")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-run the extraction from the snapshots, without a browser or network")
+    parser.add_argument("--force", action="store_true", help="let --replay overwrite an existing --output")
+    parser.add_argument("--metrics", default=metrics_path, help="write metrics here: .prom (Prometheus text) or .json")
+    parser.add_argument("--events", default=events_path, help="append structured events (JSON lines) here")
+    parser.add_argument("--profiles", default=PROFILE_DIR, help="browser profile folder, '' for throwaway profiles")
+    parser.add_argument("--browser-cache", default=CACHE_DIR, help="disk cache folder shared by all the browsers")
+    parser.add_argument("--browser-memory", type=int, default=DRIVER_MEMORY_MB, help="JS heap cap per browser in MB, 0 for none")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay and not args.snapshots:
+        print("❌ --replay needs --snapshots to replay from.")
+        return 2
+    if args.replay and has_records(args.output) and not args.force:
+        print(f"❌ --replay rebuilds {args.output} from the replayed snapshots only; pass another --output, or --force to overwrite it.")
+        return 2
+    governor = RequestGovernor(rate=args.rate)
+    if args.events:
+        log_events(args.events)
+    stop_metrics = export_periodically(args.metrics) if args.metrics else None
+
+    # discover (month listings on the browser pool) -> fetch -> render -> sink, connected by bounded queues
+    source = PibSource(
+        args.output, args.seen_index, args.pdf_dir, sections=SECTIONS, pool_size=args.browsers,
+        render_workers=args.render_workers, fetch_workers=args.fetch_workers, fetch_mode=args.fetch_mode,
+        incremental=not args.full, profile_root=args.profiles or None, browser_cache=args.browser_cache or None,
+        browser_memory_mb=args.browser_memory or None, governor=governor,
+        index_path=args.index or None, start=parse_month(args.start),
+        end=parse_month(args.end, end=True) if args.end else None, batch_size=args.batch_size, batch_pause=args.batch_pause,
+        snapshot_path=args.snapshots or None, snapshot_mb=args.snapshot_mb, replay=args.replay,
+        render_backend=args.render_backend, render_mode=args.render_mode, overwrite=args.force,
+    )
+    finished = False
     try:
-        time.sleep(2)
-        list_items = driver.find_elements(By.CSS_SELECTOR, "div.content-area ul.num > li")
-        print(f"🔎 Found {len(list_items)} items on {section_name} page.")
-        
-        for li in list_items:
-            try:
-                a_tag = li.find_element(By.TAG_NAME, "a")
-                span_tag = li.find_element(By.TAG_NAME, "span")
-                
-                title = a_tag.text.strip()
-                date_info = span_tag.text.strip()
-                print(f"\n📄 Title: {title}")
-                print(f"📅 Date: {date_info}")
-                
-                main_window = driver.current_window_handle
-                
-                # Open in new tab
-                a_tag.send_keys(Keys.CONTROL + Keys.RETURN)
-                time.sleep(1)
-                
-                # Switch to new tab
-                driver.switch_to.window([w for w in driver.window_handles if w != main_window][0])
-                
-                # Extract & Save
-                title, pdf_path = extract_item_content_and_save()
-                print(f"✅ [{section_name}] {title} | {date_info} | {pdf_path}")
-                
-                # storing the metadata
-                results_metadata.append({
-                    "section":section_name,
-                    "title":title,
-                    "date": date_info,
-                    "pdf_path": pdf_path
-                })
-
-                # Close tab and switch back
-                driver.close()
-                driver.switch_to.window(main_window)
-                print("-" * 40)
-            
-            except Exception as inner_e:
-                print(f"⚠️ Error processing item: {str(inner_e)}")
-                if len(driver.window_handles) > 1:
-                    driver.close()
-                    driver.switch_to.window(main_window)
-    
+        finished = source.run()
     except Exception as e:
-        print(f"❌ Error extracting data on {section_name} page: {str(e)}")
-
+        print(f"❌ Main execution error: {str(e)}")
+    finally:
+        if stop_metrics:
+            stop_metrics()
+        print_latency_report()
+        governor.print_report()
 
-def process_section(title_attr, section_name):
-    """Navigate to section and extract content month-wise."""
-    wait = WebDriverWait(driver, 10)
-    
-    # refreshing and going to the main page before navigating to a new section section
-    driver.get("https://pib.gov.in/")
-    time.sleep(2)   
 
-    # Use refined XPath to ensure correct button is clicked
-    section_xpath = f"//div[@class='pm-section text-center']//a[@title='{title_attr}']"
-    section_link = wait.until(EC.element_to_be_clickable((By.XPATH, section_xpath)))
-    section_link.click()
-    print(f"\n✅ Navigated to {section_name} section.")
-
-    time.sleep(2)
-
-    # Select Year & Month
-    now = datetime.now()
-    current_month_index = now.month
-    current_year = str(now.year)
-
-    year_select = Select(driver.find_element(By.ID, "ContentPlaceHolder1_ddlYear"))
-    year_select.select_by_visible_text(current_year)
-    print(f"📅 Selected Year: {current_year}")
-    time.sleep(3)
-
-    for month_index in range(1, current_month_index + 1):
-        month_select = Select(driver.find_element(By.ID, "ContentPlaceHolder1_ddlMonth"))
-        month_name = datetime(1900, month_index, 1).strftime('%B')
-        month_select.select_by_visible_text(month_name)
-        print(f"\n🔄 Processing Month: {month_name} ({section_name})")
-        time.sleep(3)
-        
-        extract_items_data(section_name)
+        ##############################################################################
+        # Final cleanup
+        print("🏁 Script completed.")
+    return 0 if finished else 1
 
 
 # === MAIN EXECUTION ===
-try:
-    driver.get("https://pib.gov.in/")
-    
-    # Process Speeches
-    process_section("Speeches", "Speeches")
-
-    # Process Press Releases
-    process_section("Press Releases", "Press Releases")
-
-except Exception as e:
-    print(f"❌ Main execution error: {str(e)}")
-
-finally:
-    with open(output_json_path, "w", encoding="utf-8") as json_file:
-        json.dump(results_metadata, json_file, ensure_ascii=False, indent=2)
-    print(f"✅ Results saved to {output_json_path}")
-
-    
-    ##############################################################################
-    # Final cleanup        
-    print("🏁 Script completed.")
-    driver.quit()
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import time
+from datetime import date, datetime
+
+from scheduler import MonthJob
+
+
+def parse_month(text: str, end: bool = False):
+    """First day of the month in "2023-04" (or of January / December for a bare "2023" when end=True)."""
+    text = text.strip()
+    if len(text) == 4 and text.isdigit():
+        return date(int(text), 12 if end else 1, 1)
+    return datetime.strptime(text, "%Y-%m").date()
+
+
+def months_between(start: date, end: date):
+    """Every (year, month) from start to end inclusive, newest first."""
+    months = []
+    year, month = end.year, end.month
+    while (year, month) >= (start.year, start.month):
+        months.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+
+def plan_jobs(sections, start: date, end: date, skip=None):
+    """One MonthJob per section per month in [start, end], most recent months first.
+
+    Sections are interleaved within a month, so the newest data of every
+    section lands before older archives. skip(job) drops units already done.
+    """
+    jobs = [
+        MonthJob(section_title, section_name, year, month)
+        for year, month in months_between(start, end)
+        for section_title, section_name in sections
+    ]
+    return [job for job in jobs if not (skip and skip(job))]
+
+
+def run_batches(jobs, run_batch, batch_size: int, pause: float = 0):
+    """Call run_batch(batch) on consecutive slices of jobs, sleeping pause seconds in between.
+
+    Keeps a backfill of several years from hitting the site with one huge
+    burst: each batch runs in parallel, batches run one after another.
+    Returns the number of batches run.
+    """
+    batch_size = max(1, batch_size)
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    for number, batch in enumerate(batches, 1):
+        first, last = batch[0], batch[-1]
+        print(f"📦 Batch {number}/{len(batches)}: {len(batch)} section-months "
+              f"({first.year}-{first.month:02d} back to {last.year}-{last.month:02d})")
+        run_batch(batch)
+        if pause and number < len(batches):
+            time.sleep(pause)
+    return len(batches)
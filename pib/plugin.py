@@ -0,0 +1,493 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+
+from common.blobstore import BlobStore
+from common.drivers import DriverPool
+from common.governor import GovernedSession, RequestGovernor, shared_governor
+from common.metrics import event, inc
+from common.pipeline import SourcePlugin, Stage
+from common.sinks import has_records, open_sink
+from common.snapshots import MAX_MB, SnapshotCache, form_state
+from common.textindex import TextIndex, html_text, iso_date
+from common.waits import record_latency, select_and_wait, timed, wait_for_new_window, wait_until
+from releases import LISTING_JS, ReleaseFetcher, parse_listing, parse_release_form
+from planner import plan_jobs, run_batches
+from archive import MonthArchives, month_key
+from renderer import BACKENDS, archive_to_pdf, html_to_pdf, release_page, sanitize_html, when_all_done
+from scheduler import run_jobs
+from seen_index import SeenIndex, content_hash
+
+PIB_URL = "https://pib.gov.in/"
+SECTIONS = [("Speeches", "Speeches"), ("Press Releases", "Press Releases")]  # (link title, section name)
+OUTPUT_FIELDS = ["section", "title", "date", "pdf_path"]
+# What render stores per release: "pdf" renders it, "html" only keeps its sanitized HTML, "archive" adds that
+# to one zip per section-month, "bundle" also renders every archive touched into one PDF at the end
+RENDER_MODES = ["pdf", "html", "archive", "bundle"]
+
+
+def extract_item_content(driver, keep_page: bool = False):
+    """Extract the release title and HTML body from the iframe.
+
+    Returns (title, html_body, page), page being the iframe's raw HTML if keep_page, else None.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Switch to iframe
+    iframe = wait_until(driver, EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_iframepressrealese")), "release iframe", 15)
+    with timed("iframe switch"):
+        driver.switch_to.frame(iframe)
+
+    # Get form data
+    form = wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "form#form1")), "release form", 15)
+    with timed("find elements"):
+        title = form.find_element(By.ID, "ltrTitlee").get_attribute("value") or "untitled"
+        html_body = form.find_element(By.ID, "ltrDescriptionn").get_attribute("value") or "<p>(no content)</p>"
+    page = driver.page_source if keep_page else None
+
+    # Return to main page
+    with timed("iframe switch"):
+        driver.switch_to.default_content()
+    return title, html_body, page
+
+
+class PibSource(SourcePlugin):
+    """pib.gov.in Speeches and Press Releases, one job per section-month.
+
+    discover runs the month jobs between start and end (default: this year)
+    on a pool of headless browsers, newest months first and batch_size jobs
+    at a time; every new release on a month listing goes through the pipeline:
+    fetch (release page over HTTP) -> render (PDF on the process pool) -> sink.
+    render_backend picks the PDF engine (see renderer.BACKENDS), render_mode
+    whether each release gets its own PDF (see RENDER_MODES).
+
+    With a snapshot_path the raw HTML of every month listing and release
+    form is kept too, and replay=True re-runs the extraction from those
+    snapshots without a browser or network, reusing PDFs of unchanged content.
+    """
+
+    name = "pib"
+
+    def __init__(self, output_path: str, seen_index_path: str, pdf_dir: str, sections=SECTIONS,
+                 pool_size: int = 4, render_workers: int = 2, fetch_workers: int = 8,
+                 fetch_mode: str = "http", incremental: bool = True, pib_url: str = PIB_URL,
+                 drivers: DriverPool = None, profile_root: str = None, browser_cache: str = None,
+                 browser_memory_mb: int = None, governor: RequestGovernor = None,
+                 index_path: str = None, start: date = None, end: date = None, batch_size: int = 48,
+                 batch_pause: float = 0, snapshot_path: str = None, snapshot_mb: float = MAX_MB, replay: bool = False,
+                 render_backend: str = "xhtml2pdf", render_mode: str = "pdf", render_pool: ProcessPoolExecutor = None,
+                 release_fetcher: ReleaseFetcher = None, overwrite: bool = False):
+        if replay and not snapshot_path:
+            raise ValueError("replay needs a snapshot_path to replay from")
+        if replay and has_records(output_path) and not overwrite:
+            raise ValueError(f"replay would replace {output_path} with the replayed months only, pass overwrite=True")
+        if render_backend not in BACKENDS:
+            raise ValueError(f"Unknown render backend '{render_backend}', expected one of {', '.join(BACKENDS)}")
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode '{render_mode}', expected one of {', '.join(RENDER_MODES)}")
+        self.output_path = output_path
+        self.pdf_dir = pdf_dir
+        self.sections = sections
+        self.pool_size = pool_size
+        self.render_workers = render_workers
+        self.fetch_workers = fetch_workers
+        self.fetch_mode = fetch_mode
+        self.incremental = incremental
+        self.pib_url = pib_url
+        # PDFs are stored once per content under pdf_dir/blobs, indexed by release
+        self.store = BlobStore(pdf_dir)
+        self.render_backend = render_backend
+        self.render_mode = render_mode
+        self.archives = MonthArchives(os.path.join(pdf_dir, "months")) if render_mode in ("archive", "bundle") else None
+
+        # Browsers start when discover() needs them, and can be shared with (and stay warm for) later crawls
+        self.drivers = drivers or DriverPool(size=pool_size, profile_root=profile_root, cache_dir=browser_cache,
+                                             memory_mb=browser_memory_mb)
+        self._owns_drivers = drivers is None
+
+        self.seen_index = SeenIndex(seen_index_path)
+        # Optional full-text index, fed from the release HTML rather than the rendered PDF
+        self.text_index = TextIndex(index_path) if index_path else None
+        # Optional raw HTML of every listing and release, for re-running the extraction offline
+        self.snapshots = SnapshotCache(snapshot_path, snapshot_mb) if snapshot_path else None
+        self.replay = replay
+        # Incremental runs only capture new releases, so they add to the existing output; a replay redoes it all
+        self.results_sink = open_sink(output_path, OUTPUT_FIELDS, append=incremental and not replay)
+        # A render pool and release fetcher passed in (e.g. by the daemon) stay warm across runs
+        self.render_pool = render_pool or ProcessPoolExecutor(max_workers=render_workers)
+        self._owns_render_pool = render_pool is None
+        self.governor = governor or shared_governor()
+        self.release_fetcher = release_fetcher or ReleaseFetcher(max_workers=fetch_workers, session=GovernedSession(self.governor))
+        self._owns_release_fetcher = release_fetcher is None
+        self.run_started = datetime.now()
+        self.start = start or date(self.run_started.year, 1, 1)
+        self.end = min(end or self.run_started.date(), self.run_started.date())
+        self.batch_size = batch_size  # section-months per batch, so a backfill isn't one huge burst
+        self.batch_pause = batch_pause  # seconds between batches
+        self.job_results = {}  # job -> number of releases queued
+        self.pipeline = None
+
+    # === Pipeline stages ===
+
+    def stages(self):
+        return [
+            Stage("fetch", self.fetch, workers=self.fetch_workers),
+            Stage("render", self.render, workers=self.render_workers),
+            *([Stage("index", self.index_text)] if self.text_index else []),
+            Stage("sink", self.write_release),
+        ]
+
+    def fetch(self, release):
+        """Fetch the release page over HTTP unless the browser already read it."""
+        if release["html_body"] is None:
+            page = self.release_fetcher.fetch_page(release["href"])
+            if self.snapshots:
+                self.capture_release(release, page)
+            release["title"], release["html_body"] = parse_release_form(page)
+        print(f"✅ [{release['section']}] {release['title']} | {release['date']} | queued for rendering")
+        return release
+
+    def render(self, release):
+        """Render the release PDF on the process pool, reusing an identical one if it exists."""
+        release["digest"] = digest = content_hash(release["title"], release["html_body"])
+        if self.render_mode != "pdf":
+            return self.store_page(release)
+
+        # Same content already rendered (e.g. listed again under another title), reuse that PDF
+        existing_pdf = self.seen_index.pdf_for_content(digest) if self.incremental or self.replay else None
+        if existing_pdf and existing_pdf.endswith(".pdf") and os.path.exists(existing_pdf):
+            print(f"⏭️ Content already rendered: {existing_pdf}")
+            inc("pdf_renders_total", outcome="reused")
+            release["pdf_path"] = existing_pdf
+            return release
+
+        # Render next to the store, then move the PDF in under its SHA-256
+        tmp_path = self.store.temp_path()
+        try:
+            render_seconds = self.render_pool.submit(
+                html_to_pdf, release["title"], release["html_body"], tmp_path, self.render_backend
+            ).result()
+            record_latency(BACKENDS[self.render_backend], render_seconds)
+            pdf_path = self.store.put_file(f"pib:{digest}", tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        release["pdf_path"] = pdf_path
+        print(f"✅ Saved PDF: {pdf_path}")
+        inc("pdf_renders_total", outcome="rendered")
+        return release
+
+    def store_page(self, release):
+        """Skip rendering: keep the release's sanitized HTML, on its own or in its section-month archive."""
+        page = release_page(release["title"], sanitize_html(release["html_body"]))
+        if self.render_mode == "html":
+            with self.store.writer(f"pib:{release['digest']}", suffix=".html") as blob:
+                blob.write(page.encode("utf-8"))
+            release["pdf_path"] = blob.path
+        else:
+            month = month_key(iso_date(release["date"]))
+            archive_path = self.archives.add(release["section"], month, release["digest"], page)
+            # A bundle is rendered from the whole archive once the run is over, its path is known already
+            bundle = self.render_mode == "bundle"
+            release["pdf_path"] = self.archives.bundle_path(release["section"], month) if bundle else archive_path
+        print(f"✅ Stored {release['title']} in {release['pdf_path']}")
+        inc("pdf_renders_total", outcome=self.render_mode)
+        return release
+
+    def render_bundles(self):
+        """Render every section-month archive added to in this run into one bundle PDF, on the process pool."""
+        futures = {}
+        for section, month in sorted(self.archives.touched):
+            bundle_path = self.archives.bundle_path(section, month)
+            futures[bundle_path] = self.render_pool.submit(
+                archive_to_pdf, self.archives.archive_path(section, month), bundle_path + ".part", self.render_backend
+            )
+        for bundle_path, future in futures.items():
+            try:
+                record_latency(BACKENDS[self.render_backend], future.result())
+                os.replace(bundle_path + ".part", bundle_path)
+                print(f"📚 Saved bundle: {bundle_path}")
+                inc("pdf_bundles_total", outcome="rendered")
+            except Exception as e:
+                print(f"❌ Failed to render bundle {bundle_path}: {e}")
+                inc("pdf_bundles_total", outcome="failed")
+                event("bundle_failed", path=bundle_path, error=repr(e))
+                if os.path.exists(bundle_path + ".part"):
+                    os.remove(bundle_path + ".part")
+
+    def index_text(self, release):
+        """Add the release's original ltrDescriptionn text to the full-text index, once per content."""
+        doc_id = f"pib:{release['digest']}"
+        if not self.text_index.indexed(doc_id, release["digest"]):
+            try:
+                self.text_index.add(
+                    doc_id, self.name, release["title"], html_text(release["html_body"]), category=release["section"],
+                    date=iso_date(release["date"]), url=release["href"], pdf_path=release["pdf_path"],
+                    digest=release["digest"],
+                )
+                inc("documents_indexed_total", source=self.name)
+            except Exception as e:
+                print(f"⚠️ Could not index {release['title']}: {e}")
+                event("index_failed", doc_id=doc_id, error=repr(e))
+        return release  # the record is written either way
+
+    def write_release(self, release):
+        self.results_sink.write(self.record(release))
+        self.seen_index.add(release["section"], release["listing_title"], release["date"], release["digest"], release["pdf_path"])
+        release["done"].set_result(release["pdf_path"])
+
+    @staticmethod
+    def record(release):
+        return {"section": release["section"], "title": release["title"], "date": release["date"], "pdf_path": release["pdf_path"]}
+
+    def on_error(self, stage, release, error):
+        event("release_failed", stage=stage.name, section=release["section"], listing_title=release["listing_title"],
+              href=release.get("href"), error=repr(error))
+        if stage.name == "fetch":
+            print(f"⚠️ Error processing item {release['listing_title']}: {error}")
+        else:
+            print(f"❌ Failed to {stage.name} PDF for {release['title']}: {error}")
+        # No row and no seen_index entry: the release is picked up again by the next run
+        release["done"].set_exception(error)
+
+    # === Snapshots: raw HTML kept for replaying the extraction offline ===
+
+    def capture_listing(self, driver, job):
+        """Keep the raw HTML of a month listing, keyed by its URL and section / year / month."""
+        state = form_state(section=job.section_name, year=job.year, month=job.month)
+        self.snapshots.put("pib_listing", driver.current_url, state, driver.page_source,
+                           section=job.section_name, year=job.year, month=job.month)
+
+    def capture_release(self, release, page):
+        """Keep the raw HTML of a release's form#form1 (title and ltrDescriptionn body), keyed by its link."""
+        self.snapshots.put("pib_release", release["href"] or "", "", page, section=release["section"],
+                           listing_title=release["listing_title"], date=release["date"])
+
+    def replay_snapshots(self):
+        """Queue every release of the newest snapshot of each listing from start to end, parsed again offline.
+
+        Releases whose page was never captured are reported and left out.
+        """
+        sections = {section_name for _, section_name in self.sections}
+        first, last = (self.start.year, self.start.month), (self.end.year, self.end.month)
+        queued = missing = 0
+        for listing in self.snapshots.latest("pib_listing"):
+            meta = listing["meta"]
+            if meta["section"] not in sections or not first <= (meta["year"], meta["month"]) <= last:
+                continue
+            for title, date_info, href in parse_listing(listing["page"], base_url=listing["url"]):
+                snapshot = self.snapshots.get("pib_release", href) if href else None
+                if snapshot is None:
+                    print(f"⚠️ No snapshot of {title} ({date_info}), skipping.")
+                    missing += 1
+                    continue
+                release_title, html_body = parse_release_form(snapshot["page"])
+                self.queue_release(meta["section"], title, date_info, href=href, title=release_title, html_body=html_body)
+                queued += 1
+        self.job_results["replay"] = queued
+        print(f"♻️ Replayed {queued} releases from {self.snapshots.db_path} ({missing} not captured).")
+
+    # === Discovery: month listings in the browser pool ===
+
+    def queue_release(self, section_name, listing_title, date_info, href=None, title=None, html_body=None):
+        """Hand one release to the pipeline. Returns a Future resolved once its record is written."""
+        done = Future()
+        inc("releases_queued_total", section=section_name)
+        self.pipeline.put({
+            "section": section_name, "listing_title": listing_title, "date": date_info, "href": href,
+            "title": title, "html_body": html_body, "digest": None, "pdf_path": None, "done": done,
+        })
+        return done
+
+    def queue_listing_http(self, driver, section_name, listing):
+        """Read the whole listing in one pass and queue every new release for fetching over HTTP.
+
+        Returns (futures of the queued releases, whether any release had no link).
+        """
+        with timed("listing script"):
+            entries = driver.execute_script(LISTING_JS)
+        print(f"🔎 Found {len(entries)} items on {section_name} page.")
+        self.release_fetcher.use_browser_cookies(driver)
+
+        queued = []
+        failed = False
+        for title, date_info, href in entries:
+            listing.append((title, date_info))
+            print(f"\n📄 Title: {title}")
+            print(f"📅 Date: {date_info}")
+            if self.incremental and self.seen_index.seen(section_name, title, date_info):
+                print("⏭️ Already captured, skipping.")
+                continue
+            if not href:
+                print("⚠️ Error processing item: no link on the listing")
+                failed = True
+                continue
+            queued.append(self.queue_release(section_name, title, date_info, href=href))
+        return queued, failed
+
+    def queue_listing_tabs(self, driver, section_name, listing):
+        """Open every new release in its own browser tab, read it from the iframe and queue it.
+
+        Returns (futures of the queued releases, whether any release could not be read).
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+
+        queued = []
+        failed = False
+        with timed("find elements"):
+            list_items = driver.find_elements(By.CSS_SELECTOR, "div.content-area ul.num > li")
+        print(f"🔎 Found {len(list_items)} items on {section_name} page.")
+
+        for li in list_items:
+            try:
+                a_tag = li.find_element(By.TAG_NAME, "a")
+                span_tag = li.find_element(By.TAG_NAME, "span")
+
+                title = a_tag.text.strip()
+                date_info = span_tag.text.strip()
+                listing.append((title, date_info))
+                print(f"\n📄 Title: {title}")
+                print(f"📅 Date: {date_info}")
+
+                if self.incremental and self.seen_index.seen(section_name, title, date_info):
+                    print("⏭️ Already captured, skipping.")
+                    continue
+
+                main_window = driver.current_window_handle
+                known_handles = set(driver.window_handles)
+
+                # Open in new tab
+                a_tag.send_keys(Keys.CONTROL + Keys.RETURN)
+
+                # Switch to new tab
+                driver.switch_to.window(wait_for_new_window(driver, known_handles, "new tab", 10))
+
+                # Extract, then render in the background
+                href = a_tag.get_attribute("href")
+                release_title, html_body, page = extract_item_content(driver, keep_page=self.snapshots is not None)
+                if page is not None:
+                    self.capture_release({"href": href, "section": section_name, "listing_title": title, "date": date_info}, page)
+                queued.append(self.queue_release(section_name, title, date_info, href=href, title=release_title, html_body=html_body))
+
+                # Close tab and switch back
+                driver.close()
+                driver.switch_to.window(main_window)
+                print("-" * 40)
+
+            except Exception as inner_e:
+                print(f"⚠️ Error processing item: {str(inner_e)}")
+                failed = True
+                if len(driver.window_handles) > 1:
+                    driver.close()
+                    driver.switch_to.window(main_window)
+        return queued, failed
+
+    def process_month(self, driver, job):
+        """Navigate to the job's section, select its year and month, and queue its new releases."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
+        # refreshing and going to the main page before navigating to a new section section
+        with timed("home page load"):
+            driver.get(self.pib_url)
+
+        # Use refined XPath to ensure correct button is clicked
+        section_xpath = f"//div[@class='pm-section text-center']//a[@title='{job.section_title}']"
+        section_link = wait_until(driver, EC.element_to_be_clickable((By.XPATH, section_xpath)), "section link", 10)
+        section_link.click()
+        print(f"\n✅ Navigated to {job.section_name} section.")
+
+        wait_until(driver, EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_ddlYear")), "section load", 10)
+
+        # Select Year & Month
+        select_and_wait(driver, (By.ID, "ContentPlaceHolder1_ddlYear"), str(job.year), "year select")
+        print(f"📅 Selected Year: {job.year}")
+
+        month_name = datetime(1900, job.month, 1).strftime('%B')
+        select_and_wait(driver, (By.ID, "ContentPlaceHolder1_ddlMonth"), month_name, "month select")
+        print(f"\n🔄 Processing Month: {month_name} ({job.section_name})")
+
+        listing = []
+        queued = []
+        failed = False
+        try:
+            wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "div.content-area")), "listing load", 10)
+            if self.snapshots:
+                self.capture_listing(driver, job)
+            if self.fetch_mode == "http":
+                queued, failed = self.queue_listing_http(driver, job.section_name, listing)
+            else:
+                queued, failed = self.queue_listing_tabs(driver, job.section_name, listing)
+        except Exception as e:
+            print(f"❌ Error extracting data on {job.section_name} page: {str(e)}")
+            event("month_failed", section=job.section_name, year=job.year, month=job.month, error=repr(e))
+            failed = True
+
+        # A month crawled cleanly after it ended won't change again, later runs can skip it.
+        # Its releases are still in the pipeline, so record the watermark once they are all written.
+        month_over = (job.year, job.month) < (self.run_started.year, self.run_started.month)
+
+        def mark_month():
+            written = all(future.exception() is None for future in queued)
+            self.seen_index.mark_month(
+                job.section_name, job.year, job.month,
+                last_date=listing[0][1] if listing else None, item_count=len(listing),
+                complete=month_over and not failed and written,
+            )
+
+        when_all_done(queued, mark_month)
+        return len(queued)
+
+    def jobs(self):
+        """Every section-month from start to end, newest first, minus the ones already complete."""
+        def complete(job):
+            return self.incremental and self.seen_index.month_complete(job.section_name, job.year, job.month)
+
+        return plan_jobs(self.sections, self.start, self.end, skip=complete)
+
+    def discover(self, pipeline):
+        self.pipeline = pipeline
+        if self.replay:
+            self.replay_snapshots()
+            print("⏳ Waiting for PDF rendering to finish...")
+            return True
+        jobs = self.jobs()
+        if not jobs:
+            print("✅ Every section-month is already complete.")
+            return True
+
+        # Months of both sections are independent, so spread them over the driver pool,
+        # whose browsers start in parallel instead of one by one as workers pick up jobs
+        browsers = min(self.pool_size, len(jobs))
+        with timed("browser warm-up"):
+            self.drivers.warm(browsers)
+        print(f"🚀 Scraping {len(jobs)} section-months on {browsers} browsers...")
+        run_batches(
+            jobs,
+            lambda batch: run_jobs(batch, self.process_month, self.drivers, pool_size=self.pool_size, results=self.job_results),
+            self.batch_size, self.batch_pause,
+        )
+        # Let queued releases finish fetching and rendering, their records are written when done
+        print("⏳ Waiting for PDF rendering to finish...")
+        return len(self.job_results) == len(jobs)
+
+    def close(self):
+        if self._owns_release_fetcher:
+            self.release_fetcher.close()
+        if self.render_mode == "bundle":
+            self.render_bundles()
+        if self._owns_render_pool:
+            self.render_pool.shutdown(wait=True)
+        # Every record was written as it completed, closing just makes the last ones durable
+        self.results_sink.close()
+        print(f"✅ {sum(self.job_results.values())} results saved to {self.output_path}")
+        self.seen_index.close()
+        if self.text_index:
+            self.text_index.close()
+        if self.snapshots:
+            self.snapshots.close()
+        self.store.close()
+        if self._owns_drivers:
+            self.drivers.close()
@@ -0,0 +1,110 @@
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from lxml import html
+from requests.adapters import HTTPAdapter
+
+from common.governor import GovernedSession
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+IFRAME_ID = "ContentPlaceHolder1_iframepressrealese"
+
+# Title, date and absolute href of every release on the month listing, in one WebDriver round-trip
+LISTING_JS = r"""
+return Array.prototype.map.call(document.querySelectorAll('div.content-area ul.num > li'), function (li) {
+    var a = li.querySelector('a');
+    var span = li.querySelector('span');
+    return [a ? a.innerText.trim() : '', span ? span.innerText.trim() : '', a ? a.href : null];
+});
+"""
+
+
+LISTING_XPATH = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' content-area ')]"
+    "//ul[contains(concat(' ', normalize-space(@class), ' '), ' num ')]/li"
+)
+
+
+def parse_listing(page, base_url: str = None):
+    """Read [title, date, absolute href] of every release from month listing HTML, like LISTING_JS does live."""
+    tree = html.fromstring(page, base_url=base_url) if isinstance(page, (str, bytes)) else page
+    entries = []
+    for li in tree.xpath(LISTING_XPATH):
+        links = li.xpath(".//a")
+        spans = li.xpath(".//span")
+        href = links[0].get("href") if links else None
+        entries.append([
+            links[0].text_content().strip() if links else "",
+            spans[0].text_content().strip() if spans else "",
+            urllib.parse.urljoin(base_url or "", href) if href else None,
+        ])
+    return entries
+
+
+def parse_release_form(page):
+    """Read (title, html_body) from the release iframe's form#form1 hidden fields."""
+    tree = html.fromstring(page) if isinstance(page, (str, bytes)) else page
+    forms = tree.xpath("//form[@id='form1']")
+    if not forms:
+        raise ValueError("form#form1 not found in release page")
+    form = forms[0]
+    title_fields = form.xpath(".//*[@id='ltrTitlee']")
+    body_fields = form.xpath(".//*[@id='ltrDescriptionn']")
+    title = title_fields[0].get("value") if title_fields else None
+    html_body = body_fields[0].get("value") if body_fields else None
+    return title or "untitled", html_body or "<p>(no content)</p>"
+
+
+class ReleaseFetcher:
+    """Fetch release pages over pooled HTTP instead of opening a browser tab per release.
+
+    A release page only wraps the ContentPlaceHolder1_iframepressrealese
+    iframe, whose form#form1 carries the title and HTML body, so both pages
+    are fetched directly and the form values are parsed offline.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: int = 30, session: requests.Session = None):
+        self.timeout = timeout
+        self.session = session or GovernedSession()
+        self.session.headers.setdefault("User-Agent", USER_AGENT)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pib-release")
+
+    def use_browser_cookies(self, driver):
+        """Send the browser's cookies (session, consent) with the direct requests."""
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    def _get(self, url: str):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def fetch_page(self, release_url: str):
+        """Return the raw HTML carrying the release's form#form1 (the iframe's page, or the release page itself)."""
+        content = self._get(release_url)
+        iframes = html.fromstring(content).xpath(f"//iframe[@id='{IFRAME_ID}']")
+        if not iframes:
+            return content  # content served inline
+        return self._get(urllib.parse.urljoin(release_url, iframes[0].get("src")))
+
+    def fetch(self, release_url: str):
+        """Return (title, html_body) for one release page."""
+        return parse_release_form(self.fetch_page(release_url))
+
+    def submit(self, release_url: str):
+        """Queue a fetch and return a Future resolving to (title, html_body)."""
+        return self._executor.submit(self.fetch, release_url)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
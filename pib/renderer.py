@@ -0,0 +1,208 @@
+import html
+import threading
+import time
+
+BACKENDS = {"xhtml2pdf": "pisa.CreatePDF", "reportlab": "reportlab build"}  # backend -> step name of its latency
+
+# Typography for every release, merged into xhtml2pdf's built-in stylesheet so both are parsed once per worker.
+# No @page / @font-face rules here: those configure the document being built and can't be shared.
+RELEASE_CSS = """
+h1.center { text-align: center; font-size: 16pt; margin-bottom: 8pt; }
+p { margin: 0 0 6pt 0; line-height: 1.3; }
+table { border-collapse: collapse; }
+td, th { padding: 2pt; vertical-align: top; }
+"""
+PAGE_TEMPLATE = '<html>\n  <head><meta charset="utf-8"></head>\n  <body>\n{body}\n  </body>\n</html>\n'
+PAGE_BREAK = "<pdf:nextpage />"
+# Dropped from release HTML before it is stored or rendered: active content and things that fetch more
+UNSAFE_TAGS = ["script", "style", "iframe", "frame", "object", "embed", "form", "input", "button", "link", "meta", "base"]
+BLOCK_TAGS = {"p", "div", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "center"}
+
+_worker_setup = {}  # per-process caches (parsed stylesheets, paragraph styles), filled on first use
+
+
+def sanitize_html(html_body: str):
+    """Release HTML without scripts, styles, frames, forms, on* handlers or javascript: links."""
+    from lxml import html as lxml_html
+
+    if not html_body or not html_body.strip():
+        return "<p>(no content)</p>"
+    root = lxml_html.fragment_fromstring(html_body, create_parent="div")
+    for element in root.xpath("|".join(f"//{tag}" for tag in UNSAFE_TAGS) + "|//comment()|//processing-instruction()"):
+        element.drop_tree()
+    for element in root.iter():
+        for name in list(element.attrib):
+            value = element.attrib[name].strip().lower()
+            if name.lower().startswith("on") or value.startswith(("javascript:", "vbscript:")):
+                del element.attrib[name]
+    return html.escape(root.text or "") + "".join(lxml_html.tostring(child, encoding="unicode") for child in root)
+
+
+def release_page(title: str, html_snippet: str):
+    """The release as a standalone HTML fragment: its title heading, then its body."""
+    return f"<h1 class='center'>{html.escape(title)}</h1>\n{html_snippet}"
+
+
+def _cache_default_css():
+    """Have xhtml2pdf parse its built-in stylesheet (plus RELEASE_CSS) once per process instead of once per PDF.
+
+    The parsed user-agent stylesheet is plain data without @-rules, so every
+    document can share it. Skipped if this xhtml2pdf version parses CSS differently.
+    """
+    from xhtml2pdf import parser
+    from xhtml2pdf.context import pisaContext
+
+    parse = getattr(pisaContext, "_parseCSSSource", None)
+    source = getattr(parser, "DEFAULT_CSS_SOURCE", None)
+    if parse is None or source is None:
+        return
+    parsed = {}
+
+    def parse_cached(context, text, source_name):
+        if source_name != source:
+            return parse(context, text, source_name)
+        if text not in parsed:
+            parsed[text] = parse(context, text, source_name)
+        return parsed[text]
+
+    pisaContext._parseCSSSource = parse_cached
+
+
+def _render_xhtml2pdf(pages, f):
+    from xhtml2pdf import pisa
+    from xhtml2pdf.default import DEFAULT_CSS
+
+    if "xhtml2pdf" not in _worker_setup:
+        _cache_default_css()
+        _worker_setup["xhtml2pdf"] = DEFAULT_CSS + RELEASE_CSS
+    full_html = PAGE_TEMPLATE.format(body=f"\n{PAGE_BREAK}\n".join(pages))
+    pisa_status = pisa.CreatePDF(full_html, dest=f, default_css=_worker_setup["xhtml2pdf"])
+    if pisa_status.err:
+        raise RuntimeError("❌ xhtml2pdf conversion error")
+
+
+def _paragraph_styles():
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    if "reportlab" not in _worker_setup:
+        sheet = getSampleStyleSheet()
+        title = ParagraphStyle("ReleaseTitle", parent=sheet["Title"], fontSize=16, leading=20)
+        styles = {tag: sheet["Heading%d" % int(tag[1])] for tag in ("h1", "h2", "h3", "h4", "h5", "h6")}
+        styles["li"] = ParagraphStyle("ReleaseItem", parent=sheet["BodyText"], leftIndent=12, bulletIndent=0)
+        styles["tr"] = ParagraphStyle("ReleaseRow", parent=sheet["BodyText"], fontSize=9, leading=11)
+        _worker_setup["reportlab"] = title, sheet["BodyText"], styles
+    return _worker_setup["reportlab"]
+
+
+def _blocks(page: str):
+    """(tag, text) of every block of a release_page(), in document order; table rows become one line.
+
+    Text that sits directly in a container (before, between or after its blocks)
+    becomes a "p" block of its own, so nothing html_text() sees is dropped.
+    """
+    from lxml import html as lxml_html
+
+    root = lxml_html.fragment_fromstring(page, create_parent="div")
+    blocks = []
+
+    def has_blocks(element):
+        return any(inner.tag in BLOCK_TAGS or inner.tag == "table" for inner in element.iter() if inner is not element)
+
+    def walk(element):
+        loose = [element.text or ""]  # inline text waiting for the next block (or the end) to close it
+
+        def flush():
+            blocks.append(("p", " ".join("".join(loose).split())))
+            loose.clear()
+
+        for child in element:
+            if not isinstance(child.tag, str):
+                pass
+            elif child.tag == "tr":
+                flush()
+                cells = [" ".join(cell.text_content().split()) for cell in child if isinstance(cell.tag, str)]
+                blocks.append(("tr", " | ".join(cell for cell in cells if cell)))
+            elif child.tag in BLOCK_TAGS and not has_blocks(child):
+                flush()
+                blocks.append((child.tag, " ".join(child.text_content().split())))
+            elif has_blocks(child):
+                flush()
+                walk(child)
+            else:
+                loose.append("\n" if child.tag == "br" else child.text_content())
+            loose.append(child.tail or "")
+        flush()
+
+    walk(root)
+    return [(tag, text) for tag, text in blocks if text]
+
+
+def _render_reportlab(pages, f):
+    """Lay the release text out with reportlab directly: headings, paragraphs, list items, table rows.
+
+    Much cheaper than xhtml2pdf (no HTML/CSS engine), at the cost of the original formatting.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+    title_style, body_style, styles = _paragraph_styles()
+    story = []
+    for index, page in enumerate(pages):
+        if index:
+            story.append(PageBreak())
+        for number, (tag, text) in enumerate(_blocks(page)):
+            style = title_style if number == 0 and tag == "h1" else styles.get(tag, body_style)
+            story.append(Paragraph(html.escape(text), style, bulletText="•" if tag == "li" else None))
+    SimpleDocTemplate(f, pagesize=A4).build(story or [Paragraph("(no content)", body_style)])
+
+
+def html_to_pdf(title: str, html_snippet: str, output_path: str, backend: str = "xhtml2pdf"):
+    """Convert HTML content to a PDF file with the given backend (see BACKENDS).
+
+    Runs in the render process pool, so it only takes picklable arguments.
+    The backend is imported here, once per worker process, as xhtml2pdf takes
+    over a second to import; its stylesheets are parsed on the first render
+    and reused. Returns the seconds rendering took, for the parent process to
+    record (metrics recorded in the worker would be lost).
+    """
+    return pages_to_pdf([release_page(title, html_snippet)], output_path, backend)
+
+
+def pages_to_pdf(pages, output_path: str, backend: str = "xhtml2pdf"):
+    """Render release_page() fragments into one PDF, each starting on a new page. Returns the seconds it took."""
+    render = {"xhtml2pdf": _render_xhtml2pdf, "reportlab": _render_reportlab}.get(backend)
+    if render is None:
+        raise ValueError(f"Unknown render backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    with open(output_path, "wb") as f:
+        start = time.perf_counter()
+        render(pages, f)
+        return time.perf_counter() - start
+
+
+def archive_to_pdf(archive_path: str, output_path: str, backend: str = "xhtml2pdf"):
+    """Render every page in a month archive (see MonthArchives) into one bundle PDF. Returns the seconds it took."""
+    import zipfile
+
+    with zipfile.ZipFile(archive_path) as archive:
+        pages = [archive.read(name).decode("utf-8") for name in archive.namelist() if name.endswith(".html")]
+    return pages_to_pdf(pages, output_path, backend)
+
+
+def when_all_done(futures, callback):
+    """Call callback() once every future has finished (right away if there are none)."""
+    if not futures:
+        callback()
+        return
+
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            callback()
+
+    for future in futures:
+        future.add_done_callback(done)
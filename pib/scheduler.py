@@ -0,0 +1,72 @@
+import queue
+import threading
+from collections import namedtuple
+
+from common.drivers import driver_alive
+
+# One unit of PIB work: a single month of a single section
+MonthJob = namedtuple("MonthJob", ["section_title", "section_name", "year", "month"])
+
+
+def run_jobs(jobs, job_fn, drivers, pool_size: int = 4, max_attempts: int = 3, results: dict = None):
+    """Run job_fn(driver, job) for every job, spread over pool_size browsers.
+
+    Each worker thread takes one driver from drivers (a common.drivers.DriverPool)
+    and pulls jobs from a shared queue. If a job fails and its driver no longer
+    answers (or none could be started), the driver is discarded, replaced and
+    the job is re-queued, up to max_attempts times. A job failing on a live
+    driver (a timeout, a missing element) just fails and the driver is kept.
+    Healthy drivers go back to the pool when the queue is empty. Results are
+    stored in results[job] as jobs finish and the dict is returned.
+    """
+    results = {} if results is None else results
+    job_queue = queue.Queue()
+    for job in jobs:
+        job_queue.put((job, 1))
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        driver = None
+        try:
+            while True:
+                try:
+                    job, attempt = job_queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    if driver is None:
+                        driver = drivers.acquire()
+                    result = job_fn(driver, job)
+                    with lock:
+                        results[job] = result
+                    if not driver_alive(driver):
+                        print(f"💥 Worker {worker_id}: browser died after {job}, replacing it.")
+                        drivers.discard(driver)
+                        driver = None
+                except Exception as e:
+                    if driver is not None and driver_alive(driver):
+                        print(f"❌ Worker {worker_id}: job {job} failed: {e}")
+                        continue
+                    message = getattr(e, "msg", None) or e
+                    print(f"💥 Worker {worker_id}: browser failed on {job} (attempt {attempt}): {message}")
+                    if driver is not None:
+                        drivers.discard(driver)
+                    driver = None
+                    if attempt < max_attempts:
+                        job_queue.put((job, attempt + 1))
+                    else:
+                        print(f"❌ Giving up on {job} after {attempt} attempts.")
+        finally:
+            if driver is not None:
+                drivers.release(driver)
+
+    threads = [
+        threading.Thread(target=worker, args=(worker_id,), name=f"pib-worker-{worker_id}", daemon=True)
+        for worker_id in range(max(1, min(pool_size, len(jobs))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
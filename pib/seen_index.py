@@ -0,0 +1,90 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    section TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    pdf_path TEXT,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (section, title, date)
+);
+CREATE INDEX IF NOT EXISTS items_content_hash ON items (content_hash);
+CREATE TABLE IF NOT EXISTS watermarks (
+    section TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    last_date TEXT,
+    item_count INTEGER NOT NULL,
+    complete INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (section, year, month)
+);
+"""
+
+
+def content_hash(title: str, html_body: str) -> str:
+    return hashlib.sha256(f"{title}\n{html_body}".encode("utf-8")).hexdigest()
+
+
+class SeenIndex:
+    """On-disk index of PIB releases that were already captured.
+
+    items is keyed by (section, title, date) as shown on the month listing,
+    so known releases are skipped before their tab is opened; content_hash
+    catches the same release listed under another title before it is
+    rendered again. watermarks records per (section, year, month) whether
+    the month was fully crawled after it ended, so later runs can skip it.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def seen(self, section: str, title: str, date: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM items WHERE section = ? AND title = ? AND date = ?", (section, title, date)
+            ).fetchone()
+        return row is not None
+
+    def pdf_for_content(self, digest: str):
+        """pdf_path of an already rendered release with this content hash, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pdf_path FROM items WHERE content_hash = ? AND pdf_path IS NOT NULL LIMIT 1", (digest,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def add(self, section: str, title: str, date: str, digest: str, pdf_path: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO items (section, title, date, content_hash, pdf_path, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, COALESCE((SELECT first_seen FROM items WHERE section = ? AND title = ? AND date = ?), ?))",
+                (section, title, date, digest, pdf_path, section, title, date, datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def month_complete(self, section: str, year: int, month: int) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT complete FROM watermarks WHERE section = ? AND year = ? AND month = ?", (section, year, month)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def mark_month(self, section: str, year: int, month: int, last_date: str, item_count: int, complete: bool):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (section, year, month, last_date, item_count, complete, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (section, year, month, last_date, item_count, int(complete), datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.textindex import TextIndex
+
+index_path = "fulltext.sqlite3"  # 👉 The index written by egazette/main.py and pib/main.py (--index)
+limit = 20  # 👉 Results shown per search
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Search the gazettes and PIB releases in the full-text index.",
+        epilog='e.g. python search/main.py "motor vehicles" --ministry "Road Transport" --from 2025-01-01',
+    )
+    parser.add_argument("query", nargs="?", help='words, "a phrase" or prefix*, all of which must match')
+    parser.add_argument("--fts", action="store_true", help="the query is FTS5 syntax: title:word, a OR b, NEAR(a b)")
+    parser.add_argument("--ministry", help="ministry name contains this")
+    parser.add_argument("--category", help='exact category, e.g. "Extra Ordinary" or "Speeches"')
+    parser.add_argument("--source", choices=["egazette", "pib"])
+    parser.add_argument("--from", dest="date_from", help="published on or after YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="published on or before YYYY-MM-DD")
+    parser.add_argument("--limit", type=int, default=limit)
+    parser.add_argument("--index", default=index_path)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.index):
+        print(f"❌ No index at {args.index}, run a scraper with --index first.")
+        return 1
+
+    index = TextIndex(args.index)
+    try:
+        results = index.search(
+            args.query, ministry=args.ministry, category=args.category, source=args.source,
+            date_from=args.date_from, date_to=args.date_to, limit=args.limit, syntax=args.fts,
+        )
+        print(f"🔎 {len(results)} of {index.count()} documents:")
+        for result in results:
+            print(f"\n📄 {result['title']}")
+            print(f"   {result['date'] or '?'} | {result['source']} | {result['ministry'] or '-'} | {result['category'] or '-'}")
+            print(f"   {' '.join((result['snippet'] or '').split())}")
+            print(f"   {result['pdf_path'] or result['url'] or ''}")
+    except sqlite3.OperationalError as e:
+        print(f"❌ Invalid FTS5 query ({e}). Without --fts words and \"phrases\" are searched as typed.")
+        return 2
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
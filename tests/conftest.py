@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The scrapers run as `python main.py` from their own folder and import their siblings by name.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (REPO_DIR, os.path.join(REPO_DIR, "egazette"), os.path.join(REPO_DIR, "pib")):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
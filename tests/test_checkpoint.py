@@ -0,0 +1,53 @@
+from checkpoint import Checkpoint
+from grid import GazetteRecord
+
+
+def record(document_id):
+    return GazetteRecord("1", "Ministry", "Department", "Office", "Subject", "Act", "Part I",
+                         "16-Apr-2025", "16-Apr-2025", f"CG-DL-E-16042025-{document_id}", "120 KB")
+
+
+def test_fresh_checkpoint(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "Act")
+    assert checkpoint.next_page() is None
+    assert checkpoint.completed_pages() == []
+    assert list(checkpoint.restored_records()) == []
+
+
+def test_resume_restores_pages_and_records(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "Act")
+    checkpoint.save_page(1, [record(1), record(2)])
+    checkpoint.save_page(3, [record(5)])
+    checkpoint.save_page(2, [record(3), record(4)])
+
+    resumed = Checkpoint(str(tmp_path), "Act")
+    assert resumed.completed_pages() == [1, 2, 3]
+    assert resumed.next_page() == 4
+    assert [r.document_id for r in resumed.restored_records()] == ["1", "2", "5", "3", "4"]
+
+
+def test_page_saved_twice_is_restored_once(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "Act")
+    checkpoint.save_page(1, [record(1)])
+    checkpoint.save_page(1, [record(1)])
+    assert [r.document_id for r in Checkpoint(str(tmp_path), "Act").restored_records()] == ["1"]
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "Act")
+    checkpoint.save_page(1, [record(1)])
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"page": 2, "saved_at": "2025-04-16T10:00:00", "rows": [{"serial_no"')
+
+    resumed = Checkpoint(str(tmp_path), "Act")
+    assert resumed.completed_pages() == [1]
+    resumed.save_page(2, [record(2)])
+    assert Checkpoint(str(tmp_path), "Act").completed_pages() == [1, 2]
+
+
+def test_clear_forgets_progress(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), "Act")
+    checkpoint.save_page(1, [record(1)])
+    checkpoint.clear()
+    assert Checkpoint(str(tmp_path), "Act").next_page() is None
+    assert Checkpoint(str(tmp_path), "Bill").next_page() is None
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import sys
+
+import pytest
+import requests
+
+from common.governor import RequestGovernor
+from downloader import PdfDownloader
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+from mock_server import start_server  # noqa: E402
+
+
+@pytest.fixture
+def site():
+    # seed 2: the first PDF body is cut off halfway, the Range request that continues it is not
+    server, base_url = start_server(pdf_kb=512, cut_rate=0.5, seed=2)
+    yield base_url
+    server.shutdown()
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    with PdfDownloader(str(tmp_path), max_workers=2, governor=RequestGovernor(rate=1000)) as downloader:
+        yield downloader
+
+
+def test_download_resumes_cut_body_and_links_name(site, downloader, tmp_path, capsys):
+    url = f"{site}/WriteReadData/2025/262469.pdf"
+    blob = downloader.submit(url, "egazette:262469", "262469.pdf").result()
+    assert "Resuming" in capsys.readouterr().out
+    assert blob["path"] == os.path.join(str(tmp_path), "262469.pdf")
+    with open(blob["path"], "rb") as f:
+        data = f.read()
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+    assert len(data) == blob["size"] == int(requests.head(url).headers["Content-Length"])
+    assert hashlib.sha256(data).hexdigest() == blob["digest"]
+    stored = downloader.store.lookup("egazette:262469")
+    assert os.path.samefile(stored["path"], blob["path"])
+    assert not os.listdir(os.path.join(str(tmp_path), "tmp"))
+
+
+def test_unchanged_pdf_is_not_fetched_again(site, downloader):
+    url = f"{site}/WriteReadData/2025/262470.pdf"
+    first = downloader.download(url, "egazette:262470", "262470.pdf")
+    second = downloader.download(url, "egazette:262470", "262470.pdf")
+    assert second["digest"] == first["digest"] and second["stored_at"] == first["stored_at"]
+
+
+def test_failed_download_returns_none(site, downloader, tmp_path):
+    assert downloader.download(f"{site}/WriteReadData/2025/missing.txt", "egazette:missing", "missing.pdf") is None
+    assert downloader.store.lookup("egazette:missing") is None
+    assert not os.path.exists(os.path.join(str(tmp_path), "missing.pdf"))
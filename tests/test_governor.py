@@ -0,0 +1,114 @@
+import io
+
+import pytest
+import requests
+
+from common.governor import AdaptiveLimit, CircuitBreaker, CircuitOpenError, RequestGovernor
+
+
+def response(status):
+    reply = requests.Response()
+    reply.status_code = status
+    reply.raw = io.BytesIO(b"")
+    return reply
+
+
+class FakeSite:
+    """send() for RequestGovernor: answers with the queued statuses (or raises queued exceptions) in order."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return response(outcome)
+
+
+def governor(**options):
+    options = {"rate": 1000, "burst": 1000, "backoff_base": 0, "backoff_max": 0, **options}
+    return RequestGovernor(**options)
+
+
+def test_limit_grows_with_good_responses():
+    limit = AdaptiveLimit(initial=2, maximum=4)
+    for _ in range(40):
+        limit.acquire()
+        limit.release(0.1, ok=True, kind="GET")
+    assert limit.limit == 4
+
+
+def test_limit_halves_once_per_burst_of_errors():
+    limit = AdaptiveLimit(initial=8)
+    limit.release(0.1, ok=True, kind="GET")  # a smoothed latency, so the decreases are spaced
+    for _ in range(5):
+        limit.acquire()
+        limit.release(None, ok=False)
+    assert limit.limit == (8 + 1 / 8) / 2  # the good sample's increase, then a single halving
+
+
+def test_congestion_is_judged_per_kind():
+    limit = AdaptiveLimit(initial=4)
+    limit.release(0.01, ok=True, kind="HEAD")
+    before = limit.limit
+    limit.release(0.2, ok=True, kind="POST")  # slow compared to HEAD, but the first POST sample
+    assert limit.limit > before
+    limit.release(1.0, ok=True, kind="POST")  # 5x the POST baseline: congested
+    assert limit.limit < before
+
+
+def test_breaker_opens_and_recovers(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("common.governor.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failures=3, cooldown=10)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock[0] += 10
+    assert breaker.allow()  # the probe
+    assert breaker.state == "half-open" and not breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open"
+
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_send_retries_transient_failures():
+    site = FakeSite(503, requests.ConnectionError("reset"), 200)
+    assert governor().send(site, "GET", "http://site/page").status_code == 200
+    assert site.calls == 3
+
+
+def test_send_returns_last_error_status():
+    site = FakeSite(500, 500)
+    assert governor(max_attempts=2).send(site, "GET", "http://site/page").status_code == 500
+    assert site.calls == 2
+
+
+def test_any_exception_counts_against_the_breaker():
+    gov = governor(breaker_failures=2, breaker_cooldown=60)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            gov.send(FakeSite(ValueError("bad body")), "GET", "http://site/page")
+    site = FakeSite(200)
+    with pytest.raises(CircuitOpenError):
+        gov.send(site, "GET", "http://site/page")
+    assert site.calls == 0
+
+
+def test_probe_is_sent_once_and_not_counted():
+    gov = governor(breaker_failures=1)
+    site = FakeSite(500)
+    assert gov.send(site, "POST", "http://site/search", probe=True).status_code == 500
+    assert site.calls == 1
+    host = gov.host("http://site/search")
+    assert host.breaker.state == "closed"
+    assert host.limit.limit == gov.initial_concurrency and host.limit.in_flight == 0
@@ -0,0 +1,44 @@
+from pagination import has_next_page, page_count, parse_total, shard_pages, step_towards
+
+
+def pager(current, *pages):
+    """A parse_gazette_page pager showing current, linking to pages (ints, or strings like "..." labels)."""
+    return {"current": str(current), "links": [(str(page), "gvGazetteList", f"Page${page}") for page in pages]}
+
+
+def test_parse_total_and_page_count():
+    assert parse_total("Total Number of Gazettes : 1234") == 1234
+    assert parse_total("") is None
+    assert page_count(1234) == 83
+    assert page_count(0) == 1
+
+
+def test_shard_pages_contiguous_and_balanced():
+    assert shard_pages(range(1, 11), 3) == [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+    assert shard_pages([5, 3, 4], 8) == [[3], [4], [5]]
+    assert shard_pages([1, 2], 0) == [[1, 2]]
+    assert shard_pages([], 4) == []
+
+
+def test_shard_pages_keeps_every_page_once():
+    pages = [page for page in range(1, 100) if page % 7]
+    shards = shard_pages(pages, 6)
+    assert len(shards) == 6
+    assert sum(shards, []) == pages
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+def test_has_next_page():
+    assert has_next_page(pager(3, 1, 2, 4, 5), 3)
+    assert has_next_page(pager(10, *range(1, 10), 11), 10)  # the trailing "..." of a block
+    assert not has_next_page(pager(5, 1, 2, 3, 4), 5)
+    assert not has_next_page({"current": None, "links": []}, 1)
+
+
+def test_step_towards_walks_the_block_links():
+    block = pager(3, *range(1, 3), *range(4, 11), 11)
+    assert step_towards(block, 7) == "Page$7"
+    assert step_towards(block, 25) == "Page$11"
+    assert step_towards(pager(12, 10, 11, 13, 21), 4) == "Page$10"
+    assert step_towards(pager(1, 2, 3), 9) == "Page$3"
+    assert step_towards(pager(1), 9) is None
@@ -0,0 +1,32 @@
+import pytest
+
+from common.textindex import html_text
+from renderer import _blocks, release_page
+
+
+def squeeze(text):
+    return "".join(text.split())
+
+
+@pytest.mark.parametrize("body", [
+    "<div>intro text<p>para</p></div>",
+    "<div><span>lead</span><p>para</p></div>",
+    "<p>para</p>after para<br/>more",
+    "<div>before<ul><li>one</li><li>two <b>bold</b></li></ul>after</div>",
+    "lead<table><tr><td>a</td><td>b</td></tr></table>tail",
+])
+def test_blocks_keep_all_text(body):
+    page = release_page("Title", body)
+    rendered = "".join(text.replace(" | ", "") if tag == "tr" else text for tag, text in _blocks(page))
+    assert squeeze(rendered) == squeeze(html_text(page))
+
+
+def test_blocks_mixed_content():
+    assert _blocks("<div>intro text<p>para</p></div>") == [("p", "intro text"), ("p", "para")]
+    assert _blocks("<div><span>lead</span><p>para</p></div>") == [("p", "lead"), ("p", "para")]
+    assert _blocks("<p>para</p>after para<br/>more") == [("p", "para"), ("p", "after para more")]
+
+
+def test_blocks_structure():
+    page = release_page("Title", "<p>one</p><table><tr><td>a</td><td></td><td>b</td></tr></table><ul><li>x</li></ul>")
+    assert _blocks(page) == [("h1", "Title"), ("p", "one"), ("tr", "a | b"), ("li", "x")]
@@ -0,0 +1,80 @@
+import csv
+import json
+
+import pytest
+
+from common.sinks import has_records, open_sink
+
+FIELDS = ["id", "title"]
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_key_dedup_across_runs(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with open_sink(path, FIELDS, key="id") as sink:
+        assert sink.write({"id": 1, "title": "one"})
+        assert not sink.write({"id": 1, "title": "one again"})
+        assert sink.write({"id": 2, "title": "two"})
+
+    with open_sink(path, FIELDS, key="id") as sink:
+        assert sink.seen(2) and not sink.seen(3)
+        assert not sink.write({"id": 2, "title": "two again"})
+        assert sink.write({"id": 3, "title": "three"})
+
+    assert [row["id"] for row in read_csv(path)] == ["1", "2", "3"]
+
+
+def test_csv_torn_tail_is_repaired(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with open_sink(path, FIELDS, key="id") as sink:
+        sink.write({"id": 1, "title": "one"})
+        sink.write({"id": 2, "title": "two"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("3,thr")  # a crash mid-row
+
+    with open_sink(path, FIELDS, key="id") as sink:
+        assert not sink.seen(3)
+        sink.write({"id": 3, "title": "three"})
+    assert read_csv(path) == [{"id": "1", "title": "one"}, {"id": "2", "title": "two"}, {"id": "3", "title": "three"}]
+
+
+def test_csv_torn_header_starts_over(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("id,ti")
+    with open_sink(path, FIELDS, key="id") as sink:
+        sink.write({"id": 1, "title": "one"})
+    assert read_csv(path) == [{"id": "1", "title": "one"}]
+
+
+def test_jsonl_torn_tail_is_repaired(tmp_path):
+    path = str(tmp_path / "rows.jsonl")
+    with open_sink(path, FIELDS, key="id") as sink:
+        sink.write({"id": 1, "title": "one"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": 2, "tit')
+
+    with open_sink(path, FIELDS, key="id") as sink:
+        sink.write({"id": 2, "title": "two"})
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == [1, 2]
+
+
+def test_overwrite_and_has_records(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    assert not has_records(path)
+    with open_sink(path, FIELDS, key="id") as sink:
+        sink.write({"id": 1, "title": "one"})
+    assert has_records(path)
+    with open_sink(path, FIELDS, key="id", append=False) as sink:
+        sink.write({"id": 2, "title": "two"})
+    assert [row["id"] for row in read_csv(path)] == ["2"]
+
+
+def test_unknown_extension(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(str(tmp_path / "rows.xml"), FIELDS)
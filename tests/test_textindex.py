@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from common.textindex import TextIndex, quote_terms
+
+
+def test_quote_terms():
+    assert quote_terms("income tax") == '"income" "tax"'
+    assert quote_terms('"finance bill" 2025') == '"finance bill" "2025"'
+    assert quote_terms("CG-DL-E-16042025-262469") == '"CG-DL-E-16042025-262469"'
+    assert quote_terms("tax OR title:customs") == '"tax" "OR" "title:customs"'
+    assert quote_terms("amend*") == '"amend"*'
+    assert quote_terms('say "hi') == '"say" "hi"'
+    assert quote_terms('"" *') == ""
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TextIndex(str(tmp_path / "fulltext.sqlite3"))
+    index.add("egazette:262469", "egazette", "The Finance Act, 2025", "CG-DL-E-16042025-262469 income-tax amendments",
+              ministry="Ministry of Law and Justice", category="Act", date="2025-04-16")
+    index.add("pib:abc", "pib", "Budget speech", "taxes OR duties", category="Speeches", date="2025-02-01")
+    yield index
+    index.close()
+
+
+def test_search_plain_terms(index):
+    assert [hit["doc_id"] for hit in index.search("CG-DL-E-16042025-262469")] == ["egazette:262469"]
+    assert [hit["doc_id"] for hit in index.search("OR duties")] == ["pib:abc"]
+    assert [hit["doc_id"] for hit in index.search("amend*")] == ["egazette:262469"]
+
+
+def test_search_syntax(index):
+    assert {hit["doc_id"] for hit in index.search("finance OR budget", syntax=True)} == {"egazette:262469", "pib:abc"}
+    with pytest.raises(sqlite3.OperationalError):
+        index.search("CG-DL-E-16042025-262469", syntax=True)